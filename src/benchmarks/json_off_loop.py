@@ -0,0 +1,66 @@
+"""
+Measures the time of encoding a large JSON document in the default executor
+and the longest stall of the event loop while it is encoded, for the C
+'json.dumps()' and for the 'JSON_Codec.encode_off_loop()'.
+
+Run from the 'src' directory:
+
+    python -m benchmarks.json_off_loop [number]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from codebase.body_codecs import JSON_Codec
+
+
+def _document(number: int) -> dict:
+    return {
+        "items": [
+            {
+                "id": i,
+                "name": f"item {i}",
+                "tags": ["a", "b", "c"],
+                "price": i * 1.5
+            }
+            for i in range(number)
+        ]
+    }
+
+
+async def _ticker(stalls: list[float], done: asyncio.Event) -> None:
+    # the loop should wake up every millisecond, the longer gaps are the
+    # time the encoding thread held the GIL
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append(time.perf_counter() - start)
+
+
+async def measure(name: str, encode, data: dict) -> None:
+    loop = asyncio.get_running_loop()
+    stalls = [0.0]
+    done = asyncio.Event()
+    ticker = asyncio.ensure_future(_ticker(stalls, done))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await loop.run_in_executor(None, encode, data)
+    total = time.perf_counter() - start
+    done.set()
+    await ticker
+    print(
+        f"{name:<36} {total * 1000:8.0f} ms"\
+        f" {max(stalls) * 1000:8.1f} ms worst loop stall"
+    )
+
+
+async def main(number: int = 200000) -> None:
+    data = _document(number)
+    codec = JSON_Codec()
+    await measure("json.dumps()", codec.encode, data)
+    await measure("JSON_Codec.encode_off_loop()", codec.encode_off_loop, data)
+
+
+if "__main__" == __name__:
+    asyncio.run(main(*map(int, sys.argv[1:2])))
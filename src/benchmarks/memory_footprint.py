@@ -0,0 +1,83 @@
+"""
+Measures the memory held by large numbers of the 'HTTP_Response' and
+'Connection' instances.
+
+Run from the 'src' directory:
+
+    python -m benchmarks.memory_footprint [number]
+"""
+import gc
+import sys
+import tracemalloc
+
+from codebase import Connection
+from codebase.__response_listener import _parse_head
+from codebase.__response_parser import parse_response
+
+_head = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json; charset=utf-8\r\n"
+    b"Content-Length: 256\r\n"
+    b"Server: benchmark\r\n"
+    b"\r\n"
+)
+_request = [
+    b"POST /api/items HTTP/1.1\r\n"
+    b"Host: example.com\r\n"
+    b"Content-Length: 1024\r\n"
+    b"\r\n",
+    b"x" * 1024
+]
+
+
+def _response(keep_request: bool):
+    # each response parses its own head and each request has its own
+    # buffers, as the received and the sent ones do
+    status_line, response_head, _, _, _ = _parse_head(bytes(bytearray(_head)))
+    return parse_response(
+        [bytes(bytearray(part)) for part in _request]
+        if keep_request else None,
+        status_line,
+        response_head,
+        [b"y" * 256]
+    )
+
+
+def _responses(number: int, keep_request: bool) -> list:
+    return [_response(keep_request) for _ in range(number)]
+
+
+def _connections(number: int) -> list:
+    return [Connection("example.com", 443) for _ in range(number)]
+
+
+def measure(name: str, build, number: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    objects = build(number)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<36} {(end - start) / 1048576:8.2f} MiB"\
+        f" {(end - start) / number:8.0f} B/object"
+    )
+    del objects
+
+
+def main(number: int = 100000) -> None:
+    measure(
+        "HTTP_Response (request kept)",
+        lambda n: _responses(n, True),
+        number
+    )
+    measure(
+        "HTTP_Response (keep_request=False)",
+        lambda n: _responses(n, False),
+        number
+    )
+    measure("Connection (not opened)", _connections, number)
+
+
+if "__main__" == __name__:
+    main(*map(int, sys.argv[1:2]))
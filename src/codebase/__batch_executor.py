@@ -0,0 +1,173 @@
+import asyncio as _aio
+from collections import deque as _deque
+from typing import (
+    Any as _Any,
+    AsyncIterable as _AsyncIterable,
+    AsyncIterator as _AsyncIterator,
+    Awaitable as _Awaitable,
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Self as _Self
+)
+
+__all__ = [
+    "ordered_map",
+    "unordered_map"
+]
+
+
+async def _iterate(
+    specs: _Iterable[dict[str, _Any]]|_AsyncIterable[dict[str, _Any]]
+) -> _AsyncIterator[dict[str, _Any]]:
+    if hasattr(specs, "__aiter__"):
+        async for spec in specs:
+            yield spec
+    else:
+        for spec in specs:
+            yield spec
+
+
+class _Host_Limiter:
+
+    """
+    Per-host semaphores, created on demand and dropped as soon as nobody
+    holds or waits for them, so the number of distinct hosts in a job does
+    not grow the memory.
+    """
+
+    def __init__(self: _Self, limit: int|None) -> None:
+        self.limit = limit
+        self.__hosts: dict[tuple, list[_aio.Semaphore|int]] = dict()
+
+    async def run(
+        self: _Self,
+        key: tuple,
+        call: _Callable[..., _Awaitable],
+        spec: dict[str, _Any]
+    ) -> _Any:
+        if None == self.limit:
+            return await call(**spec)
+        entry = self.__hosts.get(key)
+        if None == entry:
+            entry = [_aio.Semaphore(self.limit), 0]
+            self.__hosts[key] = entry
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                return await call(**spec)
+        finally:
+            entry[1] -= 1
+            if 0 == entry[1]:
+                del self.__hosts[key]
+
+
+def _start(
+    call: _Callable[..., _Awaitable],
+    spec: dict[str, _Any],
+    common: dict[str, _Any],
+    limiter: _Host_Limiter
+) -> _aio.Future:
+    spec = {**common, **spec}
+    key = (spec.get("host"), spec.get("port", 443))
+    return _aio.ensure_future(limiter.run(key, call, spec))
+
+
+def _outcome(task: _aio.Future, return_exceptions: bool) -> _Any:
+    error = task.exception()
+    if None != error:
+        if return_exceptions:
+            return error
+        raise error
+    return task.result()
+
+
+async def unordered_map(
+    call: _Callable[..., _Awaitable],
+    specs: _Iterable[dict[str, _Any]]|_AsyncIterable[dict[str, _Any]],
+    concurrency: int = 100,
+    per_host: int = None,
+    return_exceptions: bool = False,
+    common: dict[str, _Any] = None
+) -> _AsyncIterator[_Any]:
+    """
+    Runs 'call(**spec)' for each spec with at most 'concurrency' calls in
+    flight (and at most 'per_host' per (host, port)), yielding the results in
+    the order of completion. The input is consumed lazily - the next spec is
+    taken only when a slot is free.
+    """
+    if None == common:
+        common = dict()
+    limiter = _Host_Limiter(per_host)
+    iterator = _iterate(specs).__aiter__()
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    spec = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.add(_start(call, spec, common, limiter))
+            if not pending:
+                return
+            done, pending = await _aio.wait(
+                pending,
+                return_when = _aio.FIRST_COMPLETED
+            )
+            # the results finished together with the failed call are
+            # yielded before its error is raised
+            error = None
+            for task in done:
+                if not return_exceptions and None != task.exception():
+                    if None == error:
+                        error = task.exception()
+                    continue
+                yield _outcome(task, return_exceptions)
+            if None != error:
+                raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        await _aio.gather(*pending, return_exceptions = True)
+
+
+async def ordered_map(
+    call: _Callable[..., _Awaitable],
+    specs: _Iterable[dict[str, _Any]]|_AsyncIterable[dict[str, _Any]],
+    concurrency: int = 100,
+    per_host: int = None,
+    return_exceptions: bool = False,
+    common: dict[str, _Any] = None
+) -> _AsyncIterator[_Any]:
+    """
+    The same as 'unordered_map()', but the results are yielded in the order
+    of the input. Each result is yielded as soon as it and all of the
+    results before it are ready.
+    """
+    if None == common:
+        common = dict()
+    limiter = _Host_Limiter(per_host)
+    iterator = _iterate(specs).__aiter__()
+    pending = _deque()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    spec = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.append(_start(call, spec, common, limiter))
+            if not pending:
+                return
+            task = pending[0]
+            await _aio.wait((task,))
+            pending.popleft()
+            yield _outcome(task, return_exceptions)
+    finally:
+        for task in pending:
+            task.cancel()
+        await _aio.gather(*pending, return_exceptions = True)
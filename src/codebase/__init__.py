@@ -1,17 +1,51 @@
 from .async_connector import Async_Connector
 from .async_server_base import BaseAsyncServerTemplate
+from .balancer import (
+    Abstract_Balancer,
+    Least_Outstanding,
+    P2C_EWMA,
+    Round_Robin
+)
+from .body_codecs import (
+    Abstract_Codec,
+    Form_Codec,
+    JSON_Codec,
+    Multipart_Codec,
+    register_codec
+)
+from .connection_pool import Connection_Pool
 from .base_objects import (
     Connection,
     HTTP_Response,
     AsyncServer
 )
+from .http_headers import HTTP_Headers
+from .proxy_pool import Proxy_Pool
 from .request import request
+from .request_template import Request_Template
+from .resolver import Resolver
+from .timeouts import Timeouts
 
 
 __all__ = [
+    "Abstract_Balancer",
+    "Abstract_Codec",
     "Async_Connector",
     "AsyncServer",
     "Connection",
+    "Connection_Pool",
+    "Form_Codec",
+    "HTTP_Headers",
     "HTTP_Response",
-    "request"
+    "JSON_Codec",
+    "Least_Outstanding",
+    "Multipart_Codec",
+    "P2C_EWMA",
+    "Proxy_Pool",
+    "register_codec",
+    "request",
+    "Request_Template",
+    "Resolver",
+    "Round_Robin",
+    "Timeouts"
 ]
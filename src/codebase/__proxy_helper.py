@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+import asyncio
 import base64
+import ipaddress
 import socket
 from typing import (
     Callable,
@@ -12,6 +14,138 @@ def _addr_port_conf(ip_port_combo: str) -> tuple[str, int]:
     return ip, port
 
 
+async def _read_conn_response(
+    reader: asyncio.StreamReader,
+    encoding: str = "utf_8"
+) -> tuple[str, int, str, dict[str, str]]:
+    try:
+        response_head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as err:
+        raise ConnectionError(
+            "Proxy closed the connection before completing the CONNECT"\
+            " response."
+        ) from err
+    except asyncio.LimitOverrunError as err:
+        raise ConnectionError(
+            "Proxy CONNECT response headers exceed the stream limit."
+        ) from err
+    status_line, *header_lines = response_head.decode(encoding).split("\r\n")
+    try:
+        protocol, status, *reason = status_line.split(" ", maxsplit = 2)
+        status = int(status)
+    except ValueError as err:
+        raise ConnectionError(
+            f"Malformed proxy CONNECT status line: {status_line!r}"
+        ) from err
+    headers = dict()
+    for line in header_lines:
+        if line:
+            key, _, val = line.partition(":")
+            headers[key.strip()] = val.strip()
+    return protocol, status, " ".join(reason), headers
+
+
+_socks5_replies: dict[int, str] = {
+    0x01: "general SOCKS server failure",
+    0x02: "connection not allowed by ruleset",
+    0x03: "network unreachable",
+    0x04: "host unreachable",
+    0x05: "connection refused",
+    0x06: "TTL expired",
+    0x07: "command not supported",
+    0x08: "address type not supported"
+}
+
+
+async def _socks5_address(
+    target_host: str,
+    remote_dns: bool = True
+) -> bytes:
+    try:
+        address = ipaddress.ip_address(target_host)
+    except ValueError:
+        if remote_dns:
+            host = target_host.encode("idna")
+            return b"\x03" + bytes((len(host),)) + host
+        loop = asyncio.get_running_loop()
+        resolved = await loop.getaddrinfo(
+            target_host, None,
+            type = socket.SOCK_STREAM
+        )
+        address = ipaddress.ip_address(resolved[0][4][0])
+    if 4 == address.version:
+        return b"\x01" + address.packed
+    return b"\x04" + address.packed
+
+
+async def _socks5_handshake(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    target_host: str,
+    target_port: int,
+    username: str = None,
+    password: str = None,
+    remote_dns: bool = True
+) -> None:
+    # RFC 1928 (SOCKS5) + RFC 1929 (username/password authentication)
+    methods = b"\x00"
+    if None != username and None != password:
+        methods = b"\x02\x00"
+    try:
+        writer.write(b"\x05" + bytes((len(methods),)) + methods)
+        await writer.drain()
+        version, method = await reader.readexactly(2)
+        if 0x05 != version:
+            raise ConnectionError(
+                f"Proxy replied with SOCKS version {version}, expected 5."
+            )
+        if 0x02 == method and 0x02 == methods[0]:
+            login = username.encode("utf_8")
+            passwd = password.encode("utf_8")
+            writer.write(
+                b"\x01" + bytes((len(login),)) + login
+                + bytes((len(passwd),)) + passwd
+            )
+            await writer.drain()
+            _, status = await reader.readexactly(2)
+            if 0x00 != status:
+                raise ConnectionError("SOCKS5 proxy rejected the credentials.")
+        elif 0x00 != method:
+            raise ConnectionError(
+                "SOCKS5 proxy did not accept any offered authentication method."
+            )
+
+        address = await _socks5_address(target_host, remote_dns)
+        writer.write(
+            b"\x05\x01\x00" + address + int(target_port).to_bytes(2, "big")
+        )
+        await writer.drain()
+        _, reply, _, address_type = await reader.readexactly(4)
+        if 0x00 != reply:
+            raise ConnectionError(
+                f"SOCKS5 proxy failed to connect to {target_host}:"\
+                f"{target_port}: "\
+                f"{_socks5_replies.get(reply, f'reply code {reply}')}"
+            )
+        # skipping the bound address and port
+        if 0x01 == address_type:
+            await reader.readexactly(4 + 2)
+        elif 0x04 == address_type:
+            await reader.readexactly(16 + 2)
+        elif 0x03 == address_type:
+            length = (await reader.readexactly(1))[0]
+            await reader.readexactly(length + 2)
+        else:
+            raise ConnectionError(
+                f"SOCKS5 proxy replied with unknown address type"\
+                f" {address_type}."
+            )
+    except asyncio.IncompleteReadError as err:
+        raise ConnectionError(
+            "SOCKS5 proxy closed the connection during the handshake."
+        ) from err
+
+
 def _basic_b64_key(proxy_login: str, proxy_passwd: str) -> str:
     return base64.b64encode(
         f"{proxy_login}:{proxy_passwd}".encode("ascii")
@@ -27,6 +161,13 @@ class Abstract_Proxy_Helper(ABC):
     @abstractmethod
     def connect_socket(self: Self, *args, **kwargs) -> None:
         pass
+
+    @abstractmethod
+    async def open_tunnel(
+        self: Self,
+        *args, **kwargs
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        pass
         
     @abstractmethod
     def switch(self: Self, *args, **kwargs) -> None:
@@ -44,11 +185,17 @@ class Proxy_Helper(Abstract_Proxy_Helper):
     Currently supported types:
     - 'http'
     - 'https'
-    - 'socks5' - planned in the future
+    - 'socks5' - with no-auth and username/password authentication. The
+      target host name is resolved by the proxy unless 'remote_dns' is set
+      to 'False'
 
     To change the type of proxy and/or the proxy server, use '.switch()' method
     if you're using this class by itself, but using the method in higher-level
     abstraction is preferable.
+
+    '.open_tunnel()' is the asyncio-native way to establish the tunnel and
+    should be preferred over the blocking '.connect_socket()' inside of the
+    running event loop.
     """
 
     def __init__(
@@ -61,10 +208,14 @@ class Proxy_Helper(Abstract_Proxy_Helper):
         key: str = None,
         prox_type: str = "http",
         key_gen_func: Callable = _basic_b64_key,
+        remote_dns: bool = True,
         *args, **kwargs
     ) -> None:
         self.default_type = prox_type
         self.key_gen_func = key_gen_func
+        self.remote_dns = remote_dns
+        self.__username = None
+        self.__password = None
         if http != None:
             self.__http_host, self.__http_port = _addr_port_conf(http)
         if https != None:
@@ -141,7 +292,69 @@ class Proxy_Helper(Abstract_Proxy_Helper):
         self.socket.connect((self.__host, self.__port))
         self.socket.send(connect_request)
         self.socket.recv(1024)
-        
+
+    async def open_tunnel(
+        self: Self,
+        target_host: str,
+        target_port: int,
+        limit: int = None,
+        *args, **kwargs
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        Asynchronous counterpart of '.connect_socket()'.
+
+        Opens the stream to the proxy, sends the CONNECT request and reads the
+        full proxy response (status line and headers). Raises
+        'ConnectionError' for any non-2xx status. Returns the
+        (asyncio.StreamReader, asyncio.StreamWriter) pair of the ready
+        tunnel to the target.
+
+        For 'socks5' proxies the SOCKS5 handshake is performed instead of
+        the CONNECT request.
+        """
+        if kwargs.get("encoding"):
+            encoding = kwargs.pop("encoding")
+        else:
+            encoding = "utf_8"
+        conn_arguments = {"host": self.__host, "port": self.__port}
+        if None != limit:
+            conn_arguments["limit"] = limit
+        if "socks5" == self.default_type:
+            reader, writer = await asyncio.open_connection(**conn_arguments)
+            try:
+                await _socks5_handshake(
+                    reader, writer,
+                    target_host, target_port,
+                    username = self.__username,
+                    password = self.__password,
+                    remote_dns = self.remote_dns
+                )
+            except:
+                writer.close()
+                raise
+            return reader, writer
+
+        connect_request = self.gen_conn_request(
+            target_host,
+            target_port,
+            *args, **kwargs
+        ).encode(encoding)
+        reader, writer = await asyncio.open_connection(**conn_arguments)
+        try:
+            writer.write(connect_request)
+            await writer.drain()
+            _, status, reason, _ = await _read_conn_response(reader, encoding)
+            if not 200 <= status < 300:
+                raise ConnectionError(
+                    f"Proxy {self.__host}:{self.__port} refused to open the"\
+                    f" tunnel to {target_host}:{target_port}:"\
+                    f" {status} {reason}"
+                )
+        except:
+            writer.close()
+            raise
+        return reader, writer
+
     def switch(
         self: Self,
         new_type: str,
@@ -170,8 +383,7 @@ class Proxy_Helper(Abstract_Proxy_Helper):
         else:
             print(
                 "Proxy information change failed. No acceptanle proxy type"\
-                " was specified. Please, choose 'http', 'https' or 'socks5'"\
-                " (currently anavailable)."
+                " was specified. Please, choose 'http', 'https' or 'socks5'."
             )
             return
         if new_username != None and new_password != None:
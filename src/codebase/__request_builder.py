@@ -1,15 +1,74 @@
+from asyncio import (
+    StreamWriter as _StreamWriter,
+    get_running_loop as _get_running_loop
+)
 from datetime import datetime as _dt
 from hashlib import sha256 as _sha256
-import json
 import mimetypes as mime
+import os as _os
+import zlib as _zlib
 # import platform  # TODO: add functionality
 from typing import (
     Any as _Any,
+    AsyncIterable as _AsyncIterable,
+    AsyncIterator as _AsyncIterator,
     BinaryIO as _BinaryIO,
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Self as _Self,
     TextIO as _TextIO
 )
 
-__all__ = ["prepare_request"]
+from .body_codecs import (
+    Abstract_Codec as _Abstract_Codec,
+    Multipart_Codec as _Multipart_Codec,
+    get_codec as _get_codec
+)
+
+__all__ = [
+    "prepare_request",
+    "request_buffers",
+    "request_head",
+    "send_request",
+    "Streamed_Request"
+]
+
+_stream_chunk_size: int = 65536
+# bodies of at least this size are compressed in the default executor
+_compress_offload_size: int = 262144
+_compress_slice_size: int = 1048576
+# the codings the response listener can decompress
+_accept_encoding: str = "gzip, deflate"
+
+
+def _header_key(headers: dict[str, str], name: str) -> str|None:
+    # the header names are case-insensitive (RFC 9110 section 5.1), returns
+    # the key the field is stored under
+    name = name.lower()
+    for key in headers:
+        if name == key.lower():
+            return key
+    return None
+
+
+def _set_header(headers: dict[str, str], name: str, value: str|int) -> None:
+    # the field already set under another case is replaced in place
+    key = _header_key(headers, name)
+    headers[name if None == key else key] = value
+
+
+def _add_accept_encoding(
+    headers: dict[str, str],
+    accept_encoding: bool|str|None
+) -> None:
+    # 'True' asks for the codings the listener decompresses, the str is sent
+    # as it is; the 'Accept-Encoding' header set by the caller is kept
+    if not accept_encoding \
+            or any("accept-encoding" == key.lower() for key in headers):
+        return
+    if True == accept_encoding:
+        accept_encoding = _accept_encoding
+    headers["Accept-Encoding"] = accept_encoding
 
 
 def path_splitter() -> str:
@@ -28,51 +87,338 @@ def _get_boundary() -> str:
         ).hexdigest()
     )
 
-def _data_formater(data: dict[str, _Any], boundary: str) -> str:
-    result = ""
-    for key, val in data.items():
-        result += f"--------{boundary}\r\n"
-        result += f"Content-Disposition: form-data; name={key}\r\n"
-        result += "\r\n"
-        result += f"{val}\r\n"
-    return result
-        
-
 def _data_handler(
     data: dict[str, _Any],
     form: bool,
     boundary: str,
-    encoding: str = "utf_8"
-) -> bytes|None:
-    result = None
-    temp = ""
-    if form:
-        temp = f"{_data_formater(data, boundary)}"
+    encoding: str = "utf_8",
+    codec: str|_Abstract_Codec = None,
+    off_loop: bool = False
+) -> tuple[bytes, dict[str, str]]:
+    """
+    Encodes the 'data' with the codec ('multipart' for the form data and
+    'json' by default) and returns the body with the codec headers.
+    'off_loop' is set when the request is built in the executor.
+    """
+    if None == codec:
+        codec = "multipart" if form else "json"
+    codec = _get_codec(codec)
+    if isinstance(codec, _Multipart_Codec) and None == boundary:
+        boundary = _get_boundary()
+    encode = codec.encode_off_loop if off_loop else codec.encode
+    return (
+        encode(data, encoding = encoding, boundary = boundary),
+        codec.headers(boundary = boundary)
+    )
+
+def _has_fileno(fbin: _BinaryIO) -> bool:
+    try:
+        fbin.fileno()
+    except (AttributeError, OSError, ValueError):
+        # 'io.UnsupportedOperation' is a subclass of both OSError and
+        # ValueError
+        return False
+    return True
+
+
+class _File_Part:
+
+    """
+    File content of the multipart body, read in chunks in the default
+    executor while the request is written, so the file is never loaded into
+    memory as a whole and the event loop is not blocked by the disk.
+
+    Over plaintext connections files with a descriptor are passed to
+    'loop.sendfile()', so the kernel copies the file to the socket
+    ('os.sendfile') and the content never enters Python.
+    """
+
+    def __init__(
+        self: _Self,
+        file_path: str = None,
+        bin_file: _BinaryIO = None,
+        chunk_size: int = _stream_chunk_size
+    ) -> None:
+        self.file_path = file_path
+        self.bin_file = bin_file
+        self.chunk_size = chunk_size
+        if None != file_path:
+            self.size = _os.stat(file_path).st_size
+        else:
+            position = bin_file.tell()
+            self.size = bin_file.seek(0, _os.SEEK_END) - position
+            bin_file.seek(position)
+
+    async def write(self: _Self, writer: _StreamWriter) -> None:
+        if 0 == self.size:
+            # 'loop.sendfile()' does not accept the zero count
+            return
+        loop = _get_running_loop()
+        if None != self.file_path:
+            fbin = await loop.run_in_executor(None, open, self.file_path, "rb")
+        else:
+            fbin = self.bin_file
+        try:
+            if None == writer.get_extra_info("ssl_object") \
+                    and _has_fileno(fbin):
+                sent = await loop.sendfile(
+                    writer.transport,
+                    fbin,
+                    fbin.tell(),
+                    self.size
+                )
+                if sent < self.size:
+                    raise RuntimeError(
+                        "The uploaded file was truncated while sending the"\
+                        " request."
+                    )
+                return
+            remaining = self.size
+            while remaining > 0:
+                data_chunk = await loop.run_in_executor(
+                    None,
+                    fbin.read,
+                    min(self.chunk_size, remaining)
+                )
+                if not data_chunk:
+                    raise RuntimeError(
+                        "The uploaded file was truncated while sending the"\
+                        " request."
+                    )
+                remaining -= len(data_chunk)
+                writer.write(data_chunk)
+                await writer.drain()
+        finally:
+            if None != self.file_path:
+                fbin.close()
+
+
+async def _iterate_chunks(
+    source: _Iterable[bytes|str]|_AsyncIterable[bytes|str]
+) -> _AsyncIterator[bytes|str]:
+    if hasattr(source, "__aiter__"):
+        async for data_chunk in source:
+            yield data_chunk
     else:
-        temp = f"{json.dumps(data, separators=(',',':'))}"
+        for data_chunk in source:
+            yield data_chunk
+
+
+class _Chunked_Part:
+
+    """
+    Body produced by a sync or async iterator of bytes (or strings), sent
+    with the chunked 'Transfer-Encoding' as the items are produced. The
+    writer is drained after every chunk, so a slow peer slows the iteration
+    down instead of the data piling up in the transport buffer.
+
+    'trailers' is the dictionary of the trailer fields or a callable
+    returning it, called once the iterator is exhausted (e.g. to send the
+    checksum of the data).
+    """
+
+    def __init__(
+        self: _Self,
+        source: _Iterable[bytes|str]|_AsyncIterable[bytes|str],
+        encoding: str = "utf_8",
+        trailers: dict[str, str]|_Callable[[], dict[str, str]] = None
+    ) -> None:
+        self.source = source
+        self.encoding = encoding
+        self.trailers = trailers
+        self.size = None
+
+    async def write(self: _Self, writer: _StreamWriter) -> None:
+        async for data_chunk in _iterate_chunks(self.source):
+            if isinstance(data_chunk, str):
+                data_chunk = data_chunk.encode(self.encoding)
+            if not data_chunk:
+                # the empty chunk would end the body
+                continue
+            writer.writelines(
+                (f"{len(data_chunk):x}\r\n".encode(), data_chunk, b"\r\n")
+            )
+            await writer.drain()
+
+        trailers = self.trailers
+        if callable(trailers):
+            trailers = trailers()
+        last_chunk = "0\r\n"
+        if None != trailers:
+            for key, val in trailers.items():
+                last_chunk += f"{key}: {val}\r\n"
+        last_chunk += "\r\n"
+        writer.write(last_chunk.encode(self.encoding))
 
-    result = temp.encode(encoding)
-    
-    return result
 
-def _file_reader(bin_file: _BinaryIO, chunk_size: int) -> bytes:
-    result = b""
-    repeat = True
-    while repeat:
-        data_chunk = bin_file.read(chunk_size)
-        if data_chunk:
-            result += data_chunk
+_streamed_parts = (_File_Part, _Chunked_Part)
+
+
+def _compressor(method: str) -> "_zlib._Compress":
+    if "gzip" == method:
+        return _zlib.compressobj(wbits = 31)
+    if "deflate" == method:
+        return _zlib.compressobj()
+    raise ValueError(
+        f"Unsupported compression {method!r}. Choose 'gzip' or 'deflate'."
+    )
+
+
+async def _compressed_chunks(
+    source: _Iterable[bytes|str]|_AsyncIterable[bytes|str],
+    method: str,
+    encoding: str = "utf_8"
+) -> _AsyncIterator[bytes]:
+    """
+    Compresses the chunks of the 'source' on the fly. The chunks of at
+    least '_compress_offload_size' bytes are compressed in the default
+    executor ('zlib' releases the GIL), so the event loop is not blocked.
+    """
+    loop = _get_running_loop()
+    compressor = _compressor(method)
+    async for data_chunk in _iterate_chunks(source):
+        if isinstance(data_chunk, str):
+            data_chunk = data_chunk.encode(encoding)
+        if len(data_chunk) >= _compress_offload_size:
+            compressed = await loop.run_in_executor(
+                None,
+                compressor.compress,
+                data_chunk
+            )
         else:
-            repeat = False
-    return result
-        
+            compressed = compressor.compress(data_chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _compress_body(
+    prepared_body: bytes|list[bytes|_File_Part|_Chunked_Part]|None,
+    additional_headers: dict[str, str|int]|None,
+    method: str,
+    threshold: int,
+    encoding: str = "utf_8"
+) -> tuple[
+    bytes|list[bytes|_File_Part|_Chunked_Part]|None,
+    dict[str, str|int]|None
+]:
+    """
+    Compresses the in-memory body of at least 'threshold' bytes and the
+    iterator body. The bodies below '_compress_offload_size' are compressed
+    in place, the larger ones are sliced and compressed in the default
+    executor while the request is written, so they are sent with the
+    chunked 'Transfer-Encoding' (the compressed size is not known in
+    advance). Multipart bodies with files are sent as they are.
+    """
+    if isinstance(prepared_body, bytes):
+        if len(prepared_body) < threshold:
+            return prepared_body, additional_headers
+        additional_headers = {**additional_headers, "Content-Encoding": method}
+        if len(prepared_body) < _compress_offload_size:
+            compressor = _compressor(method)
+            prepared_body = compressor.compress(prepared_body) \
+                + compressor.flush()
+            additional_headers["Content-Length"] = len(prepared_body)
+            return prepared_body, additional_headers
+        view = memoryview(prepared_body)
+        slices = (
+            view[start:start + _compress_slice_size]
+            for start in range(0, len(view), _compress_slice_size)
+        )
+        additional_headers.pop("Content-Length", None)
+        additional_headers["Transfer-Encoding"] = "chunked"
+        return [
+            _Chunked_Part(_compressed_chunks(slices, method), encoding)
+        ], additional_headers
+    if isinstance(prepared_body, list) and 1 == len(prepared_body) \
+            and isinstance(prepared_body[0], _Chunked_Part):
+        part = prepared_body[0]
+        part.source = _compressed_chunks(part.source, method, encoding)
+        additional_headers = {**additional_headers, "Content-Encoding": method}
+    return prepared_body, additional_headers
+
+
+class Streamed_Request:
+
+    """
+    The prepared request, which body contains files or is produced by an
+    iterator. The request head and the in-memory parts of the body are kept
+    as bytes, the file contents and the iterated chunks are streamed to the
+    writer with '.write()' (waiting for the writer to drain after every
+    chunk).
+    """
+
+    def __init__(
+        self: _Self,
+        meta: bytes,
+        parts: list[bytes|_File_Part|_Chunked_Part]
+    ) -> None:
+        self.meta = meta
+        self.parts = parts
+
+    async def write(self: _Self, writer: _StreamWriter) -> None:
+        # the in-memory buffers between the streamed parts are passed to
+        # the transport together instead of being joined
+        buffers = [self.meta]
+        for part in self.parts:
+            if isinstance(part, _streamed_parts):
+                writer.writelines(buffers)
+                buffers = []
+                await writer.drain()
+                await part.write(writer)
+            else:
+                buffers.append(part)
+        writer.writelines(buffers)
+        await writer.drain()
+
+
+def _body_length(parts: list[bytes|_File_Part]) -> int:
+    return sum(
+        part.size if isinstance(part, _File_Part) else len(part)
+        for part in parts
+    )
+
+
+async def send_request(
+    writer: _StreamWriter,
+    cooked_request: list[bytes]|Streamed_Request
+) -> None:
+    if isinstance(cooked_request, Streamed_Request):
+        await cooked_request.write(writer)
+    else:
+        writer.writelines(cooked_request)
+        await writer.drain()
+
+
+def request_buffers(
+    requests: list[list[bytes]]
+) -> list[bytes]:
+    """
+    Flattens the in-memory requests into one list of buffers for a single
+    '.writelines()' call.
+    """
+    return [buffer for cooked_request in requests for buffer in cooked_request]
+
+
+def request_head(
+    cooked_request: list[bytes]|Streamed_Request
+) -> list[bytes]:
+    """
+    Returns the request buffers kept on the response (joined by the
+    response only when accessed) - the request head only for the streamed
+    requests.
+    """
+    if isinstance(cooked_request, Streamed_Request):
+        return [cooked_request.meta]
+    return cooked_request
+
 
 def _file_handler(
     file_input: dict[str, str],
     boundary: str,
     file_place: int,
     encoding: str = "utf_8"
-) -> tuple[bytes, int]:
+) -> tuple[bytes, _File_Part, int]:
     """
     {
         "file": "/path/to/file",
@@ -80,7 +426,6 @@ def _file_handler(
         "field": "name_of_field"
     }
     """
-    buffer_size = 8192
     file_path = file_input.get("file")
     file_name = file_path.split(path_splitter())[-1]
 
@@ -112,22 +457,15 @@ def _file_handler(
         packed_file += file_type_header
     packed_file += "\r\n"
     packed_file = packed_file.encode(encoding)
-    
-    with open(
-        file_path,
-        "rb",
-        buffering = buffer_size
-    ) as fbin:
-        packed_file +=  _file_reader(fbin, buffer_size)
 
-    return packed_file, file_place
+    return packed_file, _File_Part(file_path = file_path), file_place
 
 def _bin_file_handler(
     file_input: dict[str, str|_BinaryIO],
     boundary: str,
     file_place: int,
     encoding: str = "utf_8"
-) -> tuple[bytes, int]:
+) -> tuple[bytes, _File_Part, int]:
     """
     {
         "file": binary_file_representation,
@@ -136,7 +474,6 @@ def _bin_file_handler(
         "field": "name_of_field"
     }
     """
-    buffer_size = 8192
     fbin = file_input.get("file")
     file_name = file_input.get("file_name")
 
@@ -163,19 +500,17 @@ def _bin_file_handler(
 
     packed_file = f"--------{boundary}\r\n"
     packed_file += f"Content-Disposition: form-data; name={field_name};"\
-        f" filename={fie_name}\r\n"
+        f" filename={file_name}\r\n"
     if None != file_type_header:
         packed_file += file_type_header
     packed_file += "\r\n"
     packed_file = packed_file.encode(encoding)
 
-    packed_file +=  _file_reader(fbin, buffer_size)
-
-    return packed_file, file_place
+    return packed_file, _File_Part(bin_file = fbin), file_place
 
 
 def _body_prep(
-    body: str = None,
+    body: str|bytes|_Iterable[bytes|str]|_AsyncIterable[bytes|str] = None,
     data: dict[str, _Any] = None,
     files: list[dict[str, str]] = None,
     bin_files: list[dict[str, str|_BinaryIO]] = None,
@@ -183,64 +518,91 @@ def _body_prep(
     encoding: str = "utf_8",
     chunk: bool = False,
     form: bool = False,
+    trailers: dict[str, str]|_Callable[[], dict[str, str]] = None,
+    compress: str = None,
+    compress_threshold: int = 1024,
+    codec: str|_Abstract_Codec = None,
+    off_loop: bool = False,
     *args, **kwargs
-) -> str|None:
+) -> tuple[
+    bytes|list[bytes|_File_Part|_Chunked_Part]|None,
+    dict[str, str|int]|None
+]:
     prepared_body = None
     additional_headers = None
     place = 1
     empty = all(map(lambda x: x == None, (data, files, bin_files)))
     no_files = all(map(lambda x: x == None, (files, bin_files)))
     
-    if None != body:
-        prepared_body = f"{body}\r\n\r\n".encode(encoding)
+    if isinstance(body, (str, bytes, bytearray)):
+        if isinstance(body, str):
+            body = body.encode(encoding)
+        if chunk:
+            # the body was preformatted with the chunk dividers
+            prepared_body = bytes(body) + b"\r\n\r\n"
+        else:
+            prepared_body = bytes(body)
+            additional_headers = {"Content-Length": len(prepared_body)}
+    elif None != body:
+        prepared_body = [_Chunked_Part(body, encoding, trailers)]
+        additional_headers = {"Transfer-Encoding": "chunked"}
+        if isinstance(trailers, dict):
+            additional_headers["Trailer"] = ", ".join(trailers)
     elif not empty and no_files:
-        prepared_body = _data_handler(
+        prepared_body, additional_headers = _data_handler(
             data,
             form,
             boundary,
-            encoding
+            encoding,
+            codec,
+            off_loop
         )
-        if None != additional_headers:
-            additional_headers["Content-Length"] = len(prepared_body)
-        else:
-            additional_headers = {"Content-Length": len(prepared_body)}
+        additional_headers["Content-Length"] = len(prepared_body)
     elif not empty and not no_files:
-        
-        prepared_body = b""
+        # the body is kept as the list of parts, the file contents are
+        # streamed while sending
+        prepared_body = []
         additional_headers = {
-            "Content-Type": f"multipart/form-data;boundary={boundary}"
+            "Content-Type": f"multipart/form-data;boundary=------{boundary}"
         }
         
         if None != data:
-            cooked_body = _data_handler(
-                data,
-                form,
-                boundary,
-                encoding
+            prepared_body.append(
+                _Multipart_Codec.encode_fields(data, encoding, boundary)
             )
-            prepared_body += cooked_body
 
         if None != files:
             for fin in files:
-                cooked_file, place = _file_handler(
+                file_head, file_part, place = _file_handler(
                     fin,
                     boundary,
                     place,
                     encoding
                 )
-                prepared_body += cooked_file
+                prepared_body.extend((file_head, file_part, b"\r\n"))
 
         if None != bin_files:
             for fin in bin_files:
-                cooked_bin_file, place = _bin_file_handler(
+                file_head, file_part, place = _bin_file_handler(
                     fin,
                     boundary,
                     place,
                     encoding
                 )
-                prepared_body += cooked_bin_file
-
-        prepared_body += f"--------{boundary}--\r\n\r\n".encode(encoding)
+                prepared_body.extend((file_head, file_part, b"\r\n"))
+
+        prepared_body.append(f"--------{boundary}--\r\n".encode(encoding))
+        additional_headers["Content-Length"] = _body_length(prepared_body)
+
+    # the preformatted chunked body is sent as it is
+    if None != compress and not (chunk and isinstance(prepared_body, bytes)):
+        prepared_body, additional_headers = _compress_body(
+            prepared_body,
+            additional_headers,
+            compress,
+            compress_threshold,
+            encoding
+        )
     return prepared_body, additional_headers
 
 def _header_prep(headers_passed: dict[str, str]) -> str:
@@ -258,14 +620,21 @@ def prepare_request(
     port_passed: int = 443,
     headers_passed: dict[str, str] = None,
     url_query_passed: str = None,
-    body_passed: str = None,
+    body_passed: str|bytes|_Iterable[bytes|str]|\
+        _AsyncIterable[bytes|str] = None,
     data_passed: dict[str, _Any] = None,
     files_passed: list[dict[str, str]] = None,
     bin_files_passed: list[dict[str, str|_BinaryIO]] = None,
     boundary_str_passed: str = None,
     encoding_passed: str = "utf_8",
     *args, **kwargs
-) -> bytes|None:
+) -> list[bytes]|Streamed_Request:
+    """
+    Builds the request. Returns the list of the request buffers (the head
+    and the body, never joined to each other) or, if the body contains files
+    or is an iterator, the 'Streamed_Request' that sends the files and the
+    iterated chunks while writing.
+    """
     result = None
 
     if body_passed != None and data_passed != None:
@@ -294,18 +663,26 @@ def prepare_request(
 
     request_line = f"{method_passed} {url_path} {proto}/{proto_ver}\r\n"
 
+    # the headers of the caller are never changed, so the same dictionary
+    # can be passed to the next requests
     if None == headers_passed:
         headers_passed = {"Host": None}
+    else:
+        headers_passed = {**headers_passed}
     if None == headers_passed.get("Host"):
         if kwargs.get("use_port"):
             headers_passed["Host"] = f"{host_passed}:{port_passed}"
         else:
             headers_passed["Host"] = f"{host_passed}"
+    _add_accept_encoding(headers_passed, kwargs.get("accept_encoding"))
 
-    if "chunked" == headers_passed.get("Transfer-Encoding"):
+    transfer_encoding = _header_key(headers_passed, "Transfer-Encoding")
+    if None != transfer_encoding \
+            and "chunked" == headers_passed[transfer_encoding]:
         chunked = True
-    if None != headers_passed.get("Content-Type"):
-        if "multipart/form-data" in headers_passed.get("Content-Type"):
+    content_type = _header_key(headers_passed, "Content-Type")
+    if None != content_type:
+        if "multipart/form-data" in headers_passed[content_type]:
             form_data = True
     elif any(
         (
@@ -324,11 +701,24 @@ def prepare_request(
         boundary = boundary_str_passed,
         chunk = chunked,
         form = form_data,
-        encoding = encoding_passed
+        encoding = encoding_passed,
+        trailers = kwargs.get("trailers"),
+        compress = kwargs.get("compress"),
+        compress_threshold = kwargs.get("compress_threshold", 1024),
+        codec = kwargs.get("codec"),
+        off_loop = kwargs.get("off_loop", False)
     )
     if None != body_headers:
+        if None != body_headers.get("Transfer-Encoding"):
+            headers_passed.pop(
+                _header_key(headers_passed, "Content-Length"), None
+            )
         for key, val in body_headers.items():
-            headers_passed[key] = val
+            if "Content-Type" == key and not form_data \
+                    and None != content_type:
+                # the content type set by the caller is kept
+                continue
+            _set_header(headers_passed, key, val)
 
     headers_packed = _header_prep(headers_passed)
 
@@ -338,9 +728,11 @@ def prepare_request(
     meta += "\r\n"
     meta = meta.encode(encoding_passed)
 
-    if None != prepared_body:
-        result = meta + prepared_body
+    if isinstance(prepared_body, list):
+        result = Streamed_Request(meta, prepared_body)
+    elif None != prepared_body:
+        result = [meta, prepared_body]
     else:
-        result = meta
+        result = [meta]
     
     return result
@@ -7,14 +7,22 @@ def build_response_meta(
     status_passed: str,
     reason_passed: str,
     response_headers_passed: dict[str, str],
-    body_passed: str = None,
+    body_passed: str|bytes = None,
     *args, **kwargs
-) -> str:
+) -> list[bytes]:
+    """
+    Builds the response as the list of buffers - the encoded head and the
+    body - to be written with 'StreamWriter.writelines()', so the body is
+    never copied to be joined with the head.
+    """
+    encoding = kwargs.get("encoding", "utf_8")
+    if isinstance(body_passed, str):
+        body_passed = body_passed.encode(encoding)
     response_headers = {
         "Content-Length": 0
     }
     if None != body_passed:
-        response_headers["Content-Length"] = len(body_passed.encode())
+        response_headers["Content-Length"] = len(body_passed)
     if None != response_headers_passed:
         for key, val in response_headers_passed.items():
             response_headers[key] = val
@@ -22,9 +30,10 @@ def build_response_meta(
         (
             f"{protocol_passed}/{protocol_version} "\
             f"{status_passed} {reason_passed}\r\n",
-            _header_prep(response_headers)
+            _header_prep(response_headers),
+            "\r\n"
         )
-    )
+    ).encode(encoding)
     if None != body_passed:
-        response_meta += f"\r\n{body_passed}"
-    return response_meta
+        return [response_meta, body_passed]
+    return [response_meta]
@@ -1,88 +1,399 @@
-from asyncio import StreamReader as _StreamReader
+from asyncio import (
+    IncompleteReadError as _IncompleteReadError,
+    LimitOverrunError as _LimitOverrunError,
+    StreamReader as _StreamReader,
+    get_running_loop as _get_running_loop
+)
+from io import BytesIO as _BytesIO
 import tempfile as _tmp
+import zlib as _zlib
+from typing import (
+    AsyncIterator as _AsyncIterator,
+    Awaitable as _Awaitable,
+    BinaryIO as _BinaryIO,
+    Callable as _Callable,
+    Self as _Self
+)
 
-__all__ = ["listen_response"]
+from .timeouts import deadline as _deadline
 
-response_ends: list[bytes|bool] = [
-    b"</html>\r\n",
-    b"\r\n",
-    b"0\r\n",
-    b"",
-    False
+__all__ = [
+    "Body_Stream",
+    "Response_Head",
+    "listen_head",
+    "listen_response"
 ]
 
-# full_response_ends: list[bytes|bool] = [
-#     b"</html>\r\n",
-#     b"\r\n",
-#     b"0\r\n",
-#     b"",
-#     False
-# ]
-
 _bodyless_methods: list[bytes] = [
     b"HEAD",
     b"CONNECT"
 ]
 
+# the default in-memory limit of the bodies read with 'join_chunks=False'
+_spill_threshold: int = 1048576
+_spill_batch_size: int = 1048576
+
+# the default limit of the decompressed body size
+_max_decompressed_size: int = 268435456
+
+# the 'Content-Encoding' values decompressed with 'decompress=True' and the
+# 'wbits' of their 'zlib.decompressobj()'
+_decompress_wbits: dict[str, int] = {
+    "gzip": 31,
+    "x-gzip": 31,
+    "deflate": 15
+}
+
+# the responses to these statuses never have a body (RFC 9112 section 6.3)
+_bodyless_statuses: frozenset[bytes] = frozenset(
+    (b"100", b"101", b"102", b"103", b"204", b"304")
+)
+
+
+class Response_Head(bytes):
+
+    """
+    The raw header block (everything after the start line) with the header
+    fields parsed once by the listener, so the parser does not split the
+    block again. 'fields' is the list of the (name, value) pairs in the
+    order they were received.
+    """
+
+    fields: list[tuple[str, str]]
+
+
+def _parse_head(
+    head: bytes,
+    encoding: str = "utf_8"
+) -> tuple[bytes, Response_Head, int|None, bool, str|None]:
+    """
+    Splits the start line off the head and parses the header fields in one
+    pass over the decoded block, picking up the body framing and the
+    content coding on the way.
+    """
+    split_at = head.find(b"\r\n")
+    split_at = len(head) if split_at < 0 else split_at + 2
+    start_line = head[:split_at]
+    response_head = Response_Head(head[split_at:])
+    fields = []
+    content_length = None
+    chunked = False
+    content_encoding = None
+    for line in response_head.decode(encoding).split("\r\n"):
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        name = name.strip()
+        value = value.strip()
+        fields.append((name, value))
+        key = name.lower()
+        if "content-length" == key:
+            content_length = int(value)
+        elif "transfer-encoding" == key:
+            chunked = "chunked" in value.lower()
+        elif "content-encoding" == key:
+            content_encoding = value.lower()
+    response_head.fields = fields
+    return start_line, response_head, content_length, chunked, \
+        content_encoding
+
 
 async def _read_exactly(
     reader: _StreamReader,
     size: int
 ) -> bytes:
-    response_body = None
     try:
-        line = await reader.readexactly(int(size))
-    except IncompleteReadError as err:
-        line = err.partial \
-            + b"------#=Incomplete_stream_read=#--\r\n"
-    finally:
-        response_body = line
-    return response_body
+        return await reader.readexactly(size)
+    except _IncompleteReadError as err:
+        return err.partial + b"------#=Incomplete_stream_read=#--\r\n"
+
+
+async def _read_trailers(reader: _StreamReader) -> None:
+    while b"\r\n" != await reader.readuntil(b"\r\n"):
+        pass
+
+
+async def _chunks(reader: _StreamReader, chunk_size: int = None):
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        # the chunk extensions after ';' are ignored
+        size = int(size_line.split(b";", maxsplit = 1)[0], 16)
+        if 0 == size:
+            await _read_trailers(reader)
+            return
+        if None == chunk_size or size <= chunk_size:
+            yield await _read_exactly(reader, size)
+        else:
+            remaining = size
+            while remaining > 0:
+                data_chunk = await reader.read(min(chunk_size, remaining))
+                if not data_chunk:
+                    raise _IncompleteReadError(b"", remaining)
+                remaining -= len(data_chunk)
+                yield data_chunk
+        await reader.readexactly(2)
+
+
+async def _chunked_reader(reader: _StreamReader) -> list[bytes]:
+    return [data_chunk async for data_chunk in _chunks(reader)]
+
+
+async def _decompressed(
+    body_chunks: _AsyncIterator[bytes],
+    content_encoding: str,
+    limit: int,
+    chunk_size: int = 65536
+) -> _AsyncIterator[bytes]:
+    """
+    Decompresses the body as it arrives. Every piece is at most
+    'chunk_size' bytes, and 'ValueError' is raised as soon as the
+    decompressed size exceeds 'limit' (e.g. a decompression bomb).
+    """
+    wbits = _decompress_wbits[content_encoding]
+    decompressor = _zlib.decompressobj(wbits)
+    started = False
+    size = 0
+    async for data_chunk in body_chunks:
+        if not started and 15 == wbits and data_chunk:
+            started = True
+            # some servers send the raw deflate stream without the zlib
+            # header (RFC 1950 section 2.2)
+            zlib_header = 8 == data_chunk[0] & 0x0f and (
+                len(data_chunk) < 2
+                or 0 == (data_chunk[0] << 8 | data_chunk[1]) % 31
+            )
+            if not zlib_header:
+                decompressor = _zlib.decompressobj(-15)
+        while data_chunk:
+            piece = decompressor.decompress(data_chunk, chunk_size)
+            data_chunk = decompressor.unconsumed_tail
+            size += len(piece)
+            if size > limit:
+                raise ValueError(
+                    f"The decompressed response body exceeds {limit} bytes."
+                )
+            if piece:
+                yield piece
+    piece = decompressor.flush()
+    size += len(piece)
+    if size > limit:
+        raise ValueError(
+            f"The decompressed response body exceeds {limit} bytes."
+        )
+    if piece:
+        yield piece
+
+
+async def _spill(
+    body_chunks: _AsyncIterator[bytes],
+    threshold: int
+) -> _BinaryIO:
+    """
+    Collects the body in memory up to 'threshold' bytes and moves it to an
+    anonymous temporary file above it. The file writes are batched and
+    done in the default executor. Returns the body file positioned at the
+    start.
+    """
+    loop = _get_running_loop()
+    buffered = []
+    size = 0
+    body_file = None
+    async for data_chunk in body_chunks:
+        buffered.append(data_chunk)
+        size += len(data_chunk)
+        if None == body_file and size > threshold:
+            body_file = await loop.run_in_executor(None, _tmp.TemporaryFile)
+        if None != body_file and size >= _spill_batch_size:
+            await loop.run_in_executor(None, body_file.writelines, buffered)
+            buffered = []
+            size = 0
+    if None == body_file:
+        return _BytesIO(b"".join(buffered))
+    try:
+        await loop.run_in_executor(None, body_file.writelines, buffered)
+        body_file.seek(0)
+    except BaseException:
+        body_file.close()
+        raise
+    return body_file
+
+
+class Body_Stream:
+
+    """
+    The body of the message which head was read with 'listen_head()',
+    left in the reader until it is iterated with '.chunks()'. The data is
+    taken from the reader only as fast as it is consumed, so the transport
+    stops reading from the socket when the reader buffer is full.
+
+    'on_close' is the coroutine function called once by '.close()' with
+    the flag whether the body was read to the end (e.g. to return the
+    connection to the pool or to close it).
+
+    With 'decompress' set the gzip/deflate 'content_encoding' is removed
+    while the body is iterated, up to 'max_decompressed_size' bytes.
+    'read_timeout' is the number of seconds to wait for each piece of the
+    body before 'TimeoutError' is raised.
+    """
 
+    def __init__(
+        self: _Self,
+        reader: _StreamReader,
+        length: int = None,
+        chunked: bool = False,
+        until_eof: bool = False,
+        bodyless: bool = False,
+        content_encoding: str = None
+    ) -> None:
+        self.reader = reader
+        self.length = length
+        self.chunked = chunked
+        self.until_eof = until_eof
+        self.bodyless = bodyless
+        self.content_encoding = content_encoding
+        self.decompress = False
+        self.max_decompressed_size = _max_decompressed_size
+        self.read_timeout: float|None = None
+        self.finished = not any((chunked, until_eof, length))
+        self.on_close: _Callable[[bool], _Awaitable[None]]|None = None
+        self.__closed = False
 
-async def _chunked_reader(
+    @property
+    def decompressing(self: _Self) -> bool:
+        return self.decompress \
+            and self.content_encoding in _decompress_wbits
+
+    async def chunks(
+        self: _Self,
+        chunk_size: int = 65536
+    ) -> _AsyncIterator[bytes]:
+        """
+        Yields the body data in pieces of at most 'chunk_size' bytes.
+        """
+        if self.decompressing:
+            body_chunks = _decompressed(
+                self.__raw_chunks(chunk_size),
+                self.content_encoding,
+                self.max_decompressed_size,
+                chunk_size
+            )
+        else:
+            body_chunks = self.__raw_chunks(chunk_size)
+        if None == self.read_timeout:
+            async for data_chunk in body_chunks:
+                yield data_chunk
+            return
+        try:
+            while True:
+                try:
+                    async with _deadline("body read", self.read_timeout):
+                        data_chunk = await anext(body_chunks)
+                except StopAsyncIteration:
+                    break
+                yield data_chunk
+        finally:
+            await body_chunks.aclose()
+
+    async def __raw_chunks(
+        self: _Self,
+        chunk_size: int = 65536
+    ) -> _AsyncIterator[bytes]:
+        if self.finished:
+            return
+        if self.__closed:
+            raise RuntimeError("The response body stream is closed.")
+        if self.chunked:
+            async for data_chunk in _chunks(self.reader, chunk_size):
+                yield data_chunk
+        elif None != self.length:
+            remaining = self.length
+            while remaining > 0:
+                data_chunk = await self.reader.read(min(chunk_size, remaining))
+                if not data_chunk:
+                    raise _IncompleteReadError(b"", remaining)
+                remaining -= len(data_chunk)
+                yield data_chunk
+        else:
+            while True:
+                data_chunk = await self.reader.read(chunk_size)
+                if not data_chunk:
+                    break
+                yield data_chunk
+        self.finished = True
+
+    async def close(self: _Self) -> None:
+        if self.__closed:
+            return
+        self.__closed = True
+        if None != self.on_close:
+            await self.on_close(self.finished)
+
+
+async def listen_head(
     reader: _StreamReader,
-    join_chunked: bool = True,
-    encoding: str = "utf_8"
-) -> bytes:
-    result_body = []
-    mark = True
-    not_end = True
-    if join_chunked:
-        while not_end:
-            if mark:
-                line = await reader.readline()
-                line = line.strip()
-                size = int(line, 16)
-                if 0 == size:
-                    not_end = False
-                mark = False
-            else:
-                line = await _read_exactly(reader, size+2)
-                result_body.append(line)
-                mark = True
+    encoding: str = "utf_8",
+    *args, **kwargs
+) -> tuple[bytes, bytes, Body_Stream]:
+    """
+    Reads the head of one message (a response, or a request when used by
+    the server) from the 'reader'. The whole head is taken from the stream
+    buffer with one 'readuntil()' and parsed in a single pass; the body is
+    left in the reader and described by the returned 'Body_Stream'.
+
+    'method' is the method of the request the response answers - the
+    responses to "HEAD" and "CONNECT" have no body. 'first_byte_timeout'
+    limits the wait for the head. 'decompress', 'max_decompressed_size'
+    and 'read_timeout' are set on the returned 'Body_Stream'.
+
+    The head larger than the buffer limit of the 'reader' raises
+    'ConnectionError'.
+    """
+    try:
+        async with _deadline("first byte", kwargs.get("first_byte_timeout")):
+            head = await reader.readuntil(b"\r\n\r\n")
+    except _IncompleteReadError as err:
+        # the peer closed the connection
+        if not err.partial:
+            return (b"", b"", Body_Stream(reader))
+        head = err.partial
+    except _LimitOverrunError as err:
+        raise ConnectionError(
+            "The message head exceeds the buffer limit of the stream"\
+            " (64 KiB by default), pass the larger 'limit' to the"\
+            " connection."
+        ) from err
+    status_line, response_head, content_length, chunked, content_encoding \
+        = _parse_head(head, encoding)
+
+    is_response = status_line.startswith(b"HTTP/")
+    if is_response:
+        method = kwargs.get("method")
+        if None != method:
+            method = method.encode(encoding).upper()
+        bodyless = method in _bodyless_methods \
+            or status_line[9:12] in _bodyless_statuses
     else:
-        with _tmp.NamedTemporaryFile(
-            mode="w+b",
-            delete = join_chunked
-        ) as resp_file:
-            while not_end:
-                if mark:
-                    line = await reader.readline()
-                    line = line.strip()
-                    size = int(line, 16)
-                    if 0 == size:
-                        not_end = False
-                    mark = False
-                else:
-                    line = await _read_exactly(reader, size+2)
-                    resp_file.write(line)
-                    mark = True
-            result_body.append(
-                b"You may find the response body at "
-                + f"{resp_file.name}".encode(encoding)
+        bodyless = any(
+            map(
+                lambda x: status_line.startswith(x), _bodyless_methods
             )
-    return result_body
+        )
+
+    if bodyless:
+        body_stream = Body_Stream(reader, bodyless = True)
+    elif chunked:
+        body_stream = Body_Stream(reader, chunked = True)
+    elif None != content_length:
+        body_stream = Body_Stream(reader, length = content_length)
+    else:
+        # the response body ends with the connection (RFC 9112 section 6.3)
+        body_stream = Body_Stream(reader, until_eof = is_response)
+    body_stream.content_encoding = content_encoding
+    body_stream.decompress = bool(kwargs.get("decompress"))
+    if None != kwargs.get("max_decompressed_size"):
+        body_stream.max_decompressed_size = kwargs.get("max_decompressed_size")
+    body_stream.read_timeout = kwargs.get("read_timeout")
+    return (status_line, response_head, body_stream)
 
 
 async def listen_response(
@@ -91,73 +402,56 @@ async def listen_response(
     encoding: str = "utf_8",
     *args, **kwargs
 ) -> tuple[bytes|None, ...]:
+    """
+    Reads one whole message with 'listen_head()' and its body. Nothing
+    beyond the end of the message is consumed, so the next pipelined or
+    keep-alive response stays in the reader.
+
+    With 'spill_threshold' (or 'join_chunks=False', which uses the default
+    threshold of 1 MiB) the body is returned as the binary file - in
+    memory up to the threshold, in a temporary file above it.
+
+    With 'decompress' the gzip/deflate bodies are decompressed
+    incrementally while they are read (see 'Body_Stream').
+    """
     join_chunks = True
     if None != kwargs.get("join_chunks"):
         join_chunks = kwargs.get("join_chunks")
+    spill_threshold = kwargs.get("spill_threshold")
+    if None == spill_threshold and not join_chunks:
+        spill_threshold = _spill_threshold
 
     status_line = None
     response_head = None
     response_body = None
     if wait_resp:
-        content_length = False
-        timeout = None  #TODO: decide whether keep or not
-        chunked = False
-        listen = True
-
-        status_line = await reader.readline()
-        bodyless = any(
-            map(
-                lambda x: x in status_line, _bodyless_methods
-            )
+        status_line, response_head, body_stream = await listen_head(
+            reader,
+            encoding,
+            *args, **kwargs
         )
-        
-
-        # Listen to headers
-        while listen:
-            line = await reader.readline()
-            if line in response_ends:
-                listen = False
-            if response_head != None:
-                response_head += line
-            else:
-                response_head = line
-
-            if b"Content-Length" in line:
-                decoded_line = line.decode(encoding).strip()
-                decoded_line = list(
-                    map(lambda x: x.strip(), decoded_line.split(":"))
-                )
-                content_length = decoded_line[-1]
-            if b"Transfer-Encoding" in line:
-                decoded_line = line.decode(encoding).strip()
-                decoded_line = list(
-                    map(lambda x: x.strip(), decoded_line.split(":"))
-                )
-                chunked = decoded_line[-1]
+        if not status_line:
+            return (status_line, response_head, [])
 
-        listen = True
-        if 0 == int(content_length):
-            listen = False
         #listen to body
-        if bodyless:
+        if body_stream.bodyless:
             pass
+        elif None != spill_threshold:
+            response_body = await _spill(
+                body_stream.chunks(),
+                spill_threshold
+            )
+        elif body_stream.decompressing or None != body_stream.read_timeout:
+            response_body = [
+                data_chunk async for data_chunk in body_stream.chunks()
+            ]
+        elif body_stream.chunked:
+            response_body = await _chunked_reader(reader)
+        elif None != body_stream.length:
+            response_body = [await _read_exactly(reader, body_stream.length)]
+        elif body_stream.until_eof:
+            response_body = [await reader.read()]
         else:
-            if content_length:
-                response_body = [
-                    await _read_exactly(reader, int(content_length))
-                ]
-            elif chunked:
-                response_body = await _chunked_reader(
-                    reader,
-                    join_chunked = join_chunks,
-                    encoding = encoding
-                )
-            else:
-                response_body = []
-                while listen:
-                    line = await reader.readline()
-                    if line in response_ends:
-                        listen = False
-                    response_body.append(line)
-    
+            response_body = []
+
     return (status_line, response_head, response_body)
@@ -1,51 +1,19 @@
-import tempfile as _tmp
+from typing import BinaryIO as _BinaryIO
 
 from .base_objects import HTTP_Response as _Response
+from .http_headers import HTTP_Headers as _HTTP_Headers
+from .__response_listener import Body_Stream as _Body_Stream
 
 __all__ = ["parse_response"]
 
-def _str_split(target: str, sep: str) -> list[str]:
-    return list(map(lambda x: x.strip(), target.split(sep)))
-
-def _header_val_parse(header_key: str, header_value: str) -> dict[str, str]:
-    val_type = 0
-    result = dict()
-    header_value = _str_split(header_value, ";")
-    if 1 >= len(header_value):
-        header_value = _str_split(header_value[0], ",")
-        if 1 >= len(header_value):
-            pair = _str_split(header_value[0], "=")
-            if 1 == len(pair):
-                result[val_type] = pair[0]
-                val_type += 1
-            else:
-                result[pair[0]] = pair[1]
-        else:
-            for _ in header_value:
-                pair = _str_split(_, "=")
-                if 1 == len(pair):
-                    result[val_type] = pair[0]
-                    val_type += 1
-                else:
-                    result[pair[0]] = pair[1]
-    else:
-        for _ in header_value:
-            pair = _str_split(_, "=")
-            if 1 == len(pair):
-                result[val_type] = pair[0]
-                val_type += 1
-            else:
-                result[pair[0]] = pair[1]
-    return result
-
 
 def parse_response(
-    request_passed: bytes|None,
+    request_passed: bytes|list[bytes]|None,
     status_line: bytes|None,
     response_head: bytes|None,
-    response_body: bytes|None,
+    response_body: list[bytes]|_BinaryIO|None,
     encoding: str = "utf_8",
-    join_chunked: bool = True
+    stream: _Body_Stream = None
 ) -> _Response:
     result = _Response(request = request_passed)
     if all(
@@ -57,11 +25,20 @@ def parse_response(
             "status": None,
             "reason": None,
             "headers": None,
-            "body": None,
+            "content": None,
             "request": request_passed,
-            "protocol": None
+            "protocol": None,
+            "encoding": encoding,
+            "stream": stream,
+            "body_file": None
         }
         if status_line != None:
+            if not status_line:
+                # e.g. the idle keep-alive connection closed by the server
+                raise ConnectionError(
+                    "The connection was closed before the response was"\
+                    " received."
+                )
             status_line = status_line.decode(encoding).strip()
             try:
                 protocol, status, reason = status_line.split(
@@ -76,31 +53,16 @@ def parse_response(
                 parsed["protocol"] = protocol
 
         if response_head != None:
-            headers = dict()
-            response_head = list(
-                map(lambda x: x.strip(), response_head.split(b"\r\n"))
-            )
-            for part in response_head:
-                if part != b"":
-                    key, val = list(
-                        map(
-                            lambda x: x.decode(encoding).strip(),
-                            part.split(b":", maxsplit=1)
-                        )
-                    )
-                    headers[key] = _header_val_parse(key, val)
-            parsed["headers"] = headers
+            # the header values are parsed only when they are accessed
+            parsed["headers"] = _HTTP_Headers(response_head, encoding)
 
         if response_body != None:
-            if join_chunked:
-                response_body = b"".join(response_body)
-                result_body = b"".join(
-                    map(lambda x: x.strip(), response_body.split(b"\r\n"))
-                ).decode(encoding)
-                parsed["body"] = result_body
+            if isinstance(response_body, list):
+                # kept as bytes, decoded only when '.text' is accessed
+                parsed["content"] = b"".join(response_body)
             else:
-                response_body = response_body[0].decode(encoding)
-                parsed["body"] = response_body
+                # the spilled body is kept as the binary file, not decoded
+                parsed["body_file"] = response_body
 
         result = _Response(**parsed)
 
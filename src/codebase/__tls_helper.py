@@ -0,0 +1,95 @@
+from collections import OrderedDict as _OrderedDict
+import ssl as _ssl
+from threading import Lock as _Lock
+from typing import Self as _Self
+
+__all__ = ["get_ssl_context"]
+
+
+class _Resuming_SSLContext(_ssl.SSLContext):
+
+    """
+    Client-side 'ssl.SSLContext' that remembers the TLS sessions per server
+    host name and offers them on the next handshake to the same host, so
+    reconnects perform the abbreviated (resumed) handshake.
+
+    'asyncio' creates the TLS objects with '.wrap_bio()' without a session,
+    which is the place the stored session is injected.
+    """
+
+    max_sessions: int = 1024
+
+    def __init__(self: _Self, *args, **kwargs) -> None:
+        self.sessions: _OrderedDict[str, _ssl.SSLSession] = _OrderedDict()
+
+    def wrap_bio(
+        self: _Self,
+        incoming: _ssl.MemoryBIO,
+        outgoing: _ssl.MemoryBIO,
+        server_side: bool = False,
+        server_hostname: str = None,
+        session: _ssl.SSLSession = None
+    ) -> _ssl.SSLObject:
+        if None == session and not server_side and None != server_hostname:
+            session = self.sessions.get(server_hostname)
+        return super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side = server_side,
+            server_hostname = server_hostname,
+            session = session
+        )
+
+    def store_session(
+        self: _Self,
+        server_hostname: str,
+        ssl_object: _ssl.SSLObject|_ssl.SSLSocket|None
+    ) -> None:
+        if None == ssl_object or None == server_hostname:
+            return
+        session = ssl_object.session
+        if None == session or not session.has_ticket and not session.id:
+            return
+        self.sessions[server_hostname] = session
+        self.sessions.move_to_end(server_hostname)
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last = False)
+
+
+_contexts: dict[tuple, _Resuming_SSLContext] = dict()
+_contexts_lock = _Lock()
+
+
+def get_ssl_context(
+    verify: bool = True,
+    cafile: str = None,
+    capath: str = None,
+    certfile: str = None,
+    keyfile: str = None
+) -> _Resuming_SSLContext:
+    """
+    Returns the process-wide client 'SSLContext' for the given verification
+    settings. Contexts are built once per settings combination and then
+    shared by all connections (together with their stored TLS sessions).
+    """
+    key = (bool(verify), cafile, capath, certfile, keyfile)
+    context = _contexts.get(key)
+    if None != context:
+        return context
+    with _contexts_lock:
+        context = _contexts.get(key)
+        if None == context:
+            # mirrors 'ssl.create_default_context()' for server auth
+            context = _Resuming_SSLContext(_ssl.PROTOCOL_TLS_CLIENT)
+            if verify:
+                if None != cafile or None != capath:
+                    context.load_verify_locations(cafile, capath)
+                else:
+                    context.load_default_certs(_ssl.Purpose.SERVER_AUTH)
+            else:
+                context.check_hostname = False
+                context.verify_mode = _ssl.CERT_NONE
+            if None != certfile:
+                context.load_cert_chain(certfile, keyfile)
+            _contexts[key] = context
+    return context
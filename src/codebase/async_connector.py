@@ -1,9 +1,240 @@
 import asyncio as _aio
-from typing import Self
+from collections import deque as _deque
+from contextlib import asynccontextmanager as _asynccontextmanager
+from functools import partial as _partial
+from itertools import count as _count
+import math as _math
+import time as _time
+from typing import (
+    Any as _Any,
+    AsyncIterator as _AsyncIterator,
+    Self
+)
 
+from .balancer import (
+    Abstract_Balancer,
+    get_balancer as _get_balancer
+)
 from .base_objects import (
     Connection, HTTP_Response
 )
+from .connection_pool import keep_alive as _keep_alive
+from .request import request as _request
+from .resolver import Resolver
+
+
+def _ewma(previous: float|None, value: float, alpha: float = 0.2) -> float:
+    if None == previous:
+        return value
+    return previous + alpha * (value - previous)
+
+
+def _upstream_conf(upstream: str|tuple[str, int]) -> tuple[str, int]:
+    if isinstance(upstream, str):
+        host, port = upstream.rsplit(":", maxsplit = 1)
+        return host, int(port)
+    host, port = upstream
+    return host, int(port)
+
+
+class _Connection_Set:
+
+    """
+    The connections to one upstream with the checkout/checkin bookkeeping,
+    the load statistics used to size the set and balance the requests and
+    the health state used to eject the failing upstream.
+
+    A new connection is opened for the waiting request whenever there is
+    no live idle one and the set has fewer than 'max_conn' connections, also
+    after a dead connection was removed.
+    """
+
+    def __init__(
+        self: Self,
+        host: str,
+        port: int,
+        factory: _Any,
+        connections: dict[str|int, Connection],
+        names: _count,
+        max_failures: int = 3,
+        ejection_time: float = 1.0,
+        max_ejection_time: float = 60.0,
+        max_conn: int = 1
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.factory = factory
+        self.connections = connections
+        self.names = names
+        self.members: set[Connection] = set()
+        self.idle: _deque[Connection] = _deque()
+        self.waiters: _deque[_aio.Future] = _deque()
+        self.in_flight = 0
+        self.opening = 0
+        self.requests = 0
+        self.queue_wait: float|None = None
+        self.latency: float|None = None
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.max_conn = max_conn
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.__background: set[_aio.Future] = set()
+
+    @property
+    def size(self: Self) -> int:
+        return len(self.members) + self.opening
+
+    @property
+    def outstanding(self: Self) -> int:
+        return self.in_flight + len(self.waiters)
+
+    def is_healthy(self: Self) -> bool:
+        return self.ejected_until <= _time.monotonic()
+
+    def record(self: Self, success: bool) -> None:
+        """
+        Consecutive failures above 'max_failures' eject the upstream for
+        'ejection_time' seconds, doubled on every repeated ejection. After
+        that the upstream gets requests again and the first success
+        restores it completely.
+        """
+        if success:
+            self.failures = 0
+            self.ejections = 0
+            return
+        self.failures += 1
+        if self.failures >= self.max_failures and self.is_healthy():
+            self.ejected_until = _time.monotonic() + min(
+                self.max_ejection_time,
+                self.ejection_time * 2 ** self.ejections
+            )
+            self.ejections += 1
+
+    def add(self: Self, conn: Connection, name: str|int = None) -> None:
+        if None == name:
+            name = next(self.names)
+        self.connections[name] = conn
+        self.members.add(conn)
+
+    async def acquire(self: Self) -> Connection:
+        started = _time.monotonic()
+        self.requests += 1
+        conn = None
+        while self.idle and None == conn:
+            conn = self.idle.pop()
+            if not self.alive(conn):
+                await self.remove(conn)
+                conn = None
+        if None == conn:
+            # decided after the dead idle connections were removed
+            self.replenish()
+            waiter = _aio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                conn = await waiter
+            except _aio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.checkin(waiter.result())
+                raise
+        self.queue_wait = _ewma(self.queue_wait, _time.monotonic() - started)
+        self.in_flight += 1
+        return conn
+
+    async def release(
+        self: Self,
+        conn: Connection,
+        reuse: bool = True
+    ) -> None:
+        self.in_flight -= 1
+        if reuse and self.alive(conn):
+            self.checkin(conn)
+        else:
+            await self.remove(conn)
+
+    def checkin(self: Self, conn: Connection) -> None:
+        conn.last_used = _time.monotonic()
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(conn)
+                return
+        self.idle.append(conn)
+
+    async def grow(self: Self, number: int = 1) -> None:
+        """
+        Opens 'number' connections, already counted in '.opening' by
+        '.spawn_grow()'.
+        """
+        async def open_one() -> None:
+            conn = self.factory(self.host, self.port)
+            try:
+                await conn.open()
+            except Exception as err:
+                self.record(False)
+                # the error is passed to the request waiting for a connection
+                while self.waiters:
+                    waiter = self.waiters.popleft()
+                    if not waiter.done():
+                        waiter.set_exception(err)
+                        break
+            else:
+                self.add(conn)
+                self.checkin(conn)
+            finally:
+                self.opening -= 1
+
+        await _aio.gather(*[open_one() for _ in range(number)])
+
+    def replenish(self: Self) -> None:
+        """
+        Opens one more connection if the requests waiting (including the
+        one about to wait) outnumber the connections being opened.
+        """
+        if all((
+            not self.idle,
+            self.size < self.max_conn,
+            len(self.waiters) >= self.opening
+        )):
+            self.spawn_grow(1)
+
+    def spawn_grow(self: Self, number: int = 1) -> None:
+        # counted at once, so the calls made before the task runs see the
+        # connections being opened
+        self.opening += number
+        task = _aio.ensure_future(self.grow(number))
+        self.__background.add(task)
+        task.add_done_callback(self.__background.discard)
+
+    async def stop(self: Self) -> None:
+        for task in self.__background:
+            task.cancel()
+        await _aio.gather(*self.__background, return_exceptions = True)
+
+    async def remove(self: Self, conn: Connection) -> None:
+        self.members.discard(conn)
+        for key, val in list(self.connections.items()):
+            if val is conn:
+                del self.connections[key]
+        if not conn.is_closed():
+            try:
+                await conn.close()
+            except (ConnectionError, OSError):
+                pass
+        if len(self.waiters) > self.opening:
+            # the removed connection will not be checked in for the waiters
+            self.replenish()
+
+    @staticmethod
+    def alive(conn: Connection) -> bool:
+        return not any((
+            conn.is_closed(),
+            conn.reader.at_eof(),
+            conn.writer.is_closing()
+        ))
+
 
 class Async_Connector:
     """
@@ -15,42 +246,284 @@ class Async_Connector:
 
     All connections are stored in dicttionary and can be accessed through its
     key in '.connections' attribute.
+
+    All connections share one 'resolver' (the one of the running event loop
+    if not specified), so the target is resolved once for the whole set.
+
+    Connections can also be checked out with '.connection()' (or used
+    through '.call()'), in which case the connector keeps track of the load.
+    If 'max_conn' is greater than 'min_conn' (both default to 'num_conn'),
+    the number of connections is tuned every 'scale_interval' seconds within
+    these bounds: new connections are opened ahead of demand, estimated from
+    the queue wait, the requests in flight and the request rate times the
+    observed latency, and connections idle for 'idle_cooldown' seconds are
+    closed.
+
+    Instead of the single 'target_host'/'target_port' a list of 'upstreams'
+    ("host:port" strings or (host, port) pairs) can be passed. 'num_conn',
+    'min_conn' and 'max_conn' then apply to each upstream and every checkout
+    chooses the upstream with the 'balancer' policy: 'round_robin' (default),
+    'least_outstanding', 'p2c_ewma' or any 'balancer.Abstract_Balancer'.
+    After 'max_failures' consecutive failures (connection errors or 5xx
+    responses) an upstream is ejected for 'ejection_time' seconds, doubled
+    on repeated ejections up to 'max_ejection_time'.
+
+    With the 'proxy_pool' keyword argument ('proxy_pool.Proxy_Pool') the
+    connections are opened through the pool's proxies in parallel and the
+    request outcomes are reported back to the pool.
     """
     def __init__(
         self: Self,
-        target_host: str,
-        target_port: int,
+        target_host: str = None,
+        target_port: int = None,
         num_conn: int = 1,
         conn_names: list[str] = None,
         loop: _aio.BaseEventLoop = None,
         limit: int = None,
         proxy: dict[str, str | int] = None,
         ssl: bool = False,
+        resolver: Resolver = None,
         *args, **kwargs
     ) -> None:
-        self.connections = dict()
-        for _ in range(num_conn):
-            self.connections[_] = Connection(
-                target_host,
-                target_port,
+        self.resolver = resolver
+
+        upstreams = kwargs.pop("upstreams", None)
+        if None == upstreams:
+            if None == target_host or None == target_port:
+                raise RuntimeError(
+                    "Either 'target_host' and 'target_port' or 'upstreams'"\
+                    " should be specified."
+                )
+            upstreams = [(target_host, target_port)]
+        upstreams = [_upstream_conf(upstream) for upstream in upstreams]
+        self.target_host, self.target_port = upstreams[0]
+
+        if None != kwargs.get("min_conn"):
+            self.min_conn = kwargs.pop("min_conn")
+        else:
+            self.min_conn = num_conn
+        if None != kwargs.get("max_conn"):
+            self.max_conn = kwargs.pop("max_conn")
+        else:
+            self.max_conn = max(num_conn, self.min_conn)
+        self.scale_interval = kwargs.pop("scale_interval", 0.5)
+        self.idle_cooldown = kwargs.pop("idle_cooldown", 30.0)
+        self.target_wait = kwargs.pop("target_wait", 0.005)
+        self.headroom = kwargs.pop("headroom", 1.25)
+        self.balancer: Abstract_Balancer = _get_balancer(
+            kwargs.pop("balancer", "round_robin")
+        )
+        health = {
+            "max_failures": kwargs.pop("max_failures", 3),
+            "ejection_time": kwargs.pop("ejection_time", 1.0),
+            "max_ejection_time": kwargs.pop("max_ejection_time", 60.0)
+        }
+
+        def factory(host: str, port: int) -> Connection:
+            return Connection(
+                host,
+                port,
                 loop,
                 limit,
                 proxy,
                 ssl,
+                resolver,
                 *args, **kwargs
             )
-        if conn_names:
-            if len(conn_names) > num_conn:
-                max_range = num_conn
-            else:
-                max_range = len(conn_names)
-            for _ in range(max_range):
-                self.connections[conn_names[_]] = self.connections[_]
-                del self.connections[_]
+
+        self.connections = dict()
+        names = _count()
+        self.upstreams: list[_Connection_Set] = [
+            _Connection_Set(
+                host, port,
+                factory,
+                self.connections,
+                names,
+                max_conn = self.max_conn,
+                **health
+            )
+            for host, port in upstreams
+        ]
+        if None != conn_names:
+            conn_names = list(conn_names)
+        else:
+            conn_names = []
+        for upstream in self.upstreams:
+            for _ in range(num_conn):
+                name = next(names)
+                if conn_names:
+                    name = conn_names.pop(0)
+                upstream.add(factory(upstream.host, upstream.port), name)
+        self.__owners: dict[Connection, _Connection_Set] = dict()
+        self.__tuner = None
+
+    @property
+    def in_flight(self: Self) -> int:
+        return sum(upstream.in_flight for upstream in self.upstreams)
+
+    @property
+    def queue_wait(self: Self) -> float|None:
+        return self.__mean("queue_wait")
+
+    @property
+    def latency(self: Self) -> float|None:
+        return self.__mean("latency")
+
+    def __mean(self: Self, name: str) -> float|None:
+        values = [
+            getattr(upstream, name) for upstream in self.upstreams
+            if None != getattr(upstream, name)
+        ]
+        if not values:
+            return None
+        return sum(values) / len(values)
+
+    def choose_upstream(self: Self) -> _Connection_Set:
+        if 1 == len(self.upstreams):
+            return self.upstreams[0]
+        healthy = [
+            upstream for upstream in self.upstreams if upstream.is_healthy()
+        ]
+        if not healthy:
+            # all upstreams are ejected - better to try than to fail
+            healthy = self.upstreams
+        return self.balancer.choose(healthy)
+
+    async def acquire(self: Self) -> Connection:
+        """
+        Checks out a free connection of the upstream chosen by the balancer,
+        waiting for one if all of them are in use. Must be paired with
+        '.release()'.
+        """
+        upstream = self.choose_upstream()
+        conn = await upstream.acquire()
+        self.__owners[conn] = upstream
+        return conn
+
+    async def release(
+        self: Self,
+        conn: Connection,
+        reuse: bool = True
+    ) -> None:
+        """
+        Returns the connection checked out with '.acquire()'. With 'reuse'
+        set to 'False' the connection is closed and replaced later if
+        needed.
+        """
+        await self.__owners.pop(conn).release(conn, reuse)
+
+    @_asynccontextmanager
+    async def connection(self: Self) -> _AsyncIterator[Connection]:
+        conn = await self.acquire()
+        reuse = False
+        try:
+            yield conn
+            reuse = True
+        finally:
+            await self.release(conn, reuse)
+
+    async def call(self: Self, *args, **kwargs) -> HTTP_Response:
+        """
+        Performs 'request.call()' over one of the connector's connections.
+        Accepts the same parameters, except for the connection/stream ones.
+
+        With 'stream=True' the connection stays checked out until the body
+        is read to the end or the response is closed.
+        """
+        conn = await self.acquire()
+        upstream = self.__owners[conn]
+        kwargs.setdefault("host", upstream.host)
+        kwargs.setdefault("port", upstream.port)
+        started = _time.monotonic()
+        reuse = False
+        release = True
+        try:
+            response = await _request.call(connection = conn, *args, **kwargs)
+        except (OSError, _aio.IncompleteReadError, _aio.TimeoutError):
+            upstream.record(False)
+            conn.report_proxy(False)
+            raise
+        else:
+            reuse = _keep_alive(response)
+            upstream.record(None == response.status or response.status < 500)
+            conn.report_proxy(True, _time.monotonic() - started)
+            body_stream = response.stream
+            if None != body_stream and not body_stream.finished:
+                # released by the body stream once it is closed
+                release = False
+                body_stream.on_close = _partial(
+                    self.__release_streamed,
+                    conn,
+                    response
+                )
+        finally:
+            upstream.latency = _ewma(
+                upstream.latency,
+                _time.monotonic() - started
+            )
+            if release:
+                await self.release(conn, reuse)
+        return response
+
+    async def __release_streamed(
+        self: Self,
+        conn: Connection,
+        response: HTTP_Response,
+        finished: bool
+    ) -> None:
+        reuse = finished and _keep_alive(response)
+        if not reuse:
+            # the unread rest of the body makes the connection unusable
+            conn.abort()
+        await self.release(conn, reuse)
+
+    def _target_size(
+        self: Self,
+        upstream: _Connection_Set,
+        interval: float
+    ) -> int:
+        demand = upstream.outstanding
+        # Little's law: connections busy = request rate * latency
+        if None != upstream.latency:
+            demand = max(
+                demand,
+                upstream.requests / interval * upstream.latency
+            )
+        target = _math.ceil(demand * self.headroom)
+        if upstream.waiters or (upstream.queue_wait or 0) > self.target_wait:
+            target = max(target, upstream.size + 1)
+        return min(self.max_conn, max(self.min_conn, target))
+
+    async def _tune(self: Self) -> None:
+        while True:
+            await _aio.sleep(self.scale_interval)
+            for upstream in self.upstreams:
+                await self.__tune_upstream(upstream)
+
+    async def __tune_upstream(self: Self, upstream: _Connection_Set) -> None:
+        target = self._target_size(upstream, self.scale_interval)
+        upstream.requests = 0
+        if target > upstream.size and upstream.is_healthy():
+            upstream.spawn_grow(target - upstream.size)
+        elif target < upstream.size and not upstream.waiters:
+            deadline = _time.monotonic() - self.idle_cooldown
+            excess = upstream.size - target
+            # the least recently used connections are at the left
+            while excess and upstream.idle \
+                    and upstream.idle[0].last_used < deadline:
+                await upstream.remove(upstream.idle.popleft())
+                excess -= 1
+        if None != upstream.queue_wait and not upstream.waiters:
+            upstream.queue_wait = _ewma(upstream.queue_wait, 0.0)
 
     async def __aenter__(self: Self) -> dict[str|int, Connection]:
         tasks = [conn.open() for conn in self.connections.values()]
         await _aio.gather(*tasks)
+        for upstream in self.upstreams:
+            for conn in upstream.members:
+                upstream.checkin(conn)
+        if self.max_conn > self.min_conn:
+            self.__tuner = _aio.ensure_future(self._tune())
         return self.connections
 
     async def __aexit__(
@@ -59,5 +532,10 @@ class Async_Connector:
         exception_value,
         exception_traceback
     ) -> None:
+        if None != self.__tuner:
+            self.__tuner.cancel()
+            await _aio.gather(self.__tuner, return_exceptions = True)
+            self.__tuner = None
+        await _aio.gather(*[upstream.stop() for upstream in self.upstreams])
         tasks = [value.close() for value in self.connections.values()]
         await _aio.gather(*tasks)
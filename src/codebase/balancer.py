@@ -0,0 +1,112 @@
+from abc import (
+    ABC as _ABC,
+    abstractmethod as _abstractmethod
+)
+import random as _random
+from typing import (
+    Any as _Any,
+    Self as _Self,
+    Sequence as _Sequence
+)
+
+__all__ = [
+    "Abstract_Balancer",
+    "Least_Outstanding",
+    "P2C_EWMA",
+    "Round_Robin",
+    "get_balancer"
+]
+
+
+class Abstract_Balancer(_ABC):
+
+    """
+    Abstract class to be a minimal template for the load balancing policies
+    used by 'Async_Connector'. '.choose()' receives only the healthy
+    upstreams (never an empty sequence). Each upstream provides the
+    'host', 'port', 'in_flight', 'outstanding' (in flight + waiting) and
+    'latency' (EWMA in seconds or 'None' before the first request)
+    attributes.
+    """
+
+    @_abstractmethod
+    def choose(
+        self: _Self,
+        upstreams: _Sequence[_Any]
+    ) -> _Any:
+        pass
+
+
+class Round_Robin(Abstract_Balancer):
+
+    def __init__(self: _Self) -> None:
+        self.__next = 0
+
+    def choose(
+        self: _Self,
+        upstreams: _Sequence[_Any]
+    ) -> _Any:
+        chosen = upstreams[self.__next % len(upstreams)]
+        self.__next += 1
+        return chosen
+
+
+class Least_Outstanding(Abstract_Balancer):
+
+    def choose(
+        self: _Self,
+        upstreams: _Sequence[_Any]
+    ) -> _Any:
+        lowest = min(upstream.outstanding for upstream in upstreams)
+        # ties are broken randomly so the first upstream is not favoured
+        return _random.choice(
+            [item for item in upstreams if item.outstanding == lowest]
+        )
+
+
+class P2C_EWMA(Abstract_Balancer):
+
+    """
+    "Power of two choices": two random upstreams are compared by the EWMA
+    latency weighted with the number of outstanding requests, the cheaper
+    one is chosen. Upstreams without latency data yet are preferred, so
+    they get probed.
+    """
+
+    @staticmethod
+    def cost(upstream: _Any) -> float:
+        if None == upstream.latency:
+            return 0.0
+        return upstream.latency * (upstream.outstanding + 1)
+
+    def choose(
+        self: _Self,
+        upstreams: _Sequence[_Any]
+    ) -> _Any:
+        if 1 == len(upstreams):
+            return upstreams[0]
+        first, second = _random.sample(upstreams, 2)
+        if self.cost(second) < self.cost(first):
+            return second
+        return first
+
+
+_policies: dict[str, type[Abstract_Balancer]] = {
+    "round_robin": Round_Robin,
+    "least_outstanding": Least_Outstanding,
+    "p2c_ewma": P2C_EWMA
+}
+
+
+def get_balancer(
+    policy: str|Abstract_Balancer = "round_robin"
+) -> Abstract_Balancer:
+    if isinstance(policy, Abstract_Balancer):
+        return policy
+    if None == _policies.get(policy):
+        raise ValueError(
+            f"Unknown balancing policy {policy!r}. Choose one of"\
+            f" {', '.join(map(repr, _policies))} or pass an"\
+            f" 'Abstract_Balancer' instance."
+        )
+    return _policies[policy]()
@@ -1,8 +1,15 @@
 import asyncio as _aio
 import base64
+from functools import partial as _partial
+from io import BytesIO as _BytesIO
+import mmap as _mmap
 from socket import socket as _socket
+import ssl as _ssl
 from threading import Thread
 from typing import (
+    Any as _Any,
+    AsyncIterator as _AsyncIterator,
+    BinaryIO as _BinaryIO,
     Callable as _Callable,
     Self as _Self,
 )
@@ -10,13 +17,38 @@ from typing import (
 from .async_server_base import (
     BaseAsyncServerTemplate as _BaseAsyncServerTemplate,
 )
+from .body_codecs import (
+    Abstract_Codec as _Abstract_Codec,
+    codec_for_content_type as _codec_for_content_type,
+    get_codec as _get_codec
+)
+from .http_headers import HTTP_Headers as _HTTP_Headers
 from .__proxy_helper import Proxy_Helper as _Proxy_Helper
+from .__request_builder import (
+    Streamed_Request as _Streamed_Request,
+    request_buffers as _request_buffers,
+    request_head as _request_head,
+    send_request as _send_request
+)
 from .__request_parser import (
     all_good as _all_good,
     error_handler as _error_handler
 )
 from .__response_builder import build_response_meta
-from .__response_listener import listen_response as _listen_response
+from .__response_listener import (
+    Body_Stream as _Body_Stream,
+    listen_response as _listen_response
+)
+from .__tls_helper import get_ssl_context as _get_ssl_context
+from .proxy_pool import Proxy_Pool as _Proxy_Pool
+from .resolver import (
+    Resolver as _Resolver,
+    default_resolver as _default_resolver
+)
+from .timeouts import (
+    Timeouts as _Timeouts,
+    deadline as _deadline
+)
 
 __all__ = [
     "AsyncServer",
@@ -24,6 +56,13 @@ __all__ = [
     "HTTP_Response"
 ]
 
+
+def _parse_response(*args, **kwargs) -> "HTTP_Response":
+    # deferred import: the parser module depends on 'HTTP_Response'
+    from .__response_parser import parse_response
+    return parse_response(*args, **kwargs)
+
+
 class Connection:
 
     """
@@ -32,8 +71,8 @@ class Connection:
 
     Hold all necessary information to open asyncronous connection in form of
     \"(asyncio.StreamReader, asyncio.StreamWriter)\" pair. The major
-    modification is the ability to work with proxy. Currently only http/https
-    proxies are supported.
+    modification is the ability to work with proxy. http/https (CONNECT) and
+    socks5 proxies are supported.
 
     Most stated parameters are passed directly to the
     \"asyncio.open_connection()\"
@@ -43,15 +82,57 @@ class Connection:
     corresponing to the 'prox_type':
     1) \"http\": \"<proxy_server_adress>:<proxy_server_port>\"
     2) \"htts\": \"<proxy_server_adress>:<proxy_server_port>\"
-    3) \"socks5\": \"<proxy_server_adress>:<proxy_server_port>\" - planned in
-                                                                   future
+    3) \"socks5\": \"<proxy_server_adress>:<proxy_server_port>\"
     'proxy' optional keys are 'username', 'password' and 'key' (auth-key).
     If presented, 'key' should be preferable to the 'username', 'password'.
+    For 'socks5' the optional 'remote_dns' key ('True' by default) decides
+    whether the target host name is resolved by the proxy or locally.
+
+    'proxy_pool' ('proxy_pool.Proxy_Pool') can be passed instead of 'proxy'
+    to open the tunnel through the best scoring proxy of the pool.
+
+    Direct connections resolve the target through 'resolver' (the caching
+    resolver of the running event loop by default, see './resolver.py').
+
+    With 'ssl=True' the shared 'SSLContext' for the 'verify' (default
+    'True') and 'cafile' keyword arguments is used and the TLS sessions are
+    resumed on reconnects to the same host. 'ssl' may also be a ready
+    'SSLContext'.
+
+    'timeouts' ('timeouts.Timeouts' or the number of seconds for the whole
+    '.open()') limits the connect, proxy tunnel and TLS handshake phases of
+    '.open()'. The connection is aborted if a deadline expires.
 
     \".open()\" and \".close()\" methods should be used to prevent possible
     bugs.
+
+    The attributes are slotted: 'reader'/'writer' are 'None' until the
+    connection is opened, 'proxy' and 'limit' are 'None' when they were not
+    passed (as 'add_header' without the proxy). 'pool_key' and 'last_used'
+    are set by the pools.
     """
 
+    __slots__ = (
+        "__closed",
+        "target_host",
+        "target_port",
+        "ssl",
+        "resolver",
+        "ssl_verify",
+        "ssl_cafile",
+        "limit",
+        "loop",
+        "proxy",
+        "add_header",
+        "proxy_pool",
+        "proxy_entry",
+        "timeouts",
+        "reader",
+        "writer",
+        "pool_key",
+        "last_used"
+    )
+
     def __init__(
         self: _Self,
         host: str,
@@ -60,59 +141,237 @@ class Connection:
         limit: int = None,
         proxy: dict[str, str | int] = None,
         ssl: bool = False,
+        resolver: _Resolver = None,
+        proxy_pool: _Proxy_Pool = None,
         *args, **kwargs
     ) -> None:
         self.__closed = True
         self.target_host = host
         self.target_port = port
         self.ssl = ssl
-        if limit != None:
-            self.limit = limit
-        if loop != None:
-            self.loop = None
+        # 'None' for the resolver of the loop the connection is opened in
+        self.resolver: _Resolver|None = resolver
+        self.ssl_verify = kwargs.get("verify", True)
+        self.ssl_cafile = kwargs.get("cafile")
+        self.limit = limit
+        self.loop = None
+        self.proxy: _Proxy_Helper|None = None
+        self.add_header: dict[str, str]|None = None
         if proxy != None:
             self.proxy = _Proxy_Helper(**proxy)
-            self.add_header = {**self.proxy.add_header}
+            self.add_header = {**getattr(self.proxy, "add_header", {})}
+        self.proxy_pool = proxy_pool
+        self.proxy_entry = None
+        self.timeouts: _Timeouts|float|None = kwargs.get("timeouts")
+        self.reader: _aio.StreamReader|None = None
+        self.writer: _aio.StreamWriter|None = None
+        self.pool_key: tuple|None = None
+        self.last_used: float|None = None
 
     async def open(self: _Self):
         """
         Function to open the Connection instance
         """
+        timeouts = _Timeouts.of(self.timeouts)
         try:
-            parsed_arguments = {"ssl": self.ssl}
-            if hasattr(self, "proxy"):
-                if self.ssl:
-                    parsed_arguments["server_hostname"] = self.target_host
-                self.proxy.connect_socket(self.target_host, self.target_port)
-                parsed_arguments["sock"] = self.proxy.socket
-            else:
-                parsed_arguments["host"] = self.target_host
-                parsed_arguments["port"] = self.target_port
-            self.reader, self.writer = await _aio.open_connection(
-                **parsed_arguments
-            )
-        except:
+            async with _deadline("connection", timeouts.total):
+                await self.__open(timeouts)
+        except BaseException:
+            # the half-opened transport (e.g. after the expired deadline)
+            # is dropped
+            self.abort()
             raise
         else:
             self.__closed = False
+            self.store_tls_session()
+
+    async def __open(self: _Self, timeouts: _Timeouts) -> None:
+        ssl_context = self.ssl_context()
+        if None != self.proxy_pool or None != self.proxy:
+            if None != self.proxy_pool:
+                # the deadline applies to each proxy tried by the pool
+                self.reader, self.writer, self.proxy_entry = \
+                    await self.proxy_pool.open_tunnel(
+                        self.target_host,
+                        self.target_port,
+                        limit = self.limit,
+                        timeout = timeouts.proxy
+                    )
+            else:
+                async with _deadline("proxy tunnel", timeouts.proxy):
+                    self.reader, self.writer = await self.proxy.open_tunnel(
+                        self.target_host,
+                        self.target_port,
+                        limit = self.limit
+                    )
+            if None != ssl_context:
+                async with _deadline("TLS handshake", timeouts.tls):
+                    await self.writer.start_tls(
+                        ssl_context,
+                        server_hostname = self.target_host
+                    )
+        else:
+            async with _deadline("connect", timeouts.connect):
+                resolver = self.resolver
+                if None == resolver:
+                    resolver = _default_resolver()
+                sock = await resolver.connect(
+                    self.target_host,
+                    self.target_port
+                )
+            parsed_arguments = {
+                "ssl": ssl_context,
+                "sock": sock
+            }
+            if None != ssl_context:
+                parsed_arguments["server_hostname"] = self.target_host
+            if None != self.limit:
+                parsed_arguments["limit"] = self.limit
+            try:
+                # the socket is connected, only the TLS handshake is left
+                async with _deadline("TLS handshake", timeouts.tls):
+                    self.reader, self.writer = await _aio.open_connection(
+                        **parsed_arguments
+                    )
+            except BaseException:
+                sock.close()
+                raise
+
+    def abort(self: _Self) -> None:
+        """
+        Drops the connection at once without flushing the write buffer or
+        waiting for the peer (e.g. after a deadline expired). The connection
+        should not be reused.
+        """
+        if None != self.writer:
+            self.writer.transport.abort()
+        if None != self.proxy:
+            self.proxy.socket.close()
+        self.__closed = True
+        if None != self.proxy_entry:
+            self.proxy_pool.release(self.proxy_entry)
+            self.proxy_entry = None
+
+    def ssl_context(self: _Self) -> _ssl.SSLContext|None:
+        """
+        Returns the 'SSLContext' used by the connection: the passed one if
+        'ssl' is a context, the shared process-wide one for the 'verify'/
+        'cafile' settings if 'ssl' is 'True' and 'None' for plain TCP.
+        """
+        if isinstance(self.ssl, _ssl.SSLContext):
+            return self.ssl
+        if self.ssl:
+            return _get_ssl_context(
+                verify = self.ssl_verify,
+                cafile = self.ssl_cafile
+            )
+        return None
+
+    def store_tls_session(self: _Self) -> None:
+        """
+        Saves the TLS session of the opened connection in the shared
+        context, so the next connection to the same host resumes it.
+        """
+        if None == self.writer:
+            return
+        context = self.ssl_context()
+        if hasattr(context, "store_session"):
+            context.store_session(
+                self.target_host,
+                self.writer.get_extra_info("ssl_object")
+            )
 
     async def close(self: _Self):
         """
         Function to close the Connection instance
         """
         try:
+            self.store_tls_session()
             self.writer.close()
             await self.writer.wait_closed()
-            if hasattr(self, "proxy"):
+            if None != self.proxy:
                 self.proxy.socket.close()
         except:
             raise
         else:
             self.__closed = True
+        finally:
+            if None != self.proxy_entry:
+                self.proxy_pool.release(self.proxy_entry)
+                self.proxy_entry = None
+
+    def report_proxy(self: _Self, success: bool, latency: float = None):
+        """
+        Passes the outcome of a request to the proxy pool the connection
+        was opened through (does nothing without the proxy pool).
+        """
+        if None != self.proxy_entry:
+            self.proxy_pool.report(self.proxy_entry, success, latency)
+
+    async def rotate_proxy(self: _Self) -> None:
+        """
+        Reopens the connection through the currently best scoring proxy of
+        the proxy pool.
+        """
+        if None == self.proxy_pool:
+            raise RuntimeError("The connection has no proxy pool to rotate.")
+        if not self.__closed:
+            await self.close()
+        await self.open()
 
     def is_closed(self: _Self) -> bool:
         return self.__closed
 
+    async def pipeline(
+        self: _Self,
+        requests: list[list[bytes]|_Streamed_Request],
+        encoding: str = "utf_8",
+        join_chunks: bool = True,
+        spill_threshold: int = None,
+        keep_request: bool = True,
+        *args, **kwargs
+    ) -> list["HTTP_Response"]:
+        """
+        Sends all prepared 'requests' back to back (HTTP/1.1 pipelining)
+        with a single drain and reads the responses in the same order.
+        With 'keep_request=False' the responses do not keep the requests.
+
+        The target server should support pipelining. Raises
+        'ConnectionError' if the server closed the connection before
+        answering all of the requests.
+        """
+        if any(isinstance(item, _Streamed_Request) for item in requests):
+            for cooked_request in requests:
+                await _send_request(self.writer, cooked_request)
+        else:
+            self.writer.writelines(_request_buffers(requests))
+            await self.writer.drain()
+        responses = []
+        for cooked_request in requests:
+            head = _request_head(cooked_request)[0]
+            status_line, response_head, response_body = await _listen_response(
+                reader = self.reader,
+                encoding = encoding,
+                join_chunks = join_chunks,
+                spill_threshold = spill_threshold,
+                method = head[:head.find(b" ")].decode(encoding)
+            )
+            if not status_line:
+                raise ConnectionError(
+                    f"Connection closed after {len(responses)} of"\
+                    f" {len(requests)} pipelined responses."
+                )
+            responses.append(
+                _parse_response(
+                    _request_head(cooked_request) if keep_request else None,
+                    status_line,
+                    response_head,
+                    response_body,
+                    encoding = encoding
+                )
+            )
+        return responses
+
     async def update_proxy_data(
         self: _Self,
         new_type: str,
@@ -121,7 +380,7 @@ class Connection:
         new_username: str = None,
         new_password: str = None
     ) -> None:
-        if hasattr(self, "proxy"):
+        if None != self.proxy:
             await self.close()
             self.proxy.switch(
                 new_type,
@@ -132,7 +391,7 @@ class Connection:
                 new_username = new_username,
                 new_password = new_password
             )
-            self.add_header = {**self.proxy.add_header}
+            self.add_header = {**getattr(self.proxy, "add_header", {})}
             await self.open()
 
     async def __aenter__(self: _Self) -> _Self:
@@ -152,20 +411,50 @@ class HTTP_Response:
 
     """
     Class representing the HTTP request response
+
+    The body is kept as the received bytes ('.content'). '.text' (also
+    available as '.body') and '.json()' decode it on the first access with
+    the charset of the 'Content-Type' header (the request 'encoding' when
+    there is none) and keep the result.
+
+    The responses read with 'spill_threshold' (or 'join_chunks=False') have
+    no str '.body'. Their body is kept as bytes in memory up to the
+    threshold and in a temporary file above it, and is accessed with
+    '.body_file' or '.body_view()'. The file is removed by '.aclose()' or
+    '.clear()'.
+
+    The attributes are slotted to keep large numbers of responses compact.
+    The request is not kept on the responses of the requests sent with
+    'keep_request=False'.
     """
 
+    __slots__ = (
+        "__protocol",
+        "__status",
+        "__reason",
+        "__headers",
+        "__request",
+        "__content",
+        "__text",
+        "__json",
+        "__encoding",
+        "__stream",
+        "__body_file",
+        "__body_map"
+    )
+
     def __init__(
         self: _Self,
         status: str = None,
         reason: str = None,
-        headers: dict[str, str] = None,
-        request: bytes = None,
+        headers: _HTTP_Headers = None,
+        request: bytes|list[bytes] = None,
         body: str = None,
         encoding: str = "utf_8",
         *args, **kwargs
     ) -> None:
-        if None != kwargs.get("protocol"):
-            self.__protocol = kwargs.get("protocol")
+        # 'body' is the already decoded text, 'content' the raw body bytes
+        self.__protocol = kwargs.get("protocol")
         if status != None:
             self.__status = int(status)
         else:
@@ -173,19 +462,33 @@ class HTTP_Response:
         self.__reason = reason
         self.__headers = headers
         self.__request = request
-        self.__body = body
+        self.__content: bytes|None = kwargs.get("content")
+        self.__text: str|None = body
+        self.__json: tuple[_Any]|None = None
         self.__encoding = encoding
+        self.__stream = kwargs.get("stream")
+        self.__body_file: _BinaryIO|None = kwargs.get("body_file")
+        self.__body_map: _mmap.mmap|None = None
 
     @property
     def status(self: _Self) -> str:
         return self.__status
 
     @property
-    def request(self: _Self) -> str:
-        return self.__request.decode(self.__encoding)
+    def protocol(self: _Self) -> str:
+        return self.__protocol
+
+    @property
+    def request(self: _Self) -> str|None:
+        if None == self.b_request:
+            return None
+        return self.b_request.decode(self.__encoding)
 
     @property
-    def b_request(self: _Self) -> str:
+    def b_request(self: _Self) -> bytes|None:
+        if isinstance(self.__request, list):
+            # the request buffers are joined only on the first access
+            self.__request = b"".join(self.__request)
         return self.__request
 
     @property
@@ -193,13 +496,219 @@ class HTTP_Response:
         return f"{self.__status}{self.__reason}"
 
     @property
-    def body(self: _Self) -> str:
-        return self.__body
+    def content(self: _Self) -> bytes|None:
+        if None == self.__content and None != self.__text:
+            self.__content = self.__text.encode(self.__encoding)
+        return self.__content
+
+    @property
+    def charset(self: _Self) -> str:
+        """
+        The 'charset' parameter of the 'Content-Type' header or the
+        request 'encoding'.
+        """
+        if None != self.__headers:
+            params = self.__headers.params("Content-Type") or dict()
+            for key, val in params.items():
+                if isinstance(key, str) and "charset" == key.lower():
+                    return val.strip("\"'")
+        return self.__encoding
+
+    @property
+    def text(self: _Self) -> str|None:
+        if None == self.__text and None != self.__content:
+            try:
+                self.__text = self.__content.decode(
+                    self.charset,
+                    errors = "replace"
+                )
+            except LookupError:
+                # the unknown charset of the server
+                self.__text = self.__content.decode(
+                    self.__encoding,
+                    errors = "replace"
+                )
+        return self.__text
+
+    @property
+    def body(self: _Self) -> str|None:
+        return self.text
+
+    def json(self: _Self) -> _Any:
+        """
+        Decodes the JSON body. The result is kept, so the same object is
+        returned on the next calls.
+        """
+        if None == self.__json:
+            content = self.content
+            if None == content:
+                return None
+            self.__json = (_get_codec("json").decode(content, self.charset),)
+        return self.__json[0]
 
     @property
-    def headers(self: _Self) -> dict[str, str]:
+    def headers(self: _Self) -> _HTTP_Headers:
         return self.__headers
 
+    @property
+    def stream(self: _Self) -> _Body_Stream|None:
+        return self.__stream
+
+    @property
+    def body_file(self: _Self) -> _BinaryIO|None:
+        """
+        The binary file of the body read with 'spill_threshold', positioned
+        at the start of the body on creation.
+        """
+        return self.__body_file
+
+    def body_view(self: _Self) -> memoryview|None:
+        """
+        Returns the read-only view of the body read with 'spill_threshold'
+        without copying it - the body file is memory-mapped once it was
+        spilled to the disk. The view should be released before the
+        response is closed.
+        """
+        if None == self.__body_file:
+            return None
+        if isinstance(self.__body_file, _BytesIO):
+            # the unmodified buffer is returned by '.getvalue()' uncopied
+            return memoryview(self.__body_file.getvalue())
+        if None == self.__body_map:
+            self.__body_file.flush()
+            self.__body_map = _mmap.mmap(
+                self.__body_file.fileno(),
+                0,
+                access = _mmap.ACCESS_READ
+            )
+        return memoryview(self.__body_map)
+
+    def __close_body_file(self: _Self) -> None:
+        if None != self.__body_map:
+            try:
+                self.__body_map.close()
+            except BufferError:
+                # the view is still in use, the map is closed with it
+                pass
+            self.__body_map = None
+        if None != self.__body_file:
+            self.__body_file.close()
+            self.__body_file = None
+
+    async def aiter_bytes(
+        self: _Self,
+        chunk_size: int = 65536
+    ) -> _AsyncIterator[bytes]:
+        """
+        Yields the body of the response received with 'stream=True' in
+        pieces of at most 'chunk_size' bytes as they arrive. The stream is
+        closed (and the connection released) when the body is read to the
+        end or the iteration is stopped.
+        """
+        if None == self.__stream:
+            if None != self.content:
+                yield self.content
+            return
+        try:
+            async for data_chunk in self.__stream.chunks(chunk_size):
+                yield data_chunk
+        finally:
+            await self.__stream.close()
+
+    async def aread(self: _Self) -> bytes:
+        """
+        Reads the rest of the streamed body, which is then also available
+        as '.content'.
+        """
+        data = b"".join([
+            data_chunk async for data_chunk in self.aiter_bytes()
+        ])
+        if None != self.__stream:
+            self.__content = data
+            self.__text = None
+            self.__json = None
+            self.__stream = None
+        return data
+
+    async def aclose(self: _Self) -> None:
+        """
+        Closes the body stream without reading the rest of it and removes
+        the spilled body file.
+        """
+        if None != self.__stream:
+            await self.__stream.close()
+        self.__close_body_file()
+
+    async def __aenter__(self: _Self) -> _Self:
+        return self
+
+    async def __aexit__(
+        self: _Self,
+        exception_type,
+        exception_value,
+        exception_traceback
+    ) -> None:
+        await self.aclose()
+
+    @property
+    def content_type(self: _Self) -> str|None:
+        if None == self.__headers:
+            return None
+        return self.__headers.value("Content-Type")
+
+    def __codec(
+        self: _Self,
+        codec: str|_Abstract_Codec|None
+    ) -> _Abstract_Codec:
+        if None != codec:
+            return _get_codec(codec)
+        found = _codec_for_content_type(self.content_type)
+        if None == found:
+            raise ValueError(
+                f"No codec matches the response content type"\
+                f" {self.content_type!r}. Pass the 'codec' explicitly."
+            )
+        return found
+
+    def decode(
+        self: _Self,
+        codec: str|_Abstract_Codec = None
+    ) -> _Any:
+        """
+        Decodes the body with the 'codec' (the registered name or the
+        instance) or with the codec matching the response 'Content-Type'.
+        """
+        content = self.content
+        if None == content:
+            return None
+        return self.__codec(codec).decode(
+            content,
+            self.charset,
+            content_type = self.content_type
+        )
+
+    async def adecode(
+        self: _Self,
+        codec: str|_Abstract_Codec = None
+    ) -> _Any:
+        """
+        The same as '.decode()', but the body of at least 'offload_size'
+        of the codec is decoded in the default executor.
+        """
+        content = self.content
+        if None == content:
+            return None
+        codec = self.__codec(codec)
+        decode = _partial(
+            codec.decode,
+            content,
+            self.charset,
+            content_type = self.content_type
+        )
+        if len(content) >= codec.offload_size:
+            return await _aio.get_running_loop().run_in_executor(None, decode)
+        return decode()
+
     def formated(
         self: _Self
     ) -> str:
@@ -207,15 +716,11 @@ class HTTP_Response:
             f"{self.__protocol}\n\n"
         if self.__headers != None:
             return_string +="Headers:\n"
-            for key, val in self.__headers.items():
-                if 1 == len(val) and 0 == list(val.keys())[0]:
-                    pval = val[0]
-                else:
-                    pval = val
-                return_string += f"- {key}: {pval}\n"
+            for key, val in self.__headers.fields():
+                return_string += f"- {key}: {val}\n"
             return_string += "\n"
-        if self.__body != None:
-            return_string += f"\n{self.__body}"
+        if self.text != None:
+            return_string += f"\n{self.text}"
         return return_string
 
     def clear(self: _Self) -> None:
@@ -225,8 +730,12 @@ class HTTP_Response:
         self.__reason = None
         self.__headers = None
         self.__request = None
-        self.__body = None
+        self.__content = None
+        self.__text = None
+        self.__json = None
         self.__encoding = None
+        self.__stream = None
+        self.__close_body_file()
 
 
 class AsyncServer(_BaseAsyncServerTemplate):
@@ -281,22 +790,19 @@ class AsyncServer(_BaseAsyncServerTemplate):
                     status, reason, error_info, err_headers = _error_handler(
                         error
                     )
-                    error_occured = self._response_status_builder(
+                    response = self._response_status_builder(
                         status, reason,
-                        body = error_details,
+                        body = error_info,
                         add_headers = err_headers
                     )
-                    response = error_occured.encode(self.encoding)
             else:
-                not_found_response_meta = self._response_status_builder(
+                response = self._response_status_builder(
                     404, "Not Found"
                 )
-                response = not_found_response_meta.encode(self.encoding)
         else:
-            not_allowed_response = self._response_status_builder(
+            response = self._response_status_builder(
                 405, "Method Not Allowed"
             )
-            response = not_allowed_response.encode(self.encoding)
 
         # Need to change the order of reaction depending if needed/set up
         # during initialization:
@@ -304,11 +810,10 @@ class AsyncServer(_BaseAsyncServerTemplate):
         # - listener == False -> react-processing and post-reaction
         if self.listener:
             if proceed:
-                ok200 = self._response_status_builder(
+                response = self._response_status_builder(
                     200, "OK"
                 )
-                response = ok200.encode(self.encoding)
-            stream_writer.write(response)
+            stream_writer.writelines(response)
             await stream_writer.drain()
             stream_writer.close()
             await stream_writer.wait_closed()
@@ -343,13 +848,12 @@ class AsyncServer(_BaseAsyncServerTemplate):
                 else:
                     response_body, addition_heads = None, None
 
-                ok200 = self._response_status_builder(
+                response = self._response_status_builder(
                     200, "OK",
                     body = response_body,
                     add_headers = addition_heads
                 )
-                response = ok200.encode(self.encoding)
-            stream_writer.write(response)
+            stream_writer.writelines(response)
             await stream_writer.drain()
             stream_writer.close()
             await stream_writer.wait_closed()
@@ -358,10 +862,10 @@ class AsyncServer(_BaseAsyncServerTemplate):
         self: _Self,
         status: int,
         reason: str,
-        body: str = None,
+        body: str|bytes = None,
         add_headers: dict[str, str] = None,
         *args, **kwargs
-    ) -> str:
+    ) -> list[bytes]:
         # # Comment out the following line during implementation of method
         # raise NotImplemented("This method is currently not implemented.")
         headers_passed = {
@@ -369,6 +873,7 @@ class AsyncServer(_BaseAsyncServerTemplate):
         }
         if None != add_headers:
             headers_passed.update(add_headers)
+        kwargs.setdefault("encoding", self.encoding)
         return build_response_meta(
             self.protocol,
             self.protocol_version,
@@ -0,0 +1,302 @@
+from abc import (
+    ABC as _ABC,
+    abstractmethod as _abstractmethod
+)
+from email.parser import BytesParser as _BytesParser
+from email.policy import HTTP as _HTTP_policy
+import json as _json
+from typing import (
+    Any as _Any,
+    Self as _Self
+)
+from urllib.parse import (
+    parse_qs as _parse_qs,
+    urlencode as _urlencode
+)
+
+__all__ = [
+    "Abstract_Codec",
+    "Form_Codec",
+    "JSON_Codec",
+    "Multipart_Codec",
+    "codec_for_content_type",
+    "get_codec",
+    "register_codec",
+    "should_offload"
+]
+
+
+def _estimate_size(data: _Any, limit: int) -> int:
+    # walks the structure only until the 'limit' is reached, so the
+    # estimation of a large payload costs no more than 'limit' items
+    size = 0
+    stack = [data]
+    while stack and size < limit:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, bytearray)):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += 2
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            size += 2
+            stack.extend(item)
+        else:
+            size += 8
+    return size
+
+
+class Abstract_Codec(_ABC):
+
+    """
+    Abstract class to be a minimal template for the request and response
+    body codecs.
+
+    '.encode()' turns the 'data' of the request into the body bytes,
+    '.decode()' turns the response body back into the Python object.
+    '.headers()' returns the headers describing the encoded body.
+
+    The payloads estimated to be at least 'offload_size' bytes are
+    encoded/decoded in the default executor instead of the event loop. The
+    executor calls '.encode_off_loop()', which codecs whose encoder holds
+    the GIL for the whole payload override with an incremental one, so the
+    event loop thread still gets the GIL while the payload is encoded.
+    """
+
+    content_type: str = None
+    offload_size: int = 262144
+
+    @_abstractmethod
+    def encode(
+        self: _Self,
+        data: _Any,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> bytes:
+        pass
+
+    @_abstractmethod
+    def decode(
+        self: _Self,
+        body: bytes|str,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> _Any:
+        pass
+
+    def encode_off_loop(
+        self: _Self,
+        data: _Any,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> bytes:
+        return self.encode(data, encoding, *args, **kwargs)
+
+    def headers(self: _Self, *args, **kwargs) -> dict[str, str]:
+        return {"Content-Type": self.content_type}
+
+    def estimate_size(self: _Self, data: _Any) -> int:
+        return _estimate_size(data, self.offload_size)
+
+    def matches(self: _Self, content_type: str) -> bool:
+        return content_type == self.content_type
+
+
+class JSON_Codec(Abstract_Codec):
+
+    content_type = "application/json"
+    __encoder = _json.JSONEncoder(separators = (",", ":"))
+
+    def encode(
+        self: _Self,
+        data: _Any,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> bytes:
+        return _json.dumps(data, separators = (",", ":")).encode(encoding)
+
+    def encode_off_loop(
+        self: _Self,
+        data: _Any,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> bytes:
+        # the C encoder does not release the GIL until the whole document is
+        # built, the pure Python 'iterencode()' lets the event loop run
+        return "".join(self.__encoder.iterencode(data)).encode(encoding)
+
+    def decode(
+        self: _Self,
+        body: bytes|str,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> _Any:
+        # 'json.loads()' detects the UTF-8/16/32 bytes itself
+        if isinstance(body, bytes) \
+                and not encoding.lower().replace("-", "_").startswith("utf"):
+            body = body.decode(encoding)
+        return _json.loads(body)
+
+    def matches(self: _Self, content_type: str) -> bool:
+        # 'application/problem+json' and other structured syntax suffixes
+        return content_type == self.content_type \
+            or content_type.endswith("+json")
+
+
+class Form_Codec(Abstract_Codec):
+
+    """
+    'application/x-www-form-urlencoded' bodies. Decoded into the dictionary
+    of lists of values.
+    """
+
+    content_type = "application/x-www-form-urlencoded"
+
+    def encode(
+        self: _Self,
+        data: dict[str, _Any],
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> bytes:
+        return _urlencode(data, doseq = True, encoding = encoding)\
+            .encode("ascii")
+
+    def decode(
+        self: _Self,
+        body: bytes|str,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> dict[str, list[str]]:
+        if isinstance(body, bytes):
+            body = body.decode("ascii")
+        return _parse_qs(body, keep_blank_values = True, encoding = encoding)
+
+
+class Multipart_Codec(Abstract_Codec):
+
+    """
+    'multipart/form-data' bodies of the plain fields. The files are
+    streamed by the request builder and are not encoded here. Decoded into
+    the dictionary of the field values (bytes for the file fields).
+    """
+
+    content_type = "multipart/form-data"
+
+    @staticmethod
+    def encode_fields(
+        data: dict[str, _Any],
+        encoding: str = "utf_8",
+        boundary: str = None
+    ) -> bytes:
+        """
+        Encodes the fields without the closing delimiter, so the file parts
+        can follow them.
+        """
+        return "".join(
+            f"--------{boundary}\r\n"\
+            f"Content-Disposition: form-data; name={key}\r\n"\
+            f"\r\n"\
+            f"{val}\r\n"
+            for key, val in data.items()
+        ).encode(encoding)
+
+    def encode(
+        self: _Self,
+        data: dict[str, _Any],
+        encoding: str = "utf_8",
+        boundary: str = None,
+        *args, **kwargs
+    ) -> bytes:
+        return self.encode_fields(data, encoding, boundary) \
+            + f"--------{boundary}--\r\n".encode(encoding)
+
+    def headers(
+        self: _Self,
+        boundary: str = None,
+        *args, **kwargs
+    ) -> dict[str, str]:
+        return {
+            "Content-Type": f"{self.content_type};boundary=------{boundary}"
+        }
+
+    def decode(
+        self: _Self,
+        body: bytes|str,
+        encoding: str = "utf_8",
+        content_type: str = None,
+        *args, **kwargs
+    ) -> dict[str, str|bytes]:
+        if isinstance(body, str):
+            body = body.encode(encoding)
+        message = _BytesParser(policy = _HTTP_policy).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("ascii") + body
+        )
+        result = dict()
+        for part in message.iter_parts():
+            payload = part.get_payload(decode = True)
+            if None == part.get_filename():
+                payload = payload.decode(
+                    part.get_content_charset() or encoding
+                )
+            result[part.get_param("name", header = "content-disposition")] \
+                = payload
+        return result
+
+
+_codecs: dict[str, Abstract_Codec] = {
+    "json": JSON_Codec(),
+    "form": Form_Codec(),
+    "multipart": Multipart_Codec()
+}
+
+
+def register_codec(name: str, codec: Abstract_Codec) -> None:
+    """
+    Registers the codec under the 'name' used by the 'codec' parameter of
+    'request.call()'. The codec is also used to decode the responses of its
+    'content_type'. Registering an existing name replaces the codec.
+    """
+    if not isinstance(codec, Abstract_Codec):
+        raise TypeError("'codec' should be an 'Abstract_Codec' instance.")
+    _codecs[name] = codec
+
+
+def get_codec(codec: str|Abstract_Codec = "json") -> Abstract_Codec:
+    if isinstance(codec, Abstract_Codec):
+        return codec
+    if None == _codecs.get(codec):
+        raise ValueError(
+            f"Unknown codec {codec!r}. Choose one of"\
+            f" {', '.join(map(repr, _codecs))} or register it with"\
+            f" 'register_codec()'."
+        )
+    return _codecs[codec]
+
+
+def codec_for_content_type(content_type: str|None) -> Abstract_Codec|None:
+    """
+    Returns the codec matching the media type of the 'Content-Type' value
+    (the most recently registered one wins) or 'None'.
+    """
+    if None == content_type:
+        return None
+    media_type = content_type.split(";", maxsplit = 1)[0].strip().lower()
+    for codec in reversed(_codecs.values()):
+        if codec.matches(media_type):
+            return codec
+    return None
+
+
+def should_offload(
+    data: _Any,
+    codec: str|Abstract_Codec = "json"
+) -> bool:
+    """
+    Checks whether the 'data' is estimated to be large enough to be encoded
+    in the default executor.
+    """
+    if None == data:
+        return False
+    codec = get_codec(codec)
+    return codec.estimate_size(data) >= codec.offload_size
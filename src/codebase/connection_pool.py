@@ -0,0 +1,269 @@
+import asyncio as _aio
+from ssl import SSLContext as _SSLContext
+import time as _time
+from typing import Self as _Self
+from weakref import WeakKeyDictionary as _WeakKeyDictionary
+
+from .base_objects import (
+    Connection as _Connection,
+    HTTP_Response as _HTTP_Response
+)
+
+__all__ = [
+    "Connection_Pool",
+    "default_pool"
+]
+
+
+def _proxy_key(proxy: dict[str, str|int]|None) -> tuple|None:
+    if None == proxy:
+        return None
+    return tuple(sorted((str(key), str(val)) for key, val in proxy.items()))
+
+
+def _header_value(response: _HTTP_Response, name: str) -> str|None:
+    if None == response.headers:
+        return None
+    return response.headers.value(name)
+
+
+def keep_alive(response: _HTTP_Response) -> bool:
+    """
+    Checks whether the connection that delivered the 'response' may be used
+    for the next request.
+
+    The connection is reusable only if the server did not ask to close it
+    and the response body had explicit framing ('Content-Length' or chunked
+    'Transfer-Encoding'), otherwise the body end is defined by the
+    connection close and the stream state is unknown.
+    """
+    if None == response.status:
+        return False
+    connection = _header_value(response, "Connection")
+    if None != connection:
+        connection = connection.lower()
+    if "close" == connection:
+        return False
+    if "HTTP/1.0" == response.protocol and "keep-alive" != connection:
+        return False
+    if response.status < 200 or response.status in (204, 304):
+        # these responses never have a body
+        return True
+    if None != _header_value(response, "Content-Length"):
+        return True
+    encoding = _header_value(response, "Transfer-Encoding")
+    return None != encoding and "chunked" in encoding.lower()
+
+
+class Connection_Pool:
+
+    """
+    A class representing the keep-alive pool of 'Connection' instances.
+
+    Connections are grouped by the (host, port, ssl, proxy) key. A connection
+    is checked out with '.acquire()' and should always be returned with
+    '.release()' - either to be kept for the next request or to be closed if
+    it can not be reused.
+
+    'max_per_host' caps the number of connections (checked out and idle) per
+    key. Callers above the cap wait for a connection to be released.
+    'idle_timeout' is the number of seconds an idle connection is kept before
+    it is evicted. Eviction is performed lazily on every checkout/checkin.
+    """
+
+    def __init__(
+        self: _Self,
+        max_per_host: int = 10,
+        idle_timeout: float = 30.0,
+        *args, **kwargs
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.__idle: dict[tuple, list[_Connection]] = dict()
+        # the semaphore of the key and the number of its holders and waiters
+        self.__slots: dict[tuple, list[_aio.Semaphore|int]] = dict()
+        self.__closed = False
+
+    @staticmethod
+    def pool_key(
+        host: str,
+        port: int,
+        ssl: bool = False,
+        proxy: dict[str, str|int] = None
+    ) -> tuple:
+        if not isinstance(ssl, _SSLContext):
+            ssl = bool(ssl)
+        return (host, port, ssl, _proxy_key(proxy))
+
+    async def acquire(
+        self: _Self,
+        host: str,
+        port: int,
+        ssl: bool = False,
+        proxy: dict[str, str|int] = None,
+        loop: _aio.BaseEventLoop = None,
+        limit: int = None,
+        fresh: bool = False,
+        *args, **kwargs
+    ) -> _Connection:
+        """
+        Checks out an opened connection for the target. Reuses the most
+        recently released idle connection if there is one, opens a new one
+        otherwise. With 'fresh' the new connection is always opened.
+        """
+        if self.__closed:
+            raise RuntimeError("The connection pool is closed.")
+        key = self.pool_key(host, port, ssl, proxy)
+        slot = self.__slots.get(key)
+        if None == slot:
+            slot = [_aio.Semaphore(self.max_per_host), 0]
+            self.__slots[key] = slot
+        slot[1] += 1
+        try:
+            await slot[0].acquire()
+        except BaseException:
+            self.__leave(key)
+            raise
+        try:
+            await self.__evict()
+            conn = None if fresh else await self.__pop_idle(key)
+            if None == conn:
+                conn = _Connection(
+                    host = host,
+                    port = port,
+                    loop = loop,
+                    limit = limit,
+                    proxy = proxy,
+                    ssl = ssl,
+                    *args, **kwargs
+                )
+                await conn.open()
+        except:
+            self.__slots[key][0].release()
+            self.__leave(key)
+            raise
+        conn.pool_key = key
+        return conn
+
+    async def release(
+        self: _Self,
+        conn: _Connection,
+        reuse: bool = True
+    ) -> None:
+        """
+        Returns the checked out connection to the pool. With 'reuse' set to
+        'False' (e.g. the response had 'Connection: close') the connection
+        is closed instead.
+        """
+        key = conn.pool_key
+        try:
+            if reuse and not self.__closed and self.__alive(conn):
+                conn.store_tls_session()
+                conn.last_used = _time.monotonic()
+                if None == self.__idle.get(key):
+                    self.__idle[key] = list()
+                self.__idle[key].append(conn)
+            else:
+                await self.__discard(conn)
+        finally:
+            self.__slots[key][0].release()
+            self.__leave(key)
+        await self.__evict()
+
+    def idle_count(self: _Self, key: tuple = None) -> int:
+        if None != key:
+            return len(self.__idle.get(key, ()))
+        return sum(map(len, self.__idle.values()))
+
+    async def close(self: _Self) -> None:
+        """
+        Closes all idle connections. Checked out connections are closed when
+        they are released.
+        """
+        self.__closed = True
+        idle = [conn for conns in self.__idle.values() for conn in conns]
+        self.__idle.clear()
+        await _aio.gather(*[self.__discard(conn) for conn in idle])
+
+    @staticmethod
+    def __alive(conn: _Connection) -> bool:
+        return not any((
+            conn.is_closed(),
+            conn.reader.at_eof(),
+            conn.writer.is_closing()
+        ))
+
+    @staticmethod
+    async def __discard(conn: _Connection) -> None:
+        if conn.is_closed():
+            return
+        try:
+            await conn.close()
+        except (ConnectionError, OSError):
+            pass
+
+    def __leave(self: _Self, key: tuple) -> None:
+        # the semaphores of the keys nobody holds or waits for are dropped,
+        # so the number of distinct hosts does not grow the memory
+        slot = self.__slots[key]
+        slot[1] -= 1
+        if 0 == slot[1]:
+            del self.__slots[key]
+
+    async def __pop_idle(self: _Self, key: tuple) -> _Connection|None:
+        conns = self.__idle.get(key)
+        dead = []
+        conn = None
+        while conns and None == conn:
+            conn = conns.pop()
+            if not self.__alive(conn):
+                dead.append(conn)
+                conn = None
+        if not conns:
+            self.__idle.pop(key, None)
+        if dead:
+            await _aio.gather(*[self.__discard(conn) for conn in dead])
+        return conn
+
+    async def __evict(self: _Self) -> None:
+        expired = []
+        deadline = _time.monotonic() - self.idle_timeout
+        for key, conns in self.__idle.items():
+            fresh = []
+            for conn in conns:
+                if conn.last_used < deadline or not self.__alive(conn):
+                    expired.append(conn)
+                else:
+                    fresh.append(conn)
+            self.__idle[key] = fresh
+        for key in [key for key, conns in self.__idle.items() if not conns]:
+            del self.__idle[key]
+        if expired:
+            await _aio.gather(*[self.__discard(conn) for conn in expired])
+
+    async def __aenter__(self: _Self) -> _Self:
+        return self
+
+    async def __aexit__(
+        self: _Self,
+        exception_type,
+        exception_value,
+        exception_traceback
+    ) -> None:
+        await self.close()
+
+
+_default_pools: _WeakKeyDictionary = _WeakKeyDictionary()
+
+
+def default_pool() -> Connection_Pool:
+    """
+    Returns the process-wide pool of the running event loop, used by
+    'request.call()' when no connection or stream was passed.
+    """
+    loop = _aio.get_running_loop()
+    pool = _default_pools.get(loop)
+    if None == pool:
+        pool = Connection_Pool()
+        _default_pools[loop] = pool
+    return pool
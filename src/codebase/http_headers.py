@@ -0,0 +1,181 @@
+from collections.abc import Mapping as _Mapping
+from typing import (
+    Iterator as _Iterator,
+    Self as _Self
+)
+
+from .__response_listener import Response_Head as _Response_Head
+
+__all__ = ["HTTP_Headers"]
+
+
+def _str_split(target: str, sep: str) -> list[str]:
+    return list(map(lambda x: x.strip(), target.split(sep)))
+
+def _header_val_parse(header_key: str, header_value: str) -> dict[str, str]:
+    val_type = 0
+    result = dict()
+    header_value = _str_split(header_value, ";")
+    if 1 >= len(header_value):
+        header_value = _str_split(header_value[0], ",")
+        if 1 >= len(header_value):
+            pair = _str_split(header_value[0], "=")
+            if 1 == len(pair):
+                result[val_type] = pair[0]
+                val_type += 1
+            else:
+                result[pair[0]] = pair[1]
+        else:
+            for _ in header_value:
+                pair = _str_split(_, "=")
+                if 1 == len(pair):
+                    result[val_type] = pair[0]
+                    val_type += 1
+                else:
+                    result[pair[0]] = pair[1]
+    else:
+        for _ in header_value:
+            pair = _str_split(_, "=")
+            if 1 == len(pair):
+                result[val_type] = pair[0]
+                val_type += 1
+            else:
+                result[pair[0]] = pair[1]
+    return result
+
+
+def _header_fields(
+    response_head: bytes,
+    encoding: str = "utf_8"
+) -> list[tuple[str, str]]:
+    # the listener already parsed the fields of the heads it read
+    if isinstance(response_head, _Response_Head):
+        return response_head.fields
+    fields = []
+    for part in response_head.decode(encoding).split("\r\n"):
+        if part.strip():
+            key, _, val = part.partition(":")
+            fields.append((key.strip(), val.strip()))
+    return fields
+
+
+class HTTP_Headers(_Mapping):
+
+    """
+    A class representing the case-insensitive multidict of the response
+    headers, kept over the raw header block (or over the fields already
+    parsed by the listener).
+
+    Nothing is parsed until the first lookup, which indexes the field
+    names. Values are split into parameters only when they are accessed:
+    'headers[name]' returns the parameters dictionary of the first field
+    with the name in the same format as before ('{0: "text/html",
+    "charset": "utf-8"}'), '.value()' and '.get_all()' return the raw
+    strings. Repeated fields (e.g. 'Set-Cookie') are all kept.
+    """
+
+    __slots__ = (
+        "__raw",
+        "__encoding",
+        "__fields",
+        "__index",
+        "__parsed"
+    )
+
+    def __init__(
+        self: _Self,
+        raw: bytes|list[tuple[str, str]] = b"",
+        encoding: str = "utf_8"
+    ) -> None:
+        if isinstance(raw, _Response_Head):
+            # only the fields parsed by the listener are kept, the header
+            # block itself is not held twice
+            raw = raw.fields
+        self.__raw = raw
+        self.__encoding = encoding
+        self.__fields: list[tuple[str, str]]|None = None
+        self.__index: dict[str, list[int]]|None = None
+        self.__parsed: dict[int, dict[str|int, str]]|None = None
+
+    @property
+    def raw(self: _Self) -> bytes|list[tuple[str, str]]:
+        return self.__raw
+
+    def fields(self: _Self) -> list[tuple[str, str]]:
+        """
+        Returns all (name, value) pairs in the order they were received.
+        """
+        if None == self.__fields:
+            if isinstance(self.__raw, list):
+                self.__fields = self.__raw
+            else:
+                self.__fields = _header_fields(self.__raw, self.__encoding)
+        return self.__fields
+
+    def __positions(self: _Self, name: str) -> list[int]:
+        if None == self.__index:
+            index = dict()
+            for position, (key, _) in enumerate(self.fields()):
+                key = key.lower()
+                if None == index.get(key):
+                    index[key] = [position]
+                else:
+                    index[key].append(position)
+            self.__index = index
+        return self.__index.get(name.lower(), [])
+
+    def value(self: _Self, name: str, default: str = None) -> str|None:
+        """
+        Returns the raw value of the first field with the 'name'.
+        """
+        positions = self.__positions(name)
+        if not positions:
+            return default
+        return self.fields()[positions[0]][1]
+
+    def get_all(self: _Self, name: str) -> list[str]:
+        """
+        Returns the raw values of all fields with the 'name'.
+        """
+        fields = self.fields()
+        return [fields[position][1] for position in self.__positions(name)]
+
+    def params(self: _Self, name: str) -> dict[str|int, str]|None:
+        """
+        Returns the value of the first field with the 'name' split into
+        the parameters dictionary.
+        """
+        positions = self.__positions(name)
+        if not positions:
+            return None
+        position = positions[0]
+        if None == self.__parsed:
+            self.__parsed = dict()
+        if None == self.__parsed.get(position):
+            key, val = self.fields()[position]
+            self.__parsed[position] = _header_val_parse(key, val)
+        return self.__parsed[position]
+
+    def __getitem__(self: _Self, name: str) -> dict[str|int, str]:
+        result = self.params(name)
+        if None == result:
+            raise KeyError(name)
+        return result
+
+    def __contains__(self: _Self, name: object) -> bool:
+        return isinstance(name, str) and bool(self.__positions(name))
+
+    def __iter__(self: _Self) -> _Iterator[str]:
+        # the names in the order of their first occurrence
+        seen = set()
+        for key, _ in self.fields():
+            if key.lower() not in seen:
+                seen.add(key.lower())
+                yield key
+
+    def __len__(self: _Self) -> int:
+        self.__positions("")
+        return len(self.__index)
+
+    def __repr__(self: _Self) -> str:
+        return f"HTTP_Headers({self.fields()!r})"
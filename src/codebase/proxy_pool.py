@@ -0,0 +1,172 @@
+import asyncio as _aio
+import time as _time
+from typing import Self as _Self
+
+from .__proxy_helper import Proxy_Helper as _Proxy_Helper
+from .timeouts import deadline as _deadline
+
+__all__ = ["Proxy_Pool"]
+
+
+def _ewma(previous: float|None, value: float, alpha: float = 0.2) -> float:
+    if None == previous:
+        return value
+    return previous + alpha * (value - previous)
+
+
+class _Proxy_Entry:
+
+    """
+    One proxy of the pool with its health statistics.
+    """
+
+    def __init__(self: _Self, proxy: dict[str, str|int]) -> None:
+        self.proxy = proxy
+        self.helper = _Proxy_Helper(**proxy)
+        self.success_rate = 1.0
+        self.latency: float|None = None
+        self.in_use = 0
+        self.failures = 0
+        self.quarantines = 0
+        self.quarantined_until = 0.0
+
+    def is_available(self: _Self) -> bool:
+        return self.quarantined_until <= _time.monotonic()
+
+    @property
+    def score(self: _Self) -> float:
+        # untested proxies get the best latency so they are tried early
+        latency = self.latency if None != self.latency else 0.001
+        return self.success_rate / (max(latency, 0.001) * (self.in_use + 1))
+
+
+class Proxy_Pool:
+
+    """
+    A class representing the pool of proxies that 'Connection' and
+    'Async_Connector' draw from instead of a single 'proxy'.
+
+    'proxies' is a list of dictionaries in the same format as the 'proxy'
+    parameter of 'Connection'. For every proxy the pool keeps the EWMA of
+    the success rate and of the latency (of the tunnel setups and of the
+    requests reported with '.report()') together with the number of
+    connections using it; new tunnels are opened through the proxy with the
+    best score (success rate / latency, lowered by the usage) and fail over
+    to the next best one up to 'max_attempts' times.
+
+    After 'max_failures' consecutive failures the proxy is quarantined for
+    'quarantine_time' seconds (doubled on every repeated quarantine up to
+    'max_quarantine_time').
+    """
+
+    def __init__(
+        self: _Self,
+        proxies: list[dict[str, str|int]],
+        max_failures: int = 3,
+        quarantine_time: float = 5.0,
+        max_quarantine_time: float = 300.0,
+        max_attempts: int = 3,
+        *args, **kwargs
+    ) -> None:
+        if not proxies:
+            raise RuntimeError("'proxies' should contain at least one proxy.")
+        self.entries = [_Proxy_Entry(proxy) for proxy in proxies]
+        self.max_failures = max_failures
+        self.quarantine_time = quarantine_time
+        self.max_quarantine_time = max_quarantine_time
+        self.max_attempts = max_attempts
+
+    def choose(
+        self: _Self,
+        exclude: list[_Proxy_Entry] = None
+    ) -> _Proxy_Entry:
+        """
+        Returns the best scoring available proxy. If every proxy is
+        quarantined, the one whose quarantine ends first is returned.
+        """
+        if None == exclude:
+            exclude = []
+        candidates = [
+            entry for entry in self.entries
+            if entry.is_available() and entry not in exclude
+        ]
+        if not candidates:
+            candidates = [
+                entry for entry in self.entries if entry not in exclude
+            ] or self.entries
+            return min(candidates, key = lambda x: x.quarantined_until)
+        return max(candidates, key = lambda x: x.score)
+
+    def report(
+        self: _Self,
+        entry: _Proxy_Entry,
+        success: bool,
+        latency: float = None
+    ) -> None:
+        """
+        Records the outcome of a tunnel or of a request made through it.
+        """
+        entry.success_rate = _ewma(entry.success_rate, float(success))
+        if None != latency and success:
+            entry.latency = _ewma(entry.latency, latency)
+        if success:
+            entry.failures = 0
+            entry.quarantines = 0
+            return
+        entry.failures += 1
+        if entry.failures >= self.max_failures and entry.is_available():
+            entry.quarantined_until = _time.monotonic() + min(
+                self.max_quarantine_time,
+                self.quarantine_time * 2 ** entry.quarantines
+            )
+            entry.quarantines += 1
+
+    def release(self: _Self, entry: _Proxy_Entry) -> None:
+        entry.in_use = max(0, entry.in_use - 1)
+
+    async def open_tunnel(
+        self: _Self,
+        target_host: str,
+        target_port: int,
+        limit: int = None,
+        *args, **kwargs
+    ) -> tuple[_aio.StreamReader, _aio.StreamWriter, _Proxy_Entry]:
+        """
+        Opens the tunnel to the target through the best scoring proxy.
+        Returns the (reader, writer, proxy entry) triple; the entry should be
+        passed to '.release()' when the tunnel is closed.
+
+        'timeout' limits each attempt, the proxy that did not open the
+        tunnel in time is reported as failed and the next one is tried.
+        """
+        timeout = kwargs.pop("timeout", None)
+        tried = []
+        error = None
+        for _ in range(min(self.max_attempts, len(self.entries))):
+            entry = self.choose(exclude = tried)
+            tried.append(entry)
+            entry.in_use += 1
+            started = _time.monotonic()
+            try:
+                async with _deadline("proxy tunnel", timeout):
+                    reader, writer = await entry.helper.open_tunnel(
+                        target_host,
+                        target_port,
+                        limit = limit,
+                        *args, **kwargs
+                    )
+            except (OSError, _aio.IncompleteReadError) as err:
+                # 'TimeoutError' is an 'OSError' too
+                self.release(entry)
+                self.report(entry, False)
+                error = err
+            except BaseException:
+                self.release(entry)
+                raise
+            else:
+                self.report(entry, True, _time.monotonic() - started)
+                return reader, writer, entry
+        raise ConnectionError(
+            f"Failed to open a tunnel to {target_host}:{target_port} through"\
+            f" {len(tried)} proxies. Last error: {error}"
+        ) from error
@@ -1,20 +1,146 @@
 from asyncio import (
+    CancelledError as _CancelledError,
     StreamReader as _StreamReader,
-    StreamWriter as _StreamWriter
+    StreamWriter as _StreamWriter,
+    get_running_loop as _get_running_loop
 )
+from functools import partial as _partial
 from typing import (
     Any as _Any,
-    BinaryIO as _BinaryIO
+    AsyncIterable as _AsyncIterable,
+    AsyncIterator as _AsyncIterator,
+    Awaitable as _Awaitable,
+    BinaryIO as _BinaryIO,
+    Callable as _Callable,
+    Iterable as _Iterable
 )
 from urllib.parse import urlencode as _urlencode
 
-from .__request_builder import prepare_request as _prepare_request
-from .__response_listener import listen_response as _listen_response
+from .body_codecs import should_offload as _should_offload
+from .__batch_executor import (
+    ordered_map as _ordered_map,
+    unordered_map as _unordered_map
+)
+from .__request_builder import (
+    Streamed_Request as _Streamed_Request,
+    prepare_request as _prepare_request,
+    request_head as _request_head,
+    send_request as _send_request
+)
+from .__tls_helper import get_ssl_context as _get_ssl_context
+from .__response_listener import (
+    listen_head as _listen_head,
+    listen_response as _listen_response
+)
 from .__response_parser import parse_response as _parse_response
 from .base_objects import (
     Connection as _Connection,
     HTTP_Response as _HTTP_Response
 )
+from .connection_pool import (
+    Connection_Pool as _Connection_Pool,
+    default_pool as _default_pool,
+    keep_alive as _keep_alive
+)
+from .timeouts import (
+    Timeouts as _Timeouts,
+    deadline as _deadline
+)
+
+
+# RFC 9110 section 9.2.2
+_idempotent_methods: frozenset[str] = frozenset(
+    ("GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE")
+)
+
+
+async def _close_connection(conn: _Connection, reuse: bool = False) -> None:
+    # the connection of the unfinished response is dropped without waiting
+    # for the peer
+    if reuse:
+        await conn.close()
+    else:
+        conn.abort()
+
+
+async def _release_connection(
+    pool: _Connection_Pool,
+    conn: _Connection,
+    reuse: bool = False
+) -> None:
+    if not reuse:
+        conn.abort()
+    await pool.release(conn, reuse = reuse)
+
+
+async def _receive(
+    reader: _StreamReader,
+    cooked_request: list[bytes]|_Streamed_Request,
+    wait_response: bool = True,
+    encoding: str = "utf_8",
+    join_chunks: bool = True,
+    method: str = "GET",
+    stream: bool = False,
+    spill_threshold: int = None,
+    decompress: bool = False,
+    max_decompressed_size: int = None,
+    timeouts: _Timeouts = None,
+    keep_request: bool = True,
+    on_close: _Callable[[bool], _Awaitable[None]] = None
+) -> _HTTP_Response:
+    """
+    Reads the response to the sent request. With 'stream' only the head is
+    read, the body is left to 'HTTP_Response.aiter_bytes()' and 'on_close'
+    is called with the flag whether the connection can be reused once the
+    body stream is closed.
+
+    The 'first_byte' deadline of 'timeouts' limits the wait for the
+    response head, the 'read' one each piece of the body.
+    """
+    if None == timeouts:
+        timeouts = _Timeouts()
+    request_head = _request_head(cooked_request) if keep_request else None
+    if not stream:
+        return _parse_response(
+            request_head,
+            *await _listen_response(
+                reader = reader,
+                wait_resp = wait_response,
+                encoding = encoding,
+                join_chunks = join_chunks,
+                spill_threshold = spill_threshold,
+                method = method,
+                decompress = decompress,
+                max_decompressed_size = max_decompressed_size,
+                first_byte_timeout = timeouts.first_byte,
+                read_timeout = timeouts.read
+            ),
+            encoding = encoding
+        )
+    status_line, response_head, body_stream = await _listen_head(
+        reader,
+        encoding,
+        method = method,
+        decompress = decompress,
+        max_decompressed_size = max_decompressed_size,
+        first_byte_timeout = timeouts.first_byte,
+        read_timeout = timeouts.read
+    )
+    response = _parse_response(
+        request_head,
+        status_line,
+        response_head,
+        None,
+        encoding = encoding,
+        stream = body_stream
+    )
+    if None != on_close:
+        async def close(finished: bool) -> None:
+            await on_close(finished and _keep_alive(response))
+        body_stream.on_close = close
+    if body_stream.finished:
+        await body_stream.close()
+    return response
 
 
 class request:
@@ -35,7 +161,7 @@ class request:
         port: int = 443,
         headers: dict[str, str] = None,
         url_query: str = None,
-        body: str = None,
+        body: str|bytes|_Iterable[bytes|str]|_AsyncIterable[bytes|str] = None,
         data: dict[str, _Any] = None,
         files: list[dict[str, str]] = None,
         bin_files: list[dict[str, str|_BinaryIO]] = None,
@@ -79,10 +205,16 @@ class request:
         \t  passed to request. Can be used in conjunction with the
         \t  '.url_query_format()' method for simple and fast url query building
         
-        - body (str)\n\t\t: the body of the request to be sent in form of a
-        \t  string. The body does not support chunk-loading and should be
-        \t  loaded all at once. You can still preformat the body to be a
-        \t  single string with chunk dividors included.
+        - body (str|bytes|Iterable|AsyncIterable)\n\t\t: the body of the
+        \t  request to be sent in form of a string or bytes (sent with the
+        \t  'Content-Length' header). You can still preformat the body to be
+        \t  a single string with chunk dividors included and pass the
+        \t  'Transfer-Encoding: chunked' header.
+
+        \t  A sync or async iterator of bytes (or strings) is sent with the
+        \t  chunked 'Transfer-Encoding' as the items are produced, so the
+        \t  body is never held in memory as a whole. See the 'trailers'
+        \t  optional parameter.
 
         \t  This parameter should not be use together with 'data' parameter -
         \t  this would cause a 'RuntimeError' exception as both parameters are
@@ -158,13 +290,15 @@ class request:
         \t    {
         \t        "http": "proxy_ip:proxy_http_port",
         \t        "https": "proxy_ip:proxy_https_port",
-        \t        "prox_type": <should be either 'http' or 'https'>, 
+        \t        "socks5": "proxy_ip:proxy_socks5_port",
+        \t        "prox_type": <'http', 'https' or 'socks5'>,
         \t        "username": "the_type_of_file",       # Optional
         \t        "password": "name_of_field"           # Optional
         \t    }
         
         - ssl (bool)\n\t\t: the parameter specifing the usage of SSL connection
-        \t  type. Value 'True' is required to perform HTTPS requests.
+        \t  type. Value 'True' is required to perform HTTPS requests. A ready
+        \t  'ssl.SSLContext' can be passed instead of 'True'.
         
         - connection (base_objects.Connection)\n\t\t: The preestablished
         \t  connection that would be used fro transporting requests from
@@ -184,9 +318,71 @@ StreamReader
 
         Optional parameters:
         - wait_resp (bool)
-        - join_chunks (bool)
+        - join_chunks (bool)\n\t\t: 'False' reads the body in the same way
+        \t  as 'spill_threshold' of 1 MiB.
+        - spill_threshold (int)\n\t\t: the body is kept in memory up to
+        \t  this size in bytes and is written to a temporary file above it.
+        \t  The body is not decoded - it is available as
+        \t  'HTTP_Response.body_file' or 'HTTP_Response.body_view()' (the
+        \t  memory-mapped file) and the file is removed by
+        \t  'HTTP_Response.aclose()'.
+        - accept_encoding (bool|str)\n\t\t: 'True' sends
+        \t  'Accept-Encoding: gzip, deflate' (the str is sent as the header
+        \t  value) unless the header is set, and the gzip/deflate response
+        \t  bodies are decompressed while they are read, also with
+        \t  'stream'. The 'Content-Encoding' header of the response is kept.
+        - max_decompressed_size (int)\n\t\t: 'ValueError' is raised once
+        \t  the decompressed body exceeds this size in bytes. Defaults to
+        \t  256 MiB.
+        - timeouts (timeouts.Timeouts|float)\n\t\t: the deadlines of the
+        \t  connect, proxy tunnel, TLS handshake, first byte, body read and
+        \t  total request phases. The number is the total deadline. The
+        \t  expired deadline raises 'TimeoutError' naming the phase, the
+        \t  connection is aborted and never returned to the pool.
+        - keep_request (bool)\n\t\t: 'False' does not keep the request on
+        \t  the response ('HTTP_Response.request' is 'None'), which saves
+        \t  the memory of the long-lived responses. Defaults to 'True'.
         - loop (asyncio.BaseEventLoop)
         - limit (int)
+        - pool (connection_pool.Connection_Pool)\n\t\t: the keep-alive pool
+        \t  the connection is checked out from when neither 'connection' nor
+        \t  'st_reader'/'st_writer' pair was passed. Defaults to the
+        \t  process-wide pool of the running event loop. The idempotent
+        \t  request which fails with 'ConnectionError' over the reused idle
+        \t  connection (e.g. closed by the server in the meantime) is sent
+        \t  once more over a new connection.
+        - use_pool (bool)\n\t\t: 'False' opens and closes a dedicated
+        \t  connection for the request instead of using the pool.
+        - verify (bool)\n\t\t: 'False' disables the server certificate
+        \t  verification for 'ssl=True'. Defaults to 'True'.
+        - cafile (str)\n\t\t: the path to the CA bundle used to verify the
+        \t  server certificate for 'ssl=True'.
+        - compress (str)\n\t\t: "gzip" or "deflate" compresses the request
+        \t  body and sets the 'Content-Encoding' header. The bodies of at
+        \t  least 256 KiB are compressed in the default executor while the
+        \t  request is written and are sent with the chunked
+        \t  'Transfer-Encoding'. Multipart bodies with files are not
+        \t  compressed.
+        - compress_threshold (int)\n\t\t: the minimal body size in bytes to
+        \t  be compressed. Defaults to 1024.
+        - codec (str|body_codecs.Abstract_Codec)\n\t\t: the codec used to
+        \t  encode 'data' - "json" (the default), "form"
+        \t  (application/x-www-form-urlencoded), "multipart" or the name of
+        \t  the codec registered with 'body_codecs.register_codec()'. The
+        \t  'data' estimated to be larger than the 'offload_size' of the codec
+        \t  is encoded in the default executor.
+        - stream (bool)\n\t\t: 'True' returns the response as soon as its
+        \t  head is received. The body is read with
+        \t  'HTTP_Response.aiter_bytes()' or '.aread()'; the connection is
+        \t  returned to the pool once the body is read to the end or
+        \t  'HTTP_Response.aclose()' is called (the connection is closed
+        \t  if the body was not read to the end).
+        - template (request_template.Request_Template)\n\t\t: the compiled
+        \t  request. 'method', 'host', 'url_path', 'port' and the static
+        \t  headers are taken from the template, 'headers' are added to them.
+        - trailers (dict[str, str]|Callable)\n\t\t: the trailer fields sent
+        \t  after the last chunk of the iterator 'body'. A callable is called
+        \t  once the iterator is exhausted and should return the dictionary.
         """
 
         half_stream = any((
@@ -230,81 +426,193 @@ StreamReader
             join_chunks = True
 
         response = _HTTP_Response()
-        cooked_request = _prepare_request(
-            method_passed = method,
-            host_passed = host,
-            url_path_passed = url_path,
-            port_passed = port,
-            headers_passed = headers,
-            url_query_passed = url_query,
-            body_passed = body,
-            data_passed = data,
-            files_passed = files,
-            bin_files_passed = bin_files,
-            boundary_str_passed = boundary,
-            encoding_passed = encoding,
-            *args, **kwargs
-        )
-
-        if no_prior_connection:
-            if None != kwargs.get("loop"):
-                conn_loop = kwargs.get("loop")
-            else:
-                conn_loop = None
-            if None != kwargs.get("limit"):
-                conn_limit = kwargs.get("limit")
-            else:
-                conn_limit = None
-
-            async with _Connection(
-                host = host,
-                port = port,
-                ssl = ssl,
-                proxy = proxy_data,
-                limit = conn_limit,
-                loop = conn_loop
-            ) as aconn:
-                aconn.writer.write(cooked_request)
-                await aconn.writer.drain()
-                response = _parse_response(
-                    cooked_request,
-                    *await _listen_response(
-                        reader = aconn.reader,
-                        wait_resp = wait_response,
-                        encoding = encoding,
-                        join_chunks = join_chunks
-                    ),
-                    encoding = encoding,
-                    join_chunked = join_chunks
-                )
-        elif None != connection:
-            connection.writer.write(cooked_request)
-            await connection.writer.drain()
-            response = _parse_response(
-                cooked_request,
-                *await _listen_response(
-                    reader = connection.reader,
-                    wait_resp = wait_response,
-                    encoding = encoding,
-                    join_chunks = join_chunks
-                ),
-                encoding = encoding,
-                join_chunked = join_chunks
+        template = kwargs.get("template")
+        if None != template:
+            method = template.method
+            host = template.host
+            port = template.port
+            codec = template.codec
+            accept_encoding = template.accept_encoding
+            build = _partial(
+                template.build,
+                url_query = url_query,
+                headers = headers,
+                body = body,
+                data = data,
+                files = files,
+                bin_files = bin_files,
+                boundary = boundary,
+                trailers = kwargs.get("trailers")
             )
-        elif None != st_reader and None != st_writer:
-            st_writer.write(cooked_request)
-            await st_writer.drain()
-            response = _parse_response(
-                cooked_request,
-                *await _listen_response(
-                    reader = st_reader,
-                    wait_resp = wait_response,
-                    encoding = encoding,
-                    join_chunks = join_chunks
-                ),
-                encoding = encoding,
-                join_chunked = join_chunks
+        else:
+            codec = kwargs.get("codec")
+            accept_encoding = kwargs.get("accept_encoding")
+            build = _partial(
+                _prepare_request,
+                *args,
+                method_passed = method,
+                host_passed = host,
+                url_path_passed = url_path,
+                port_passed = port,
+                headers_passed = headers,
+                url_query_passed = url_query,
+                body_passed = body,
+                data_passed = data,
+                files_passed = files,
+                bin_files_passed = bin_files,
+                boundary_str_passed = boundary,
+                encoding_passed = encoding,
+                **kwargs
             )
+        if _should_offload(data, codec or "json"):
+            # the large 'data' is serialized off the event loop
+            cooked_request = await _get_running_loop().run_in_executor(
+                None,
+                _partial(build, off_loop = True)
+            )
+        else:
+            cooked_request = build()
+
+        stream = wait_response and bool(kwargs.get("stream"))
+        timeouts = _Timeouts.of(kwargs.get("timeouts"))
+        receive_args = (
+            wait_response,
+            encoding,
+            join_chunks,
+            method,
+            stream,
+            kwargs.get("spill_threshold"),
+            bool(accept_encoding),
+            kwargs.get("max_decompressed_size"),
+            timeouts,
+            kwargs.get("keep_request", True)
+        )
+
+        async with _deadline("request", timeouts.total):
+            if no_prior_connection:
+                if True == ssl:
+                    # the shared context keeps the TLS sessions for resumption
+                    ssl = _get_ssl_context(
+                        verify = kwargs.get("verify", True),
+                        cafile = kwargs.get("cafile")
+                    )
+                if None != kwargs.get("loop"):
+                    conn_loop = kwargs.get("loop")
+                else:
+                    conn_loop = None
+                if None != kwargs.get("limit"):
+                    conn_limit = kwargs.get("limit")
+                else:
+                    conn_limit = None
+
+                if False == kwargs.get("use_pool"):
+                    aconn = _Connection(
+                        host = host,
+                        port = port,
+                        ssl = ssl,
+                        proxy = proxy_data,
+                        limit = conn_limit,
+                        loop = conn_loop,
+                        timeouts = timeouts
+                    )
+                    await aconn.open()
+                    try:
+                        await _send_request(aconn.writer, cooked_request)
+                        response = await _receive(
+                            aconn.reader,
+                            cooked_request,
+                            *receive_args,
+                            on_close = _partial(_close_connection, aconn)
+                        )
+                    except BaseException:
+                        # the timed out or failed connection is dropped at once
+                        aconn.abort()
+                        raise
+                    if not stream:
+                        await aconn.close()
+                else:
+                    if None != kwargs.get("pool"):
+                        pool = kwargs.get("pool")
+                    else:
+                        pool = _default_pool()
+                    # the server may close the idle connection without
+                    # 'Connection: close' and before its FIN arrives, so the
+                    # idempotent request that failed over the reused
+                    # connection is sent once more over a fresh one
+                    retry = str(method).upper() in _idempotent_methods \
+                        and not isinstance(cooked_request, _Streamed_Request)
+                    fresh = False
+                    while True:
+                        aconn = await pool.acquire(
+                            host = host,
+                            port = port,
+                            ssl = ssl,
+                            proxy = proxy_data,
+                            limit = conn_limit,
+                            loop = conn_loop,
+                            fresh = fresh,
+                            timeouts = timeouts
+                        )
+                        # only the connections released to the pool are used
+                        reused = None != aconn.last_used
+                        reuse = False
+                        release = True
+                        try:
+                            await _send_request(aconn.writer, cooked_request)
+                            response = await _receive(
+                                aconn.reader,
+                                cooked_request,
+                                *receive_args,
+                                on_close = _partial(
+                                    _release_connection,
+                                    pool,
+                                    aconn
+                                )
+                            )
+                            if stream:
+                                # released by the body stream once it is
+                                # closed
+                                release = False
+                            else:
+                                reuse = wait_response \
+                                    and _keep_alive(response)
+                        except ConnectionError:
+                            aconn.abort()
+                            if not (retry and reused):
+                                raise
+                            fresh = True
+                            continue
+                        except BaseException:
+                            # never returned to the pool in the middle of the
+                            # response
+                            aconn.abort()
+                            raise
+                        finally:
+                            if release:
+                                await pool.release(aconn, reuse = reuse)
+                        break
+            elif None != connection:
+                try:
+                    await _send_request(connection.writer, cooked_request)
+                    response = await _receive(
+                        connection.reader,
+                        cooked_request,
+                        *receive_args
+                    )
+                except (TimeoutError, _CancelledError):
+                    connection.abort()
+                    raise
+            elif None != st_reader and None != st_writer:
+                try:
+                    await _send_request(st_writer, cooked_request)
+                    response = await _receive(
+                        st_reader,
+                        cooked_request,
+                        *receive_args
+                    )
+                except (TimeoutError, _CancelledError):
+                    st_writer.transport.abort()
+                    raise
         return response
 
     @staticmethod
@@ -725,6 +1033,109 @@ StreamReader
         # )
 
 
+    @staticmethod
+    async def pipeline(
+        connection: _Connection,
+        requests: list[dict[str, _Any]],
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> list[_HTTP_Response]:
+        """
+        \r
+        Sends several requests over one opened 'connection' using HTTP/1.1
+        pipelining. Each item of 'requests' is a dictionary of '.call()'
+        request parameters ('method', 'host', 'url_path', 'headers',
+        'url_query', 'body', 'data', etc.).
+
+        The responses are returned in the order of the requests.
+        """
+        if None != kwargs.get("join_chunks"):
+            join_chunks = kwargs.get("join_chunks")
+        else:
+            join_chunks = True
+        cooked_requests = []
+        for spec in requests:
+            cooked_requests.append(
+                _prepare_request(
+                    method_passed = spec.get("method", "GET"),
+                    host_passed = spec.get("host", connection.target_host),
+                    url_path_passed = spec.get("url_path", "/"),
+                    port_passed = spec.get("port", connection.target_port),
+                    headers_passed = spec.get("headers"),
+                    url_query_passed = spec.get("url_query"),
+                    body_passed = spec.get("body"),
+                    data_passed = spec.get("data"),
+                    files_passed = spec.get("files"),
+                    bin_files_passed = spec.get("bin_files"),
+                    boundary_str_passed = spec.get("boundary"),
+                    encoding_passed = encoding
+                )
+            )
+        return await connection.pipeline(
+            cooked_requests,
+            encoding = encoding,
+            join_chunks = join_chunks,
+            spill_threshold = kwargs.get("spill_threshold"),
+            keep_request = kwargs.get("keep_request", True)
+        )
+
+    @staticmethod
+    def map(
+        requests: _Iterable[dict[str, _Any]]|_AsyncIterable[dict[str, _Any]],
+        concurrency: int = 100,
+        per_host: int = None,
+        return_exceptions: bool = False,
+        *args, **kwargs
+    ) -> _AsyncIterator[_HTTP_Response]:
+        """
+        \r
+        Performs the batch of requests through '.call()' and yields the
+        responses in the order of 'requests':
+
+        \t  async for response in request.map(specs, concurrency = 50):
+        \t      ...
+
+        Each item of 'requests' (iterable or async iterable) is a dictionary
+        of '.call()' parameters. The keyword arguments passed to this method
+        are used as defaults for every item. The input is consumed lazily,
+        so at most 'concurrency' requests (and at most 'per_host' requests
+        per host and port, if specified) exist at any time.
+
+        With 'return_exceptions' set to 'True' the failed requests yield the
+        exception instead of raising it.
+        """
+        return _ordered_map(
+            request.call,
+            requests,
+            concurrency = concurrency,
+            per_host = per_host,
+            return_exceptions = return_exceptions,
+            common = kwargs
+        )
+
+    @staticmethod
+    def as_completed(
+        requests: _Iterable[dict[str, _Any]]|_AsyncIterable[dict[str, _Any]],
+        concurrency: int = 100,
+        per_host: int = None,
+        return_exceptions: bool = False,
+        *args, **kwargs
+    ) -> _AsyncIterator[_HTTP_Response]:
+        """
+        \r
+        The variation of '.map()' that yields the responses in the order of
+        their completion. The responses completed together with the failed
+        request are yielded before its exception is raised.
+        """
+        return _unordered_map(
+            request.call,
+            requests,
+            concurrency = concurrency,
+            per_host = per_host,
+            return_exceptions = return_exceptions,
+            common = kwargs
+        )
+
     @staticmethod
     def url_query_builder(
         params: dict[str, str],
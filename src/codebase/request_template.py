@@ -0,0 +1,196 @@
+from typing import (
+    Any as _Any,
+    AsyncIterable as _AsyncIterable,
+    BinaryIO as _BinaryIO,
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Self as _Self
+)
+
+from .__request_builder import (
+    Streamed_Request as _Streamed_Request,
+    _add_accept_encoding,
+    _body_prep,
+    _get_boundary,
+    _header_key,
+    _header_prep,
+    _set_header
+)
+
+__all__ = ["Request_Template"]
+
+
+def _is_chunked(headers: dict[str, str]) -> bool:
+    key = _header_key(headers, "Transfer-Encoding")
+    return None != key and "chunked" == headers[key]
+
+
+def _is_form(headers: dict[str, str]) -> bool:
+    key = _header_key(headers, "Content-Type")
+    return None != key and "multipart/form-data" in headers[key]
+
+
+class Request_Template:
+
+    """
+    A class representing the request compiled once for the repetitive calls
+    to the same endpoint.
+
+    The request line and the header block (the 'Host' header and the static
+    'headers') are encoded on creation. '.build()' only encodes the variable
+    parts - the query, the per-request headers and the body with its
+    'Content-Length' - and splices them into the cached bytes. The multipart
+    boundary is generated only for the requests that need it.
+
+    'compress' ("gzip" or "deflate"), 'compress_threshold' and 'codec'
+    apply to the request body in the same way as for 'request.call()'.
+    'accept_encoding' adds the static 'Accept-Encoding' header and makes
+    'request.call()' decompress the responses.
+
+    The template can be passed to 'request.call()' as the 'template'
+    optional parameter, the target is then taken from the template.
+    """
+
+    def __init__(
+        self: _Self,
+        method: str = "GET",
+        host: str = None,
+        url_path: str = "/",
+        port: int = 443,
+        headers: dict[str, str] = None,
+        encoding: str = "utf_8",
+        *args, **kwargs
+    ) -> None:
+        self.method = method
+        self.host = host
+        self.url_path = url_path
+        self.port = port
+        self.encoding = encoding
+        self.compress = kwargs.get("compress")
+        self.compress_threshold = kwargs.get("compress_threshold", 1024)
+        self.codec = kwargs.get("codec")
+        self.accept_encoding = kwargs.get("accept_encoding")
+        proto = kwargs.get("proto") or "HTTP"
+        proto_ver = kwargs.get("proto_ver") or "1.1"
+
+        self.headers = {**headers} if None != headers else dict()
+        if None == self.headers.get("Host"):
+            if kwargs.get("use_port"):
+                self.headers["Host"] = f"{host}:{port}"
+            else:
+                self.headers["Host"] = f"{host}"
+        _add_accept_encoding(self.headers, self.accept_encoding)
+        self.__static_keys = {key.lower() for key in self.headers}
+
+        self.__line_start = f"{method} {url_path}".encode(encoding)
+        self.__line_end = f" {proto}/{proto_ver}\r\n".encode(encoding)
+        self.__line = self.__line_start + self.__line_end
+        self.__head = _header_prep(self.headers).encode(encoding)
+
+        self.__form = _is_form(self.headers)
+        self.__chunked = _is_chunked(self.headers)
+
+    def build(
+        self: _Self,
+        url_query: str = None,
+        headers: dict[str, str] = None,
+        body: str|bytes|_Iterable[bytes|str]|\
+            _AsyncIterable[bytes|str] = None,
+        data: dict[str, _Any] = None,
+        files: list[dict[str, str]] = None,
+        bin_files: list[dict[str, str|_BinaryIO]] = None,
+        boundary: str = None,
+        trailers: dict[str, str]|_Callable[[], dict[str, str]] = None,
+        *args, **kwargs
+    ) -> list[bytes]|_Streamed_Request:
+        """
+        Builds the request from the template. Returns the list of the
+        request buffers or the 'Streamed_Request' in the same way as
+        'prepare_request()' does.
+        """
+        if None != body and None != data:
+            raise RuntimeError(
+                "You should not use 'body' and 'data' parameters at the same"\
+                " time."
+            )
+
+        if None == url_query:
+            line = self.__line
+        else:
+            line = b"".join((
+                self.__line_start,
+                b"?",
+                url_query.encode(self.encoding),
+                self.__line_end
+            ))
+
+        form = self.__form or None != files or None != bin_files
+        chunked = self.__chunked
+        if None != headers:
+            chunked = chunked or _is_chunked(headers)
+            form = form or _is_form(headers)
+        if form and None == boundary:
+            boundary = _get_boundary()
+
+        if None == body and None == data and not form:
+            prepared_body, body_headers = None, None
+        elif isinstance(body, (str, bytes)) and not chunked \
+                and None == self.compress:
+            # the most common case is spliced without '_body_prep()'
+            if isinstance(body, str):
+                body = body.encode(self.encoding)
+            prepared_body = body
+            body_headers = {"Content-Length": len(body)}
+        else:
+            prepared_body, body_headers = _body_prep(
+                body = body,
+                data = data,
+                files = files,
+                bin_files = bin_files,
+                boundary = boundary,
+                encoding = self.encoding,
+                chunk = chunked,
+                form = form,
+                trailers = trailers,
+                compress = self.compress,
+                compress_threshold = self.compress_threshold,
+                codec = self.codec,
+                off_loop = kwargs.get("off_loop", False)
+            )
+
+        head = self.__head
+        extra = {**headers} if None != headers else dict()
+        # the body framing replaces the 'Content-Length' set by the caller
+        unframed = None != body_headers \
+            and None != body_headers.get("Transfer-Encoding")
+        if unframed:
+            extra.pop(_header_key(extra, "Content-Length"), None)
+        if None != body_headers:
+            for key, val in body_headers.items():
+                if "Content-Type" == key and not form and (
+                    "content-type" in self.__static_keys
+                    or None != _header_key(extra, key)
+                ):
+                    # the content type set by the caller is kept
+                    continue
+                _set_header(extra, key, val)
+        extra_keys = {key.lower() for key in extra}
+        if not extra_keys.isdisjoint(self.__static_keys) or unframed \
+                and "content-length" in self.__static_keys:
+            # the static header is overridden, the block is rebuilt with the
+            # fields replaced in place as 'prepare_request()' does
+            merged = {**self.headers}
+            if unframed:
+                merged.pop(_header_key(merged, "Content-Length"))
+            for key, val in extra.items():
+                _set_header(merged, key, val)
+            head = _header_prep(merged).encode(self.encoding)
+        elif extra:
+            head += _header_prep(extra).encode(self.encoding)
+
+        meta = b"".join((line, head, b"\r\n"))
+        if isinstance(prepared_body, list):
+            return _Streamed_Request(meta, prepared_body)
+        if None != prepared_body:
+            return [meta, prepared_body]
+        return [meta]
@@ -0,0 +1,213 @@
+import asyncio as _aio
+import socket as _socket
+import time as _time
+from typing import Self as _Self
+from weakref import WeakKeyDictionary as _WeakKeyDictionary
+
+__all__ = [
+    "Resolver",
+    "default_resolver"
+]
+
+
+def _interleave(
+    addresses: list[tuple]
+) -> list[tuple]:
+    # RFC 8305 section 4: alternate the address families, starting with the
+    # family of the first address returned by the system resolver
+    by_family: dict[int, list[tuple]] = dict()
+    for addr in addresses:
+        if None == by_family.get(addr[0]):
+            by_family[addr[0]] = list()
+        by_family[addr[0]].append(addr)
+    families = list(by_family.values())
+    result = []
+    while any(families):
+        for family in families:
+            if family:
+                result.append(family.pop(0))
+    return result
+
+
+class Resolver:
+
+    """
+    A class representing the caching DNS resolver with the RFC 8305
+    ("happy eyeballs") connection establishment.
+
+    Resolved addresses are kept for 'ttl' seconds, failed resolutions are
+    cached for 'negative_ttl' seconds (the failure is raised again without
+    querying the system resolver). Concurrent lookups of the same host are
+    merged into one query.
+
+    '.connect()' starts the connection attempt to the next address each
+    'happy_eyeballs_delay' seconds (or as soon as the previous attempt
+    failed) and keeps the first one that succeeds.
+    """
+
+    def __init__(
+        self: _Self,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        happy_eyeballs_delay: float = 0.25,
+        *args, **kwargs
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self.__cache: dict[tuple[str, int], tuple[float, list|OSError]] = {}
+        self.__pending: dict[tuple[str, int], _aio.Future] = dict()
+
+    def clear(self: _Self) -> None:
+        self.__cache.clear()
+
+    async def resolve(
+        self: _Self,
+        host: str,
+        port: int
+    ) -> list[tuple]:
+        """
+        Returns the list of 'getaddrinfo()' entries for the 'host', using
+        the cache if possible.
+        """
+        key = (host, port)
+        cached = self.__cache.get(key)
+        if None != cached:
+            expires, result = cached
+            if expires > _time.monotonic():
+                if isinstance(result, OSError):
+                    raise result
+                return result
+            del self.__cache[key]
+
+        pending = self.__pending.get(key)
+        if None != pending:
+            try:
+                return await _aio.shield(pending)
+            except _aio.CancelledError:
+                # the lookup was cancelled by its owner, not by the caller
+                if pending.cancelled():
+                    return await self.resolve(host, port)
+                raise
+
+        loop = _aio.get_running_loop()
+        pending = loop.create_future()
+        self.__pending[key] = pending
+        try:
+            result = await loop.getaddrinfo(
+                host, port,
+                type = _socket.SOCK_STREAM
+            )
+        except OSError as err:
+            self.__cache[key] = (_time.monotonic() + self.negative_ttl, err)
+            pending.set_exception(err)
+            # the exception is retrieved here to avoid the asyncio warning
+            # in case nobody else waited for the lookup
+            pending.exception()
+            raise
+        except BaseException:
+            pending.cancel()
+            raise
+        else:
+            self.__cache[key] = (_time.monotonic() + self.ttl, result)
+            pending.set_result(result)
+            return result
+        finally:
+            del self.__pending[key]
+
+    async def connect(
+        self: _Self,
+        host: str,
+        port: int
+    ) -> _socket.socket:
+        """
+        Resolves the 'host' and returns the connected non-blocking socket,
+        racing the connection attempts over the resolved addresses.
+        """
+        loop = _aio.get_running_loop()
+        addresses = _interleave(await self.resolve(host, port))
+        errors = []
+        winner: list[_socket.socket] = []
+
+        async def attempt(
+            addr: tuple,
+            previous: tuple[_aio.Event, _aio.Event]|None,
+            started: _aio.Event,
+            failed: _aio.Event
+        ) -> None:
+            if None != previous:
+                previous_started, previous_failed = previous
+                await previous_started.wait()
+                try:
+                    await _aio.wait_for(
+                        previous_failed.wait(),
+                        self.happy_eyeballs_delay
+                    )
+                except TimeoutError:
+                    pass
+            started.set()
+            family, sock_type, proto, _, sockaddr = addr
+            sock = None
+            try:
+                sock = _socket.socket(family, sock_type, proto)
+                sock.setblocking(False)
+                await loop.sock_connect(sock, sockaddr)
+            except BaseException as err:
+                if None != sock:
+                    sock.close()
+                if isinstance(err, OSError):
+                    errors.append(err)
+                failed.set()
+                raise
+            else:
+                winner.append(sock)
+
+        tasks = []
+        previous = None
+        for addr in addresses:
+            started, failed = _aio.Event(), _aio.Event()
+            tasks.append(
+                _aio.ensure_future(attempt(addr, previous, started, failed))
+            )
+            previous = (started, failed)
+
+        try:
+            for finished in _aio.as_completed(tasks):
+                try:
+                    await finished
+                except OSError:
+                    continue
+                break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await _aio.gather(*tasks, return_exceptions = True)
+            # late winners are closed, only the first one is kept
+            for sock in winner[1:]:
+                sock.close()
+
+        if not winner:
+            if 1 == len(errors):
+                raise errors[0]
+            raise OSError(
+                f"Multiple exceptions while connecting to {host}:{port}:"\
+                f" {', '.join(map(str, errors))}"
+            )
+        return winner[0]
+
+
+_default_resolvers: _WeakKeyDictionary = _WeakKeyDictionary()
+
+
+def default_resolver() -> Resolver:
+    """
+    Returns the resolver of the running event loop, shared by all
+    connections that were not given a resolver explicitly. The merged
+    lookups are futures of one loop, so every loop has its own resolver.
+    """
+    loop = _aio.get_running_loop()
+    resolver = _default_resolvers.get(loop)
+    if None == resolver:
+        resolver = Resolver()
+        _default_resolvers[loop] = resolver
+    return resolver
@@ -0,0 +1,113 @@
+import asyncio as _aio
+from contextlib import asynccontextmanager as _asynccontextmanager
+from typing import (
+    AsyncIterator as _AsyncIterator,
+    Self as _Self
+)
+
+__all__ = [
+    "Timeouts",
+    "deadline"
+]
+
+_phases: tuple[str, ...] = (
+    "connect",
+    "proxy",
+    "tls",
+    "first_byte",
+    "read",
+    "total"
+)
+
+
+class Timeouts:
+
+    """
+    A class representing the deadlines (in seconds, 'None' for no
+    deadline) of the request phases:
+    - 'connect' - the DNS resolution and the TCP connection to the target;
+    - 'proxy' - the connection to the proxy and the tunnel handshake, per
+      proxy tried by the proxy pool;
+    - 'tls' - the TLS handshake;
+    - 'first_byte' - from the request being sent until the response head
+      is received;
+    - 'read' - the idle time between two pieces of the response body;
+    - 'total' - the whole 'request.call()'. With 'stream=True' it ends
+      when the response head is returned, the body is then guarded by
+      'read'.
+
+    The deadlines are independent of each other, a phase fails as soon as
+    its own or the 'total' deadline expires. '.replace()' returns the copy
+    with some of the deadlines changed.
+    """
+
+    __slots__ = _phases
+
+    def __init__(
+        self: _Self,
+        connect: float = None,
+        proxy: float = None,
+        tls: float = None,
+        first_byte: float = None,
+        read: float = None,
+        total: float = None
+    ) -> None:
+        self.connect = connect
+        self.proxy = proxy
+        self.tls = tls
+        self.first_byte = first_byte
+        self.read = read
+        self.total = total
+
+    @classmethod
+    def of(cls, timeouts: "Timeouts|float|None") -> "Timeouts":
+        """
+        Returns the 'timeouts' as they are, the number as the 'total'
+        deadline and 'None' as no deadlines.
+        """
+        if isinstance(timeouts, cls):
+            return timeouts
+        return cls(total = timeouts)
+
+    def replace(self: _Self, **changes) -> "Timeouts":
+        unknown = set(changes).difference(_phases)
+        if unknown:
+            raise TypeError(
+                f"Unknown request phases: {', '.join(sorted(unknown))}."
+            )
+        return Timeouts(
+            **{
+                phase: changes.get(phase, getattr(self, phase))
+                for phase in _phases
+            }
+        )
+
+    def __repr__(self: _Self) -> str:
+        return "Timeouts(" + ", ".join(
+            f"{phase}={getattr(self, phase)!r}" for phase in _phases
+        ) + ")"
+
+
+@_asynccontextmanager
+async def deadline(
+    phase: str,
+    delay: float|None
+) -> _AsyncIterator[None]:
+    """
+    Limits the enclosed block to 'delay' seconds with 'asyncio.timeout()'.
+    The expired deadline raises 'TimeoutError' naming the 'phase'.
+    """
+    if None == delay:
+        yield
+        return
+    timeout = _aio.timeout(delay)
+    try:
+        async with timeout:
+            yield
+    except TimeoutError as err:
+        # the errors of the nested deadlines are passed as they are
+        if not timeout.expired():
+            raise
+        raise TimeoutError(
+            f"The {phase} deadline of {delay} s expired."
+        ) from err
@@ -0,0 +1,249 @@
+"""
+In-process stub servers for the tests, built on 'asyncio.start_server()'.
+"""
+import asyncio as _aio
+import ssl as _ssl
+from typing import (
+    Callable as _Callable,
+    Self as _Self
+)
+
+
+def plain_response(body: bytes = b"ok", *extra_headers: str) -> bytes:
+    head = "".join(f"{header}\r\n" for header in extra_headers)
+    return (
+        f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\n{head}\r\n"
+    ).encode("ascii") + body
+
+
+class HTTP_Stub:
+
+    """
+    The keep-alive HTTP/1.1 server answering every request with
+    'handler(request_line, headers, body)' (a plain 200 "ok" by default).
+    'close_after' closes each connection after so many responses, 'ssl'
+    (the server 'SSLContext') serves HTTPS. The received requests are kept
+    in '.requests'.
+    """
+
+    def __init__(
+        self: _Self,
+        handler: _Callable[[str, dict[str, str], bytes], bytes] = None,
+        close_after: int = None,
+        ssl: _ssl.SSLContext = None
+    ) -> None:
+        self.handler = handler
+        self.close_after = close_after
+        self.ssl = ssl
+        self.requests: list[tuple[str, dict[str, str], bytes]] = []
+        self.connections = 0
+        self.server = None
+        self.port = None
+
+    async def __aenter__(self: _Self) -> _Self:
+        self.server = await _aio.start_server(
+            self.__handle, "127.0.0.1", 0,
+            ssl = self.ssl
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self: _Self, *args) -> None:
+        self.server.close()
+
+    async def __handle(
+        self: _Self,
+        reader: _aio.StreamReader,
+        writer: _aio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        answered = 0
+        try:
+            while None == self.close_after or answered < self.close_after:
+                head = await reader.readuntil(b"\r\n\r\n")
+                line, *fields = head.decode("latin_1").split("\r\n")
+                headers = dict()
+                for field in fields:
+                    if field:
+                        key, _, val = field.partition(":")
+                        headers[key.strip().lower()] = val.strip()
+                body = await self.__body(reader, headers)
+                self.requests.append((line, headers, body))
+                if None == self.handler:
+                    writer.write(plain_response())
+                else:
+                    writer.write(self.handler(line, headers, body))
+                await writer.drain()
+                answered += 1
+        except (_aio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def __body(
+        reader: _aio.StreamReader,
+        headers: dict[str, str]
+    ) -> bytes:
+        if "chunked" == headers.get("transfer-encoding"):
+            body = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if 0 == size:
+                    while b"\r\n" != await reader.readline():
+                        pass
+                    return body
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+        if None != headers.get("content-length"):
+            return await reader.readexactly(int(headers["content-length"]))
+        return b""
+
+
+async def _relay(
+    reader: _aio.StreamReader,
+    writer: _aio.StreamWriter
+) -> None:
+    try:
+        while data_chunk := await reader.read(65536):
+            writer.write(data_chunk)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _tunnel(
+    client: tuple[_aio.StreamReader, _aio.StreamWriter],
+    target: tuple[_aio.StreamReader, _aio.StreamWriter]
+) -> None:
+    await _aio.gather(
+        _relay(client[0], target[1]),
+        _relay(target[0], client[1])
+    )
+
+
+class SOCKS5_Stub:
+
+    """
+    The SOCKS5 proxy relaying the tunnels to the stub servers, which are
+    all on '127.0.0.1' - the requested host is only recorded in
+    '.targets'. With 'credentials' ((username, password)) the clients must
+    authenticate, without them only the no-auth method is accepted.
+    """
+
+    def __init__(self: _Self, credentials: tuple[str, str] = None) -> None:
+        self.credentials = credentials
+        self.targets: list[tuple[int, str, int]] = []
+        self.server = None
+        self.port = None
+
+    async def __aenter__(self: _Self) -> _Self:
+        self.server = await _aio.start_server(self.__handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self: _Self, *args) -> None:
+        self.server.close()
+
+    async def __handle(
+        self: _Self,
+        reader: _aio.StreamReader,
+        writer: _aio.StreamWriter
+    ) -> None:
+        try:
+            _, number = await reader.readexactly(2)
+            methods = await reader.readexactly(number)
+            method = 0x00 if None == self.credentials else 0x02
+            if method not in methods:
+                writer.write(b"\x05\xff")
+                return
+            writer.write(bytes((0x05, method)))
+            if 0x02 == method:
+                _, length = await reader.readexactly(2)
+                username = (await reader.readexactly(length)).decode()
+                length = (await reader.readexactly(1))[0]
+                password = (await reader.readexactly(length)).decode()
+                if self.credentials != (username, password):
+                    writer.write(b"\x01\x01")
+                    return
+                writer.write(b"\x01\x00")
+            _, _, _, address_type = await reader.readexactly(4)
+            if 0x01 == address_type:
+                host = ".".join(map(str, await reader.readexactly(4)))
+            elif 0x03 == address_type:
+                length = (await reader.readexactly(1))[0]
+                host = (await reader.readexactly(length)).decode("idna")
+            else:
+                host = (await reader.readexactly(16)).hex()
+            port = int.from_bytes(await reader.readexactly(2), "big")
+            self.targets.append((address_type, host, port))
+            try:
+                target = await _aio.open_connection("127.0.0.1", port)
+            except OSError:
+                writer.write(b"\x05\x05\x00\x01" + bytes(6))
+                return
+            writer.write(b"\x05\x00\x00\x01" + bytes(6))
+            await writer.drain()
+            await _tunnel((reader, writer), target)
+        except (_aio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class CONNECT_Stub:
+
+    """
+    The HTTP proxy answering every CONNECT request with 'status'; the 2xx
+    tunnels are relayed to the port of the requested '127.0.0.1' target.
+    The received CONNECT heads are kept in '.requests'.
+    """
+
+    def __init__(self: _Self, status: int = 200) -> None:
+        self.status = status
+        self.requests: list[str] = []
+        self.server = None
+        self.port = None
+
+    async def __aenter__(self: _Self) -> _Self:
+        self.server = await _aio.start_server(self.__handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self: _Self, *args) -> None:
+        self.server.close()
+
+    async def __handle(
+        self: _Self,
+        reader: _aio.StreamReader,
+        writer: _aio.StreamWriter
+    ) -> None:
+        try:
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin_1")
+            self.requests.append(head)
+            port = int(head.split(" ")[1].rpartition(":")[2])
+            writer.write(
+                f"HTTP/1.1 {self.status} Stub\r\n"\
+                "Content-Length: 0\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+            if 200 <= self.status < 300:
+                target = await _aio.open_connection("127.0.0.1", port)
+                await _tunnel((reader, writer), target)
+        except (_aio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def run(coroutine, timeout: float = 10.0):
+    """
+    Runs the test coroutine with the overall deadline, so a hang fails the
+    test instead of blocking the run.
+    """
+    async def bounded():
+        async with _aio.timeout(timeout):
+            return await coroutine
+    return _aio.run(bounded())
@@ -0,0 +1,94 @@
+import asyncio
+from itertools import count
+
+from ..codebase import Async_Connector, Connection
+from ..codebase.async_connector import _Connection_Set
+from ._stubs import HTTP_Stub, plain_response, run
+
+
+def test_dead_idle_connection_is_replaced():
+    async def scenario():
+        async with HTTP_Stub(close_after = 1) as stub:
+            connector = Async_Connector("127.0.0.1", stub.port, num_conn = 1)
+            async with connector:
+                first = await connector.call(url_path = "/a")
+                # the server closed the only connection after the response
+                await asyncio.sleep(0.05)
+                second = await connector.call(url_path = "/b")
+            return first.status, second.status, stub.connections
+    assert (200, 200, 2) == run(scenario(), timeout = 5.0)
+
+
+def test_waiter_gets_replacement_of_removed_connection():
+    def handler(line, headers, body):
+        return plain_response(b"ok", "Connection: close")
+
+    async def scenario():
+        async with HTTP_Stub(handler, close_after = 1) as stub:
+            connector = Async_Connector("127.0.0.1", stub.port, num_conn = 1)
+            async with connector:
+                responses = await asyncio.gather(
+                    *[connector.call(url_path = f"/{i}") for i in range(3)]
+                )
+            return [response.status for response in responses]
+    assert [200, 200, 200] == run(scenario(), timeout = 5.0)
+
+
+def test_streamed_call_keeps_connection_until_body_is_read():
+    big = b"z" * 1048576
+
+    def handler(line, headers, body):
+        if "/big" in line:
+            return plain_response(big)
+        return plain_response()
+
+    async def scenario():
+        async with HTTP_Stub(handler) as stub:
+            connector = Async_Connector("127.0.0.1", stub.port, num_conn = 1)
+            async with connector:
+                response = await connector.call(
+                    url_path = "/big",
+                    stream = True
+                )
+                in_flight = connector.in_flight
+                data = await response.aread()
+                after = await connector.call(url_path = "/")
+                # the unfinished stream drops its connection
+                async with await connector.call(
+                    url_path = "/big",
+                    stream = True
+                ) as response:
+                    async for _ in response.aiter_bytes():
+                        break
+                last = await connector.call(url_path = "/")
+            return in_flight, len(data), after.body, last.body, \
+                stub.connections
+    assert (1, 1048576, "ok", "ok", 2) == run(scenario())
+
+
+def test_concurrent_acquires_respect_max_conn():
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            upstream = _Connection_Set(
+                "127.0.0.1", stub.port,
+                lambda host, port: Connection(host, port),
+                dict(),
+                count(),
+                max_conn = 1
+            )
+            waiting = [
+                asyncio.ensure_future(upstream.acquire()) for _ in range(5)
+            ]
+            await asyncio.sleep(0.05)
+            opened = len(upstream.members), upstream.opening
+            for _ in range(5):
+                done, _ = await asyncio.wait(
+                    waiting, return_when = asyncio.FIRST_COMPLETED
+                )
+                task = done.pop()
+                waiting.remove(task)
+                await upstream.release(task.result())
+            for conn in upstream.members:
+                await conn.close()
+            return opened, stub.connections
+    assert ((1, 0), 1) == run(scenario())
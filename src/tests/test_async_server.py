@@ -0,0 +1,81 @@
+import asyncio
+
+from ..codebase import AsyncServer, request
+from ..codebase.__request_builder import prepare_request
+from ..codebase.__response_builder import build_response_meta
+from ._stubs import HTTP_Stub, run
+
+
+def test_response_built_as_buffers():
+    head, body = build_response_meta(
+        "HTTP", "1.1", "200", "OK", {"X-A": "1"}, "héllo"
+    )
+    # the length of the encoded body, not of the string
+    assert b"Content-Length: 6\r\n" in head
+    assert head.endswith(b"X-A: 1\r\n\r\n")
+    assert "héllo".encode("utf_8") == body
+    body = b"raw"
+    assert body is build_response_meta("HTTP", "1.1", "200", "OK", {}, body)[1]
+
+
+def test_response_without_body_ends_head():
+    (head,) = build_response_meta("HTTP", "1.1", "204", "No Content", None)
+    assert b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n" == head
+
+
+def test_request_body_not_joined_with_head():
+    body = b"x" * 1024
+    head, sent = prepare_request(
+        "POST", "example.com", body_passed = body
+    )
+    assert body is sent
+    assert head.endswith(b"Content-Length: 1024\r\n\r\n")
+
+
+def test_kept_request_joined_on_access():
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            return await request.call(
+                "POST", host = "127.0.0.1", port = stub.port,
+                body = b"abc", timeouts = 3
+            )
+    response = run(scenario())
+    assert response.b_request.startswith(b"POST / HTTP/1.1\r\n")
+    assert response.b_request.endswith(b"\r\n\r\nabc")
+    assert response.request == response.b_request.decode()
+
+
+def test_server_writes_response_buffers():
+    server = AsyncServer(
+        "127.0.0.1", 0,
+        server_headers = {"Server": "test"},
+        listener = False
+    )
+
+    @server.get("/hi")
+    def hi(start_line, headers, body, **kwargs):
+        return "héllo", {"X-A": "1"}
+
+    async def scenario():
+        serving = asyncio.ensure_future(server.start_serving())
+        while not hasattr(server, "_server"):
+            await asyncio.sleep(0.01)
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            found = await request.call(
+                "GET", host = "127.0.0.1", port = port, url_path = "/hi",
+                use_pool = False, timeouts = 3
+            )
+            missing = await request.call(
+                "GET", host = "127.0.0.1", port = port, url_path = "/nope",
+                use_pool = False, timeouts = 3
+            )
+        finally:
+            serving.cancel()
+            server._server.close()
+        return found, missing
+    found, missing = run(scenario())
+    assert (200, "héllo") == (found.status, found.text)
+    assert "1" == found.headers.value("X-A")
+    assert "test" == found.headers.value("Server")
+    assert (404, b"") == (missing.status, missing.content)
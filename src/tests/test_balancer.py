@@ -0,0 +1,127 @@
+from collections import Counter
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+
+from ..codebase import async_connector
+from ..codebase.async_connector import Async_Connector, _Connection_Set
+from ..codebase.balancer import (
+    Abstract_Balancer,
+    Least_Outstanding,
+    P2C_EWMA,
+    Round_Robin,
+    get_balancer
+)
+
+
+def _upstream(name: str, outstanding: int = 0, latency: float = None):
+    return SimpleNamespace(
+        host = name, port = 80,
+        in_flight = outstanding, outstanding = outstanding,
+        latency = latency
+    )
+
+
+def test_round_robin_cycles():
+    upstreams = [_upstream("a"), _upstream("b"), _upstream("c")]
+    balancer = Round_Robin()
+    chosen = [balancer.choose(upstreams).host for _ in range(6)]
+    assert ["a", "b", "c", "a", "b", "c"] == chosen
+
+
+def test_least_outstanding_picks_lowest_and_breaks_ties():
+    upstreams = [_upstream("a", 3), _upstream("b", 1), _upstream("c", 1)]
+    balancer = Least_Outstanding()
+    chosen = Counter(balancer.choose(upstreams).host for _ in range(200))
+    assert {"b", "c"} == set(chosen)
+
+
+def test_p2c_ewma_prefers_cheaper_and_unprobed():
+    fast = _upstream("fast", 0, 0.01)
+    slow = _upstream("slow", 0, 0.5)
+    busy = _upstream("busy", 100, 0.01)
+    balancer = P2C_EWMA()
+    assert all("fast" == balancer.choose([fast, slow]).host for _ in range(50))
+    # the latency is weighted with the outstanding requests
+    assert all("slow" == balancer.choose([busy, slow]).host for _ in range(50))
+    unprobed = _upstream("new")
+    assert all(
+        "new" == balancer.choose([fast, unprobed]).host for _ in range(50)
+    )
+    assert fast is balancer.choose([fast])
+
+
+def test_get_balancer():
+    assert isinstance(get_balancer("p2c_ewma"), P2C_EWMA)
+    custom = Round_Robin()
+    assert custom is get_balancer(custom)
+    assert isinstance(get_balancer(), Abstract_Balancer)
+    with pytest.raises(ValueError, match = "Unknown balancing policy"):
+        get_balancer("random")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        async_connector, "_time", SimpleNamespace(monotonic = lambda: now[0])
+    )
+    return now
+
+
+def _connection_set(**kwargs) -> _Connection_Set:
+    return _Connection_Set(
+        "127.0.0.1", 80, None, dict(), count(), **kwargs
+    )
+
+
+def test_ejection_backs_off_exponentially(clock):
+    upstream = _connection_set(
+        max_failures = 2, ejection_time = 1.0, max_ejection_time = 3.0
+    )
+    upstream.record(False)
+    assert upstream.is_healthy()
+    upstream.record(False)
+    assert not upstream.is_healthy()
+    # failures during the ejection do not extend it
+    upstream.record(False)
+    clock[0] += 1.0
+    assert upstream.is_healthy()
+    # the next failure ejects it again for twice as long
+    upstream.record(False)
+    clock[0] += 1.5
+    assert not upstream.is_healthy()
+    clock[0] += 0.5
+    assert upstream.is_healthy()
+    # capped by 'max_ejection_time'
+    upstream.record(False)
+    clock[0] += 2.5
+    assert not upstream.is_healthy()
+    clock[0] += 0.5
+    assert upstream.is_healthy()
+
+
+def test_success_restores_upstream(clock):
+    upstream = _connection_set(max_failures = 1, ejection_time = 1.0)
+    upstream.record(False)
+    clock[0] += 1.0
+    upstream.record(True)
+    assert (0, 0) == (upstream.failures, upstream.ejections)
+    upstream.record(False)
+    clock[0] += 1.0
+    # back to the initial ejection time
+    assert upstream.is_healthy()
+
+
+def test_connector_skips_ejected_upstreams(clock):
+    connector = Async_Connector(
+        upstreams = ["a.test:80", "b.test:80"], max_failures = 1
+    )
+    first, second = connector.upstreams
+    first.record(False)
+    assert all(second is connector.choose_upstream() for _ in range(4))
+    second.record(False)
+    # with every upstream ejected all of them are tried
+    chosen = {connector.choose_upstream().host for _ in range(4)}
+    assert {"a.test", "b.test"} == chosen
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from ..codebase.__batch_executor import ordered_map, unordered_map
+from ._stubs import run
+
+
+async def _echo(value: int, **kwargs) -> int:
+    await asyncio.sleep(0)
+    if 0 > value:
+        raise ValueError(value)
+    return value
+
+
+def _collect(mapper, specs, **kwargs):
+    async def scenario():
+        results = []
+        try:
+            async for result in mapper(_echo, specs, **kwargs):
+                results.append(result)
+        except ValueError as err:
+            return results, err
+        return results, None
+    return run(scenario())
+
+
+def test_unordered_map_yields_finished_results_before_error():
+    # all calls finish in the same 'asyncio.wait()' batch
+    specs = [{"value": value} for value in (1, 2, -1, 3, -2)]
+    results, error = _collect(unordered_map, specs)
+    assert [1, 2, 3] == sorted(results)
+    assert None != error
+
+
+def test_unordered_map_return_exceptions():
+    specs = [{"value": value} for value in (1, -1, 2)]
+    results, error = _collect(unordered_map, specs, return_exceptions = True)
+    assert None == error
+    assert [1, 2] == sorted(x for x in results if isinstance(x, int))
+    assert 1 == sum(isinstance(x, ValueError) for x in results)
+
+
+def test_ordered_map_keeps_input_order():
+    specs = [{"value": value} for value in (3, 1, 2)]
+    results, error = _collect(ordered_map, specs, concurrency = 2)
+    assert ([3, 1, 2], None) == (results, error)
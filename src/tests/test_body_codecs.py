@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from ..codebase import body_codecs, request
+from ..codebase.body_codecs import (
+    Abstract_Codec,
+    Form_Codec,
+    JSON_Codec,
+    Multipart_Codec,
+    codec_for_content_type,
+    get_codec,
+    register_codec,
+    should_offload
+)
+from ._stubs import HTTP_Stub, run
+
+_document = {"name": "żółw", "items": [1, 2.5, None, True], "nested": {}}
+
+
+class _Upper_Codec(Abstract_Codec):
+
+    content_type = "application/json"
+
+    def encode(self, data, encoding = "utf_8", *args, **kwargs):
+        return str(data).upper().encode(encoding)
+
+    def decode(self, body, encoding = "utf_8", *args, **kwargs):
+        return body.decode(encoding).lower()
+
+
+class _Small_Offload(JSON_Codec):
+
+    offload_size = 1 << 30
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # the registered codecs do not leak into the other tests
+    monkeypatch.setattr(body_codecs, "_codecs", {**body_codecs._codecs})
+
+
+def test_json_round_trip():
+    codec = JSON_Codec()
+    body = codec.encode(_document)
+    assert json.dumps(_document, separators = (",", ":")).encode() == body
+    assert _document == codec.decode(body)
+    assert body == codec.encode_off_loop(_document)
+    assert {"Content-Type": "application/json"} == codec.headers()
+
+
+def test_json_decode_of_non_utf_body():
+    body = json.dumps({"name": "café"}, ensure_ascii = False)\
+        .encode("latin_1")
+    assert {"name": "café"} == JSON_Codec().decode(body, "latin_1")
+    assert {"a": 1} == JSON_Codec().decode('{"a": 1}'.encode("utf_16"))
+
+
+def test_form_round_trip():
+    codec = Form_Codec()
+    body = codec.encode({"a": "x y", "b": ["1", "2"], "c": ""})
+    assert b"a=x+y&b=1&b=2&c=" == body
+    assert {"a": ["x y"], "b": ["1", "2"], "c": [""]} == codec.decode(body)
+
+
+def test_multipart_round_trip():
+    codec = Multipart_Codec()
+    body = codec.encode({"a": "1", "b": "zwei"}, boundary = "xyz")
+    assert body.endswith(b"--------xyz--\r\n")
+    content_type = codec.headers(boundary = "xyz")["Content-Type"]
+    assert "multipart/form-data;boundary=------xyz" == content_type
+    assert {"a": "1", "b": "zwei"} \
+        == codec.decode(body, content_type = content_type)
+
+
+def test_get_codec():
+    assert isinstance(get_codec(), JSON_Codec)
+    assert isinstance(get_codec("form"), Form_Codec)
+    codec = _Upper_Codec()
+    assert codec is get_codec(codec)
+    with pytest.raises(ValueError, match = "register_codec"):
+        get_codec("yaml")
+
+
+def test_register_codec(registry):
+    with pytest.raises(TypeError):
+        register_codec("upper", object())
+    codec = _Upper_Codec()
+    register_codec("upper", codec)
+    assert codec is get_codec("upper")
+
+
+def test_codec_for_content_type(registry):
+    assert None == codec_for_content_type(None)
+    assert None == codec_for_content_type("text/plain")
+    assert isinstance(
+        codec_for_content_type("Application/JSON; charset=utf-8"),
+        JSON_Codec
+    )
+    assert isinstance(
+        codec_for_content_type("application/problem+json"),
+        JSON_Codec
+    )
+    assert isinstance(
+        codec_for_content_type("multipart/form-data; boundary=x"),
+        Multipart_Codec
+    )
+    # the most recently registered codec of the media type wins
+    codec = _Upper_Codec()
+    register_codec("upper", codec)
+    assert codec is codec_for_content_type("application/json")
+
+
+def test_should_offload():
+    assert not should_offload(None)
+    assert not should_offload({"a": "b"})
+    assert should_offload({"a": "x" * 262144})
+    assert should_offload([{"id": i} for i in range(100000)])
+    assert not should_offload({"a": "x" * 262144}, _Small_Offload())
+
+
+def test_large_data_encoded_off_loop_as_on_loop():
+    small = {"items": list(range(10))}
+    large = {"items": [{"id": i, "name": f"item {i}"} for i in range(20000)]}
+    assert not should_offload(small) and should_offload(large)
+
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            for data in (small, large):
+                await request.call(
+                    "POST", host = "127.0.0.1", port = stub.port,
+                    data = data, timeouts = 5
+                )
+            return stub.requests
+    received = run(scenario())
+    for data, (_, headers, body) in zip((small, large), received):
+        assert "application/json" == headers["content-type"]
+        assert JSON_Codec().encode(data) == body
@@ -0,0 +1,105 @@
+import asyncio
+
+from ..codebase import Connection_Pool, request
+from ._stubs import HTTP_Stub, run
+
+
+def test_idle_connection_is_reused():
+    async def scenario():
+        async with HTTP_Stub() as stub, Connection_Pool() as pool:
+            for path in ("/a", "/b", "/c"):
+                response = await request.call(
+                    "GET", host = "127.0.0.1", port = stub.port,
+                    url_path = path, pool = pool, timeouts = 3
+                )
+                assert 200 == response.status
+            key = pool.pool_key("127.0.0.1", stub.port)
+            return stub.connections, pool.idle_count(key)
+    assert (1, 1) == run(scenario())
+
+
+def test_expired_idle_connection_is_evicted():
+    async def scenario():
+        async with HTTP_Stub() as stub, \
+                Connection_Pool(idle_timeout = 0.05) as pool:
+            conn = await pool.acquire("127.0.0.1", stub.port)
+            await pool.release(conn)
+            assert 1 == pool.idle_count()
+            await asyncio.sleep(0.1)
+            conn = await pool.acquire("127.0.0.1", stub.port)
+            evicted = pool.idle_count()
+            await pool.release(conn)
+            return evicted, stub.connections
+    assert (0, 2) == run(scenario())
+
+
+def test_waiter_above_max_per_host_gets_released_connection():
+    async def scenario():
+        async with HTTP_Stub() as stub, \
+                Connection_Pool(max_per_host = 1) as pool:
+            first = await pool.acquire("127.0.0.1", stub.port)
+            waiter = asyncio.ensure_future(
+                pool.acquire("127.0.0.1", stub.port)
+            )
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            await pool.release(first)
+            second = await waiter
+            await pool.release(second)
+            return first is second, stub.connections
+    assert (True, 1) == run(scenario())
+
+
+def test_idempotent_request_retried_after_server_closed_idle_connection():
+    # the server closes every connection right after the response without
+    # 'Connection: close', so the pooled connection is dead when reused
+    async def scenario():
+        async with HTTP_Stub(close_after = 1) as stub, \
+                Connection_Pool() as pool:
+            statuses = []
+            for path in ("/a", "/b", "/c"):
+                response = await request.call(
+                    "GET", host = "127.0.0.1", port = stub.port,
+                    url_path = path, pool = pool, timeouts = 3
+                )
+                statuses.append(response.status)
+            return statuses, [line for line, _, _ in stub.requests]
+    statuses, lines = run(scenario())
+    assert [200, 200, 200] == statuses
+    assert ["GET /a HTTP/1.1", "GET /b HTTP/1.1", "GET /c HTTP/1.1"] == lines
+
+
+def test_non_idempotent_request_not_retried():
+    async def scenario():
+        async with HTTP_Stub(close_after = 1) as stub, \
+                Connection_Pool() as pool:
+            call = dict(host = "127.0.0.1", port = stub.port, pool = pool,
+                        timeouts = 3)
+            await request.call("GET", **call)
+            try:
+                await request.call("POST", body = b"x", **call)
+            except ConnectionError:
+                return "failed", len(stub.requests)
+            return "sent", len(stub.requests)
+    # the closed idle connection either fails the POST or is detected as
+    # closed before it is used, the POST is never sent twice
+    outcome, received = run(scenario())
+    assert ("failed", 1) == (outcome, received) \
+        or ("sent", 2) == (outcome, received)
+
+
+def test_keys_are_dropped_when_unused():
+    async def scenario():
+        async with HTTP_Stub(close_after = 1) as first, HTTP_Stub() as second, \
+                Connection_Pool() as pool:
+            dead = await pool.acquire("127.0.0.1", first.port)
+            await pool.release(dead)
+            conn = await pool.acquire("127.0.0.1", second.port)
+            await pool.release(conn, reuse = False)
+            # the server closed the idle connection in the meantime
+            await asyncio.sleep(0.05)
+            replacement = await pool.acquire("127.0.0.1", first.port)
+            await pool.release(replacement, reuse = False)
+            return dead.is_closed(), pool.idle_count(), \
+                pool._Connection_Pool__slots
+    assert (True, 0, {}) == run(scenario())
@@ -0,0 +1,98 @@
+import gzip
+import zlib
+
+import pytest
+
+from ..codebase import Connection_Pool, request
+from ._stubs import HTTP_Stub, plain_response, run
+
+_payload = b"0123456789abcdef" * 8192
+
+
+def _raw_deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits = -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _encoded(encoding: str, body: bytes):
+    def handler(line, headers, request_body):
+        return plain_response(body, f"Content-Encoding: {encoding}")
+    return handler
+
+
+def _chunked(encoding: str, body: bytes, size: int = 1000):
+    def handler(line, headers, request_body):
+        chunks = b"".join(
+            b"%x\r\n" % len(body[start:start + size])
+            + body[start:start + size] + b"\r\n"
+            for start in range(0, len(body), size)
+        )
+        return (
+            "HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n"\
+            f"Content-Encoding: {encoding}\r\n\r\n"
+        ).encode("ascii") + chunks + b"0\r\n\r\n"
+    return handler
+
+
+def _get(handler, **kwargs):
+    async def scenario():
+        async with HTTP_Stub(handler) as stub:
+            response = await request.call(
+                "GET", host = "127.0.0.1", port = stub.port,
+                accept_encoding = True, timeouts = 3, **kwargs
+            )
+            if kwargs.get("stream"):
+                pieces = [
+                    piece async for piece in response.aiter_bytes(4096)
+                ]
+                return response, pieces, stub.requests
+            return response, None, stub.requests
+    return run(scenario())
+
+
+@pytest.mark.parametrize("encoding, body", [
+    ("gzip", gzip.compress(_payload)),
+    ("deflate", zlib.compress(_payload)),
+    ("deflate", _raw_deflate(_payload))
+])
+def test_body_is_decompressed(encoding, body):
+    response, _, received = _get(_encoded(encoding, body))
+    assert _payload == response.content
+    assert "gzip, deflate" == received[0][1]["accept-encoding"]
+
+
+@pytest.mark.parametrize("encoding, body", [
+    ("gzip", gzip.compress(_payload)),
+    ("deflate", _raw_deflate(_payload))
+])
+def test_chunked_body_is_decompressed_as_streamed(encoding, body):
+    _, pieces, _ = _get(_chunked(encoding, body), stream = True)
+    assert _payload == b"".join(pieces)
+    assert all(len(piece) <= 4096 for piece in pieces)
+
+
+def test_body_over_limit_raises():
+    with pytest.raises(ValueError, match = "exceeds 65536 bytes"):
+        _get(
+            _encoded("gzip", gzip.compress(_payload)),
+            max_decompressed_size = 65536
+        )
+
+
+def test_connection_dropped_after_body_over_limit():
+    # the bomb is far larger than the limit, its rest is never read
+    bomb = gzip.compress(bytes(16777216))
+
+    async def scenario():
+        async with HTTP_Stub(_encoded("gzip", bomb)) as stub, \
+                Connection_Pool() as pool:
+            call = dict(host = "127.0.0.1", port = stub.port, pool = pool,
+                        accept_encoding = True, timeouts = 3)
+            with pytest.raises(ValueError):
+                await request.call(
+                    "GET", max_decompressed_size = 1048576, **call
+                )
+            idle = pool.idle_count()
+            response = await request.call("GET", **call)
+            return idle, len(response.content), stub.connections
+    assert (0, 16777216, 2) == run(scenario())
@@ -0,0 +1,97 @@
+import pytest
+
+from ..codebase import HTTP_Headers, request
+from ..codebase.__response_listener import _parse_head
+from ._stubs import HTTP_Stub, plain_response, run
+
+_block = (
+    b"Content-Type: text/html; charset=utf-8\r\n"
+    b"Set-Cookie: a=1; Path=/\r\n"
+    b"Cache-Control: no-cache, max-age=0\r\n"
+    b"set-cookie: b=2\r\n"
+    b"X-Empty:\r\n"
+)
+
+
+def test_lookup_is_case_insensitive():
+    headers = HTTP_Headers(_block)
+    assert "text/html; charset=utf-8" == headers.value("content-type")
+    assert headers.value("CONTENT-TYPE") == headers.value("Content-Type")
+    assert "content-type" in headers and "X-Missing" not in headers
+    assert 1 not in headers
+    assert "" == headers.value("x-empty")
+    assert None == headers.value("X-Missing")
+    assert "none" == headers.value("X-Missing", "none")
+
+
+def test_repeated_fields_are_all_kept():
+    headers = HTTP_Headers(_block)
+    assert ["a=1; Path=/", "b=2"] == headers.get_all("Set-Cookie")
+    assert [] == headers.get_all("X-Missing")
+    # the first field is the one returned by the single value lookups
+    assert "a=1; Path=/" == headers.value("SET-COOKIE")
+
+
+def test_values_split_into_parameters():
+    headers = HTTP_Headers(_block)
+    assert {0: "text/html", "charset": "utf-8"} == headers["Content-Type"]
+    assert {0: "no-cache", "max-age": "0"} == headers["cache-control"]
+    assert {"a": "1", "Path": "/"} == headers.params("Set-Cookie")
+    assert headers["content-type"] is headers.params("Content-Type")
+    assert None == headers.params("X-Missing")
+    with pytest.raises(KeyError):
+        headers["X-Missing"]
+
+
+def test_names_in_received_order():
+    headers = HTTP_Headers(_block)
+    assert [
+        ("Content-Type", "text/html; charset=utf-8"),
+        ("Set-Cookie", "a=1; Path=/"),
+        ("Cache-Control", "no-cache, max-age=0"),
+        ("set-cookie", "b=2"),
+        ("X-Empty", "")
+    ] == headers.fields()
+    # each name once, as it was first received
+    assert ["Content-Type", "Set-Cookie", "Cache-Control", "X-Empty"] \
+        == list(headers)
+    assert 4 == len(headers)
+    assert {"a": "1", "Path": "/"} == dict(headers)["Set-Cookie"]
+
+
+def test_nothing_parsed_before_first_lookup():
+    headers = HTTP_Headers(_block)
+    assert None == headers._HTTP_Headers__fields
+    assert _block is headers.raw
+    headers.value("Content-Type")
+    assert None != headers._HTTP_Headers__fields
+    assert None == headers._HTTP_Headers__parsed
+    headers.params("Content-Type")
+    assert 1 == len(headers._HTTP_Headers__parsed)
+
+
+def test_fields_parsed_by_listener_are_reused():
+    _, response_head, _, _, _ = _parse_head(b"HTTP/1.1 200 OK\r\n" + _block)
+    headers = HTTP_Headers(response_head)
+    # the header block itself is not kept
+    assert response_head.fields is headers.raw
+    assert response_head.fields is headers.fields()
+    assert HTTP_Headers(_block).fields() == headers.fields()
+
+
+def test_response_headers():
+    def cookies(line, headers, body):
+        return plain_response(
+            b"ok", "Set-Cookie: a=1", "Content-Type: text/plain",
+            "set-cookie: b=2"
+        )
+
+    async def scenario():
+        async with HTTP_Stub(cookies) as stub:
+            return await request.call(
+                "GET", host = "127.0.0.1", port = stub.port, timeouts = 3
+            )
+    response = run(scenario())
+    assert ["a=1", "b=2"] == response.headers.get_all("set-cookie")
+    assert {0: "text/plain"} == response.headers["content-type"]
+    assert "2" == response.headers.value("Content-Length")
@@ -0,0 +1,62 @@
+import pytest
+
+from ..codebase import Connection, request
+from ._stubs import HTTP_Stub, plain_response, run
+
+
+def _echo_path(line, headers, body):
+    method, path, _ = line.split(" ")
+    if "HEAD" == method:
+        # the length of the body that would be sent to GET, no body
+        return b"HTTP/1.1 200 OK\r\nContent-Length: 9\r\n\r\n"
+    return plain_response(f"{path}:{len(body)}".encode("ascii"))
+
+
+def _pipeline(specs, close_after = None):
+    async def scenario():
+        async with HTTP_Stub(_echo_path, close_after) as stub:
+            async with Connection("127.0.0.1", stub.port) as conn:
+                responses = await request.pipeline(conn, specs)
+            return responses, stub.requests, stub.connections
+    return run(scenario())
+
+
+def test_responses_read_in_request_order():
+    specs = [{"url_path": f"/{number}"} for number in range(5)]
+    responses, received, connections = _pipeline(specs)
+    assert [f"/{number}:0" for number in range(5)] \
+        == [response.text for response in responses]
+    assert 1 == connections
+    assert [f"GET /{number} HTTP/1.1" for number in range(5)] \
+        == [line for line, _, _ in received]
+
+
+def test_head_response_has_no_body():
+    specs = [
+        {"url_path": "/a"},
+        {"method": "HEAD", "url_path": "/b"},
+        {"url_path": "/c"}
+    ]
+    responses, _, _ = _pipeline(specs)
+    assert "/a:0" == responses[0].text
+    assert not responses[1].content
+    # the next response was not taken as the body of the HEAD one
+    assert "/c:0" == responses[2].text
+    assert "9" == responses[1].headers.value("Content-Length")
+
+
+def test_streamed_request_in_pipeline():
+    specs = [
+        {"method": "POST", "url_path": "/a", "body": iter([b"ab", b"cd"])},
+        {"method": "POST", "url_path": "/b", "body": b"xyz"}
+    ]
+    responses, received, _ = _pipeline(specs)
+    assert ["/a:4", "/b:3"] == [response.text for response in responses]
+    assert "chunked" == received[0][1]["transfer-encoding"]
+    assert b"abcd" == received[0][2]
+
+
+def test_connection_closed_before_all_responses():
+    specs = [{"url_path": f"/{number}"} for number in range(3)]
+    with pytest.raises(ConnectionError, match = "after 2 of 3"):
+        _pipeline(specs, close_after = 2)
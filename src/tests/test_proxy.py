@@ -0,0 +1,92 @@
+import pytest
+
+from ..codebase import Connection, request
+from ._stubs import CONNECT_Stub, HTTP_Stub, SOCKS5_Stub, run
+
+
+async def _call_through(proxy: dict, port: int, host: str = "127.0.0.1"):
+    return await request.call(
+        "GET", host = host, port = port, url_path = "/item",
+        proxy_data = proxy, timeouts = 3
+    )
+
+
+def test_socks5_no_auth_with_remote_dns():
+    async def scenario():
+        async with HTTP_Stub() as target, SOCKS5_Stub() as proxy:
+            response = await _call_through(
+                {"socks5": f"127.0.0.1:{proxy.port}", "prox_type": "socks5"},
+                target.port,
+                host = "target.test"
+            )
+            return response, proxy.targets, target.requests
+    response, targets, received = run(scenario())
+    assert 200 == response.status
+    # the name is passed to the proxy as the domain address type
+    assert [(0x03, "target.test", targets[0][2])] == targets
+    assert "GET /item HTTP/1.1" == received[0][0]
+
+
+def test_socks5_username_password():
+    async def scenario():
+        async with HTTP_Stub() as target, \
+                SOCKS5_Stub(("user", "secret")) as proxy:
+            response = await _call_through(
+                {
+                    "socks5": f"127.0.0.1:{proxy.port}",
+                    "prox_type": "socks5",
+                    "username": "user",
+                    "password": "secret"
+                },
+                target.port
+            )
+            return response, proxy.targets
+    response, targets = run(scenario())
+    assert 200 == response.status
+    assert 0x01 == targets[0][0]
+
+
+def test_socks5_rejected_credentials():
+    async def scenario():
+        async with SOCKS5_Stub(("user", "secret")) as proxy:
+            conn = Connection(
+                "127.0.0.1", 80,
+                proxy = {
+                    "socks5": f"127.0.0.1:{proxy.port}",
+                    "prox_type": "socks5",
+                    "username": "user",
+                    "password": "wrong"
+                }
+            )
+            await conn.open()
+    with pytest.raises(ConnectionError, match = "credentials"):
+        run(scenario())
+
+
+def test_connect_tunnel():
+    async def scenario():
+        async with HTTP_Stub() as target, CONNECT_Stub() as proxy:
+            response = await _call_through(
+                {"http": f"127.0.0.1:{proxy.port}"},
+                target.port
+            )
+            return response, proxy.requests
+    response, received = run(scenario())
+    assert 200 == response.status
+    assert received[0].startswith("CONNECT 127.0.0.1:")
+
+
+def test_connect_tunnel_refused():
+    async def scenario():
+        async with CONNECT_Stub(407) as proxy:
+            conn = Connection(
+                "127.0.0.1", 80,
+                proxy = {"http": f"127.0.0.1:{proxy.port}"}
+            )
+            try:
+                await conn.open()
+            finally:
+                # the failed connection is closed by 'open()'
+                assert conn.is_closed()
+    with pytest.raises(ConnectionError, match = "407"):
+        run(scenario())
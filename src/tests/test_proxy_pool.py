@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+
+import pytest
+
+from ..codebase import Async_Connector, Proxy_Pool, proxy_pool
+from ._stubs import CONNECT_Stub, HTTP_Stub, run
+
+
+def _pool(number: int, **kwargs) -> Proxy_Pool:
+    return Proxy_Pool(
+        [{"http": f"127.0.0.1:{9000 + index}"} for index in range(number)],
+        **kwargs
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        proxy_pool, "_time", SimpleNamespace(monotonic = lambda: now[0])
+    )
+    return now
+
+
+def test_score_prefers_fast_unused_proxies():
+    pool = _pool(3)
+    fast, slow, busy = pool.entries
+    pool.report(fast, True, 0.01)
+    pool.report(slow, True, 0.5)
+    pool.report(busy, True, 0.01)
+    busy.in_use = 5
+    assert fast is pool.choose()
+    # the proxy without latency data yet is tried early
+    untested = _pool(2)
+    untested.report(untested.entries[0], True, 0.01)
+    assert untested.entries[1] is untested.choose()
+
+
+def test_failures_lower_success_rate():
+    pool = _pool(2)
+    first, second = pool.entries
+    for entry in pool.entries:
+        pool.report(entry, True, 0.01)
+    pool.report(first, False)
+    assert first.success_rate < second.success_rate
+    assert second is pool.choose()
+
+
+def test_quarantine_backs_off(clock):
+    pool = _pool(
+        2, max_failures = 2, quarantine_time = 1.0, max_quarantine_time = 3.0
+    )
+    first, second = pool.entries
+    pool.report(first, False)
+    assert first.is_available()
+    pool.report(first, False)
+    assert not first.is_available()
+    assert all(second is pool.choose() for _ in range(3))
+    clock[0] += 1.0
+    assert first.is_available()
+    pool.report(first, False)
+    clock[0] += 1.5
+    assert not first.is_available()
+    clock[0] += 0.5
+    pool.report(first, True)
+    assert (0, 0) == (first.failures, first.quarantines)
+
+
+def test_all_quarantined_picks_earliest_end(clock):
+    pool = _pool(2, max_failures = 1, quarantine_time = 1.0)
+    first, second = pool.entries
+    pool.report(first, False)
+    clock[0] += 0.5
+    pool.report(second, False)
+    assert first is pool.choose()
+
+
+def test_tunnel_fails_over_to_next_proxy():
+    async def scenario():
+        async with HTTP_Stub() as target, CONNECT_Stub(503) as refusing, \
+                CONNECT_Stub() as working:
+            pool = Proxy_Pool([
+                {"http": f"127.0.0.1:{refusing.port}"},
+                {"http": f"127.0.0.1:{working.port}"}
+            ])
+            bad, good = pool.entries
+            # the refusing proxy is tried first
+            pool.report(good, True, 1.0)
+            reader, writer, entry = await pool.open_tunnel(
+                "127.0.0.1", target.port
+            )
+            writer.close()
+            pool.release(entry)
+            return entry is good, bad.success_rate < 1.0, \
+                (bad.in_use, good.in_use)
+    assert (True, True, (0, 0)) == run(scenario())
+
+
+def test_tunnel_fails_after_all_attempts():
+    async def scenario():
+        async with CONNECT_Stub(503) as first, CONNECT_Stub(502) as second:
+            pool = Proxy_Pool([
+                {"http": f"127.0.0.1:{first.port}"},
+                {"http": f"127.0.0.1:{second.port}"}
+            ])
+            try:
+                await pool.open_tunnel("127.0.0.1", 80)
+            finally:
+                assert [0, 0] == [entry.in_use for entry in pool.entries]
+    with pytest.raises(ConnectionError, match = "through 2 proxies"):
+        run(scenario())
+
+
+def test_connector_reports_request_latency():
+    async def scenario():
+        async with HTTP_Stub() as target, CONNECT_Stub() as proxy:
+            pool = Proxy_Pool([{"http": f"127.0.0.1:{proxy.port}"}])
+            entry = pool.entries[0]
+            connector = Async_Connector(
+                "127.0.0.1", target.port, num_conn = 1, proxy_pool = pool
+            )
+            async with connector:
+                entry.latency = 100.0
+                response = await connector.call()
+            return response.status, entry.latency
+    status, latency = run(scenario())
+    assert 200 == status
+    # the EWMA moved from 100 s towards the short request time
+    assert 79.0 < latency < 81.0
@@ -0,0 +1,60 @@
+from ..codebase import request
+from ..codebase.__request_builder import prepare_request
+from ._stubs import HTTP_Stub, run
+
+
+def test_prepare_request_does_not_change_caller_headers():
+    headers = {"X-Token": "abc"}
+    prepare_request("POST", "example.com", body_passed = b"0123456789",
+                    headers_passed = headers)
+    prepare_request("POST", "example.com",
+                    body_passed = iter([b"a", b"b"]),
+                    headers_passed = headers)
+    assert {"X-Token": "abc"} == headers
+
+
+def test_headers_dict_reused_across_calls():
+    headers = {"X-Token": "abc"}
+
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            call = dict(host = "127.0.0.1", port = stub.port,
+                        headers = headers, timeouts = 3)
+            await request.call("POST", body = iter([b"ab", b"cd"]), **call)
+            await request.call("POST", body = b"xyz", **call)
+            await request.call("POST", body = b"0123456789", **call)
+            await request.call("GET", **call)
+            await request.call("POST", body = b"a" * 2048,
+                               compress = "gzip", **call)
+            await request.call("POST", body = b"small", compress = "gzip",
+                               **call)
+            return stub.requests
+    received = run(scenario())
+    assert [b"abcd", b"xyz", b"0123456789", b""] \
+        == [body for _, _, body in received[:4]]
+    assert "transfer-encoding" not in received[1][1]
+    assert "content-length" not in received[3][1]
+    assert "gzip" == received[4][1]["content-encoding"]
+    # below the threshold the body is sent as it is and not labelled
+    assert "content-encoding" not in received[5][1]
+    assert b"small" == received[5][2]
+    assert {"X-Token": "abc"} == headers
+
+
+def test_empty_file_is_uploaded(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            response = await request.call(
+                "POST", host = "127.0.0.1", port = stub.port,
+                files = [{"file": str(empty), "field": "upload"}],
+                timeouts = 3
+            )
+            return response, stub.requests
+    response, received = run(scenario())
+    assert 200 == response.status
+    _, headers, body = received[0]
+    assert len(body) == int(headers["content-length"])
+    assert b"empty.txt" in body
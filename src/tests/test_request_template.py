@@ -0,0 +1,80 @@
+import pytest
+
+from ..codebase import Request_Template
+from ..codebase.__request_builder import Streamed_Request, prepare_request
+
+
+def _bytes(cooked) -> bytes:
+    if isinstance(cooked, Streamed_Request):
+        return cooked.meta
+    return b"".join(cooked)
+
+
+_cases = [
+    ("GET", None, dict()),
+    ("GET", {"X-Token": "abc"}, {"url_query": "a=1&b=2"}),
+    ("POST", None, {"body": b"0123456789"}),
+    ("POST", {"Content-Type": "text/plain"}, {"body": "text body"}),
+    ("POST", {"content-type": "application/x-json"}, {"data": {"a": 1}}),
+    ("POST", None, {"data": {"a": [1, 2, 3]}}),
+    ("POST", {"Transfer-Encoding": "chunked"}, {"body": b"0123456789"}),
+    ("POST", {"transfer-encoding": "chunked"}, {"body": b"0123456789"}),
+    ("POST", {"content-length": "10"}, {"body": iter([b"ab", b"cd"])}),
+    ("PUT", {"X-A": "1"}, {"data": {"field": "value"}, "boundary": "b0"}),
+    ("POST", None, {"body": b"x" * 4096, "compress": "gzip"}),
+    ("GET", None, {"accept_encoding": True}),
+]
+
+
+@pytest.mark.parametrize("method, headers, call", _cases)
+def test_build_matches_prepare_request(method, headers, call):
+    call = {**call}
+    options = {
+        key: call.pop(key)
+        for key in ("compress", "accept_encoding") if key in call
+    }
+    template = Request_Template(
+        method, "example.com", "/path", headers = headers, **options
+    )
+    expected = prepare_request(
+        method, "example.com", "/path",
+        headers_passed = headers,
+        url_query_passed = call.get("url_query"),
+        body_passed = call.get("body"),
+        data_passed = call.get("data"),
+        boundary_str_passed = call.get("boundary"),
+        **options
+    )
+    if isinstance(call.get("body"), type(iter(()))):
+        # the iterator is consumed by the first build
+        call["body"] = iter([b"ab", b"cd"])
+    assert _bytes(expected) == _bytes(template.build(**call))
+
+
+def test_lowercase_transfer_encoding_per_request():
+    template = Request_Template("POST", "example.com")
+    # the body is sent as it is, already divided into the chunks
+    built = _bytes(
+        template.build(
+            headers = {"transfer-encoding": "chunked"},
+            body = b"a\r\n0123456789\r\n0"
+        )
+    )
+    assert b"Content-Length" not in built
+    assert 1 == built.lower().count(b"transfer-encoding")
+    assert built.endswith(b"\r\n\r\na\r\n0123456789\r\n0\r\n\r\n")
+
+
+def test_per_request_headers_match_prepare_request():
+    static = {"Host": "example.com", "X-A": "1", "Content-Length": "99"}
+    template = Request_Template("POST", "example.com", headers = static)
+    built = template.build(
+        headers = {"x-b": "2"}, body = iter([b"ab"])
+    )
+    expected = prepare_request(
+        "POST", "example.com", "/",
+        headers_passed = {**static, "x-b": "2"},
+        body_passed = iter([b"ab"])
+    )
+    assert _bytes(expected) == _bytes(built)
+    assert b"Content-Length" not in _bytes(built)
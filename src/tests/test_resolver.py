@@ -0,0 +1,134 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from ..codebase.resolver import Resolver, default_resolver
+from ._stubs import HTTP_Stub, run
+
+
+def _entry(host: str, port: int) -> tuple:
+    return (socket.AF_INET, socket.SOCK_STREAM, 6, "", (host, port))
+
+
+class _Lookups:
+
+    """
+    Replaces 'getaddrinfo()' of the running loop, counting the queries.
+    """
+
+    def __init__(self, result = None, delay: float = 0.0) -> None:
+        self.result = result
+        self.delay = delay
+        self.queries = 0
+
+    def install(self) -> None:
+        asyncio.get_running_loop().getaddrinfo = self.__getaddrinfo
+
+    async def __getaddrinfo(self, host, port, **kwargs):
+        self.queries += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.result, OSError):
+            raise self.result
+        return self.result
+
+
+def test_positive_cache_expires_after_ttl():
+    async def scenario():
+        lookups = _Lookups([_entry("10.0.0.1", 80)])
+        lookups.install()
+        resolver = Resolver(ttl = 0.05)
+        first = await resolver.resolve("example.test", 80)
+        second = await resolver.resolve("example.test", 80)
+        cached = lookups.queries
+        await asyncio.sleep(0.1)
+        await resolver.resolve("example.test", 80)
+        return first is second, cached, lookups.queries
+    assert (True, 1, 2) == run(scenario())
+
+
+def test_negative_cache():
+    async def scenario():
+        lookups = _Lookups(socket.gaierror("not found"))
+        lookups.install()
+        resolver = Resolver(negative_ttl = 0.05)
+        for _ in range(2):
+            with pytest.raises(socket.gaierror):
+                await resolver.resolve("missing.test", 80)
+        cached = lookups.queries
+        await asyncio.sleep(0.1)
+        with pytest.raises(socket.gaierror):
+            await resolver.resolve("missing.test", 80)
+        return cached, lookups.queries
+    assert (1, 2) == run(scenario())
+
+
+def test_concurrent_lookups_are_merged():
+    async def scenario():
+        lookups = _Lookups([_entry("10.0.0.1", 80)], delay = 0.05)
+        lookups.install()
+        resolver = Resolver()
+        results = await asyncio.gather(
+            *[resolver.resolve("example.test", 80) for _ in range(5)]
+        )
+        return lookups.queries, all(x is results[0] for x in results)
+    assert (1, True) == run(scenario())
+
+
+def test_happy_eyeballs_falls_back_to_next_address():
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            loop = asyncio.get_running_loop()
+            connect = loop.sock_connect
+            stalled = ("127.0.0.2", stub.port)
+
+            async def sock_connect(sock, address):
+                if stalled == address:
+                    # the unreachable address never answers
+                    await asyncio.sleep(10)
+                return await connect(sock, address)
+            loop.sock_connect = sock_connect
+            _Lookups([
+                _entry(*stalled), _entry("127.0.0.1", stub.port)
+            ]).install()
+            resolver = Resolver(happy_eyeballs_delay = 0.1)
+            started = time.monotonic()
+            sock = await resolver.connect("example.test", stub.port)
+            elapsed = time.monotonic() - started
+            peer = sock.getpeername()
+            sock.close()
+            return peer, elapsed
+    peer, elapsed = run(scenario())
+    assert "127.0.0.1" == peer[0]
+    assert 0.1 <= elapsed < 1.0
+
+
+def test_refused_address_tried_at_once():
+    async def scenario():
+        async with HTTP_Stub() as stub:
+            # the port of the closed server refuses the connection
+            closed = await asyncio.start_server(
+                lambda reader, writer: None, "127.0.0.1", 0
+            )
+            refused = closed.sockets[0].getsockname()[1]
+            closed.close()
+            await closed.wait_closed()
+            _Lookups([
+                _entry("127.0.0.1", refused), _entry("127.0.0.1", stub.port)
+            ]).install()
+            resolver = Resolver(happy_eyeballs_delay = 5)
+            sock = await resolver.connect("example.test", 0)
+            peer = sock.getpeername()
+            sock.close()
+            return peer[1] == stub.port
+    assert run(scenario(), timeout = 3.0)
+
+
+def test_default_resolver_per_event_loop():
+    async def current():
+        return default_resolver(), default_resolver()
+    first, same = run(current())
+    second, _ = run(current())
+    assert first is same
+    assert first is not second
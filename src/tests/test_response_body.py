@@ -0,0 +1,86 @@
+from ..codebase import HTTP_Headers, HTTP_Response, request
+from ._stubs import HTTP_Stub, plain_response, run
+
+
+def _response(content: bytes, content_type: str = None, **kwargs):
+    block = b"" if None == content_type \
+        else f"Content-Type: {content_type}\r\n".encode("ascii")
+    return HTTP_Response(
+        status = 200, headers = HTTP_Headers(block), content = content,
+        **kwargs
+    )
+
+
+def test_body_kept_as_bytes_until_text_accessed():
+    response = _response("zażółć".encode("utf_8"), "text/plain")
+    assert None == response._HTTP_Response__text
+    assert "zażółć".encode("utf_8") == response.content
+    assert None == response._HTTP_Response__text
+    assert "zażółć" == response.text
+    assert response.text is response.body
+
+
+def test_text_uses_charset_of_content_type():
+    response = _response(
+        "zażółć".encode("iso8859_2"), 'text/plain; charset="ISO-8859-2"'
+    )
+    assert "ISO-8859-2" == response.charset
+    assert "zażółć" == response.text
+    # the request encoding without the charset parameter
+    response = _response("zażółć".encode("cp1250"), "text/plain",
+                         encoding = "cp1250")
+    assert "cp1250" == response.charset
+    assert "zażółć" == response.text
+
+
+def test_invalid_bytes_replaced():
+    response = _response(b"ok \xff\xfe", "text/plain; charset=utf-8")
+    assert "ok ��" == response.text
+
+
+def test_unknown_charset_falls_back_to_encoding():
+    response = _response("żółw".encode("utf_8"), "text/plain; charset=x-nope")
+    assert "x-nope" == response.charset
+    assert "żółw" == response.text
+
+
+def test_content_encoded_from_text():
+    response = HTTP_Response(status = 200, body = "żółw")
+    assert "żółw".encode("utf_8") == response.content
+    assert None == HTTP_Response().text and None == HTTP_Response().content
+
+
+def test_json_decoded_once():
+    response = _response(b'{"a": [1, 2]}', "application/json")
+    document = response.json()
+    assert {"a": [1, 2]} == document
+    assert document is response.json()
+    # 'null' is kept as well
+    response = _response(b"null", "application/json")
+    assert None == response.json()
+    assert None == HTTP_Response().json()
+
+
+def test_json_in_non_utf_charset():
+    body = '{"name": "żółw"}'.encode("iso8859_2")
+    response = _response(body, "application/json; charset=iso-8859-2")
+    assert {"name": "żółw"} == response.json()
+    body = '{"name": "żółw"}'.encode("utf_16")
+    assert {"name": "żółw"} == _response(body, "application/json").json()
+
+
+def test_response_decoded_with_its_charset():
+    def latin(line, headers, body):
+        return plain_response(
+            "café".encode("latin_1"),
+            "Content-Type: text/plain; charset=latin-1"
+        )
+
+    async def scenario():
+        async with HTTP_Stub(latin) as stub:
+            return await request.call(
+                "GET", host = "127.0.0.1", port = stub.port, timeouts = 3
+            )
+    response = run(scenario())
+    assert "café".encode("latin_1") == response.content
+    assert "café" == response.text
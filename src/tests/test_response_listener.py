@@ -0,0 +1,30 @@
+import pytest
+
+from ..codebase import request
+from ._stubs import HTTP_Stub, plain_response, run
+
+
+def _large_head(line, headers, body):
+    return plain_response(b"ok", "X-Padding: " + "p" * 70000)
+
+
+def _call(limit: int = None):
+    async def scenario():
+        async with HTTP_Stub(_large_head) as stub:
+            kwargs = dict() if None == limit else {"limit": limit}
+            return await request.call(
+                "GET", host = "127.0.0.1", port = stub.port, timeouts = 3,
+                **kwargs
+            )
+    return run(scenario())
+
+
+def test_head_over_stream_limit_is_reported():
+    with pytest.raises(ConnectionError, match = "'limit'"):
+        _call()
+
+
+def test_head_within_larger_limit():
+    response = _call(limit = 1048576)
+    assert 200 == response.status
+    assert 70000 == len(response.headers.value("X-Padding"))
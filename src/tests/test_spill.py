@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+from ..codebase import request
+from ..codebase import __response_listener as listener
+from ._stubs import HTTP_Stub, plain_response, run
+
+_body = bytes(range(256)) * 40
+
+
+def _sized(line, headers, body):
+    return plain_response(_body)
+
+
+def _chunked(line, headers, body):
+    chunks = b"".join(
+        b"%x\r\n%s\r\n" % (len(piece), piece)
+        for piece in (_body[:4000], _body[4000:7000], _body[7000:])
+    )
+    return b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n" \
+        + chunks + b"0\r\n\r\n"
+
+
+def _call(handler, **kwargs):
+    async def scenario():
+        async with HTTP_Stub(handler) as stub:
+            return await request.call(
+                "GET", host = "127.0.0.1", port = stub.port, timeouts = 3,
+                **kwargs
+            )
+    return run(scenario())
+
+
+@pytest.mark.parametrize("handler", [_sized, _chunked])
+def test_body_above_threshold_spilled_to_file(handler, monkeypatch):
+    # several batched writes to the file
+    monkeypatch.setattr(listener, "_spill_batch_size", 3000)
+    response = _call(handler, spill_threshold = 1000)
+    body_file = response.body_file
+    assert not isinstance(body_file, io.BytesIO)
+    assert None == response.content
+    assert 0 == body_file.tell()
+    assert _body == body_file.read()
+
+    view = response.body_view()
+    assert view.readonly
+    assert _body == view
+    view.release()
+    run(response.aclose())
+    assert body_file.closed
+    assert None == response.body_file and None == response.body_view()
+
+
+def test_body_below_threshold_kept_in_memory():
+    response = _call(_sized, spill_threshold = len(_body))
+    assert isinstance(response.body_file, io.BytesIO)
+    assert _body == response.body_file.read()
+    assert _body == response.body_view()
+
+
+def test_join_chunks_false_uses_default_threshold():
+    response = _call(_chunked, join_chunks = False)
+    assert isinstance(response.body_file, io.BytesIO)
+    assert _body == response.body_view()
+
+
+def test_clear_closes_file_with_view_in_use():
+    response = _call(_sized, spill_threshold = 1000)
+    body_file = response.body_file
+    view = response.body_view()
+    # the map is closed when the view is released
+    response.clear()
+    assert body_file.closed
+    assert _body == view
+    view.release()
+
+
+def test_spilled_response_as_context_manager():
+    async def scenario():
+        async with HTTP_Stub(_sized) as stub:
+            async with await request.call(
+                "GET", host = "127.0.0.1", port = stub.port, timeouts = 3,
+                spill_threshold = 1000
+            ) as response:
+                body_file = response.body_file
+                assert _body == body_file.read()
+            return body_file
+    assert run(scenario()).closed
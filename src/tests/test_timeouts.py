@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from ..codebase import Connection, Connection_Pool, Timeouts, request
+from ..codebase.resolver import Resolver
+from ._stubs import HTTP_Stub, run
+
+
+class _Stalled_Resolver(Resolver):
+
+    async def connect(self, host: str, port: int):
+        await asyncio.sleep(10)
+
+
+class _Stalled_Stub:
+
+    """
+    The server that accepts the connections, reads the request head and
+    then writes 'answer' (nothing by default) and stalls. The number of
+    the connections closed by the client is kept in '.closed'.
+    """
+
+    def __init__(self, answer: bytes = b"") -> None:
+        self.answer = answer
+        self.closed = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(
+            self.__handle, "127.0.0.1", 0
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.server.close()
+
+    async def __handle(self, reader, writer) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(self.answer)
+            await writer.drain()
+            # EOF, or the reset of the aborted connection
+            await reader.read()
+            self.closed += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.closed += 1
+        finally:
+            writer.close()
+
+
+def _fails_with(scenario, phase: str) -> None:
+    with pytest.raises(TimeoutError, match = f"The {phase} deadline"):
+        run(scenario(), timeout = 5.0)
+
+
+def test_connect_deadline():
+    async def scenario():
+        conn = Connection(
+            "127.0.0.1", 80,
+            resolver = _Stalled_Resolver(),
+            timeouts = Timeouts(connect = 0.1)
+        )
+        await conn.open()
+    _fails_with(scenario, "connect")
+
+
+def test_proxy_deadline():
+    async def scenario():
+        # the proxy never answers the CONNECT request
+        async with _Stalled_Stub() as proxy:
+            conn = Connection(
+                "127.0.0.1", 80,
+                proxy = {"http": f"127.0.0.1:{proxy.port}"},
+                timeouts = Timeouts(proxy = 0.1)
+            )
+            await conn.open()
+    _fails_with(scenario, "proxy tunnel")
+
+
+def test_tls_deadline():
+    async def scenario():
+        # the server accepts the connection, but never starts the handshake
+        server = await asyncio.start_server(
+            lambda reader, writer: None, "127.0.0.1", 0
+        )
+        try:
+            conn = Connection(
+                "127.0.0.1", server.sockets[0].getsockname()[1],
+                ssl = True,
+                timeouts = Timeouts(tls = 0.1)
+            )
+            await conn.open()
+        finally:
+            server.close()
+    _fails_with(scenario, "TLS handshake")
+
+
+def _call(stub, timeouts: Timeouts, **kwargs):
+    return request.call(
+        "GET", host = "127.0.0.1", port = stub.port, timeouts = timeouts,
+        **kwargs
+    )
+
+
+def test_first_byte_deadline():
+    async def scenario():
+        async with _Stalled_Stub() as stub:
+            await _call(stub, Timeouts(first_byte = 0.1))
+    _fails_with(scenario, "first byte")
+
+
+def test_read_deadline():
+    async def scenario():
+        async with _Stalled_Stub(
+            b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n01234"
+        ) as stub:
+            response = await _call(
+                stub, Timeouts(read = 0.1), stream = True
+            )
+            await response.aread()
+    _fails_with(scenario, "body read")
+
+
+def test_total_deadline():
+    async def scenario():
+        async with _Stalled_Stub(
+            b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n01234"
+        ) as stub:
+            await _call(stub, Timeouts(first_byte = 5, read = 5, total = 0.2))
+    _fails_with(scenario, "request")
+
+
+def test_nested_deadline_keeps_its_phase():
+    async def scenario():
+        async with _Stalled_Stub() as stub:
+            await _call(stub, Timeouts(first_byte = 0.1, total = 5))
+    _fails_with(scenario, "first byte")
+
+
+def test_timed_out_pooled_connection_is_aborted():
+    async def scenario():
+        async with _Stalled_Stub() as stalled, HTTP_Stub() as stub, \
+                Connection_Pool() as pool:
+            with pytest.raises(TimeoutError):
+                await _call(stalled, Timeouts(first_byte = 0.1), pool = pool)
+            await asyncio.sleep(0.05)
+            stalled_idle = pool.idle_count(
+                pool.pool_key("127.0.0.1", stalled.port)
+            )
+            response = await _call(stub, Timeouts(total = 3), pool = pool)
+            return stalled_idle, stalled.closed, response.status
+    assert (0, 1, 200) == run(scenario())
+
+
+def test_replace():
+    timeouts = Timeouts(connect = 1, total = 10)
+    assert Timeouts(connect = 2, total = 10).__repr__() \
+        == timeouts.replace(connect = 2).__repr__()
+    with pytest.raises(TypeError, match = "write"):
+        timeouts.replace(write = 1)
+    assert 5 == Timeouts.of(5).total
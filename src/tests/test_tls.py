@@ -0,0 +1,65 @@
+import shutil
+import ssl
+import subprocess
+
+import pytest
+
+from ..codebase import Connection, request
+from ..codebase.__tls_helper import get_ssl_context
+from ._stubs import HTTP_Stub, run
+
+
+@pytest.fixture(scope = "module")
+def certificate(tmp_path_factory) -> tuple[str, str]:
+    if None == shutil.which("openssl"):
+        pytest.skip("the 'openssl' command is needed for the certificate")
+    directory = tmp_path_factory.mktemp("tls")
+    certfile = str(directory / "cert.pem")
+    keyfile = str(directory / "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", keyfile, "-out", certfile, "-days", "1",
+            "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost"
+        ],
+        check = True,
+        capture_output = True
+    )
+    return certfile, keyfile
+
+
+def _server_context(certificate: tuple[str, str]) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*certificate)
+    return context
+
+
+def test_shared_context_is_cached(certificate):
+    context = get_ssl_context(cafile = certificate[0])
+    assert context is get_ssl_context(cafile = certificate[0])
+    assert context is not get_ssl_context(verify = False)
+    conn = Connection("localhost", 443, ssl = True, cafile = certificate[0])
+    assert context is conn.ssl_context()
+
+
+def test_session_resumed_on_reconnect(certificate):
+    async def scenario():
+        async with HTTP_Stub(ssl = _server_context(certificate)) as stub:
+            reused = []
+            for path in ("/a", "/b"):
+                conn = Connection(
+                    "localhost", stub.port,
+                    ssl = True,
+                    cafile = certificate[0]
+                )
+                await conn.open()
+                ssl_object = conn.writer.get_extra_info("ssl_object")
+                # the TLS 1.3 ticket arrives with the first response
+                response = await request.call(
+                    "GET", url_path = path, connection = conn, timeouts = 3
+                )
+                reused.append((response.status, ssl_object.session_reused))
+                await conn.close()
+            return reused, stub.connections
+    assert ([(200, False), (200, True)], 2) == run(scenario())